@@ -0,0 +1,271 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_animation_scheduler.py
+#
+# Plays back-to-back utterances the way audio_face_queue_worker does and records every
+# LiveLink packet at a UDP sink on the LiveLink port. Compares the previous per-utterance
+# threads (stop the idle thread, send, start a new idle thread; kept here as the reference)
+# with the AnimationScheduler, one utterance at a time as run_audio_animation plays them
+# and queued one ahead as GaplessSpeechPlayer does. Audio playback is stood in for by a
+# sleep of the clip's length.
+#
+# Then checks that a new turn interrupting the speech (end_previous_turn, with emote calls
+# off as by default) takes the face back to idle, with the audio played through pygame.
+#
+#   python benchmark_animation_scheduler.py --utterances 5 --seconds 1.5
+
+import argparse
+import io
+import multiprocessing
+import socket
+import struct
+import threading
+import time
+import wave
+from queue import Queue
+
+import numpy as np
+
+from livelink.animations.animation_scheduler import AnimationScheduler
+from livelink.animations.default_animation import default_animation_data
+from livelink.connect.faceblendshapes import FaceBlendShape
+from livelink.connect.frame_pacer import FramePacer
+from livelink.connect.livelink_init import UDP_IP, UDP_PORT, create_socket_connection, initialize_py_face
+from livelink.send_to_unreal import prepare_facial_array, prepare_speech_frames
+from utils.audio_face_workers import audio_face_queue_worker
+from utils.llm.turn_processing import end_previous_turn
+from utils.tts.tts_bridge import ChunkQueue
+
+
+def udp_sink(connection, duration):
+    """Records perf_counter_ns and the JawOpen value of every packet for duration seconds."""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind((UDP_IP, UDP_PORT))
+    sink.settimeout(0.1)
+    connection.send("ready")
+    arrivals = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        try:
+            data = sink.recv(2048)
+        except socket.timeout:
+            continue
+        jaw_open = struct.unpack_from('!f', data, len(data) - (61 - FaceBlendShape.JawOpen.value) * 4)[0]
+        arrivals.append((time.perf_counter_ns(), jaw_open))
+    sink.close()
+    connection.send(arrivals)
+
+
+def utterance(seconds, seed):
+    """Facial data shaped like the model's output: 68 columns moving smoothly, the jaw held open."""
+    t = np.arange(int(seconds * 60))[:, None] / 60
+    phase = np.random.default_rng(seed).uniform(0, 2 * np.pi, 68)
+    facial_data = 0.5 + 0.4 * np.sin(2 * np.pi * 1.5 * t + phase)
+    facial_data[:, FaceBlendShape.JawOpen.value] = 0.8 + 0.1 * np.sin(2 * np.pi * 1.5 * t[:, 0])
+    return facial_data.tolist()
+
+
+audio_spans = []
+
+
+def play_audio_standin(start_event, frames):
+    start_event.wait()
+    start = time.perf_counter()
+    time.sleep(frames / 60)
+    audio_spans.append((start, time.perf_counter()))
+
+
+def reference_idle_loop(py_face, stop_event):
+    """The previous default_animation_loop: its own socket, one idle frame per pacer tick."""
+    pacer = FramePacer(60)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.connect((UDP_IP, UDP_PORT))
+        frame_index = 0
+        while not stop_event.is_set():
+            for frame in default_animation_data:
+                if stop_event.is_set():
+                    break
+                for i, value in enumerate(frame):
+                    py_face.set_blendshape(FaceBlendShape(i), float(value))
+                due = pacer.wait(frame_index, stop_event)
+                frame_index += 1
+                if due:
+                    s.sendall(py_face.encode())
+
+
+def reference_pre_encode(facial_data, py_face, fps=60):
+    """The previous pre_encode_facial_data: ramps from the idle pose into and out of the speech."""
+    facial_data = prepare_facial_array(facial_data)
+    frames = np.tile(np.asarray(py_face._blend_shapes, dtype=np.float64), (len(facial_data), 1))
+    frames[:, :51] = facial_data[:, :51]
+    blend_in, blend_out = int(0.1 * fps), int(0.2 * fps)
+    default_pose = default_animation_data[0][:51]
+    weight = (np.arange(blend_in) / blend_in)[:, None]
+    frames[:blend_in, :51] = (1 - weight) * default_pose + weight * frames[:blend_in, :51]
+    weight = (1.0 - np.arange(blend_out) / blend_out)[:, None]
+    frames[-blend_out:, :51] = (1 - weight) * default_pose + weight * frames[-blend_out:, :51]
+    return py_face.encode_into(frames)
+
+
+def reference_send(encoded_facial_data, start_event, socket_connection):
+    """The previous send_pre_encoded_data_to_unreal."""
+    pacer = FramePacer(60)
+    start_event.wait()
+    pacer.start()
+    for frame_index, frame_data in enumerate(encoded_facial_data):
+        if pacer.wait(frame_index):
+            socket_connection.sendall(frame_data)
+
+
+def reference_run(utterances, py_face, socket_connection):
+    """The previous run_audio_animation, minus the emotion overlay and real audio."""
+    stop_idle = threading.Event()
+    default_animation_thread = threading.Thread(target=reference_idle_loop, args=(py_face, stop_idle))
+    default_animation_thread.start()
+    time.sleep(0.5)
+    for facial_data in utterances:
+        encoded_facial_data = reference_pre_encode(facial_data, initialize_py_face())
+        stop_idle.set()
+        default_animation_thread.join()
+        start_event = threading.Event()
+        audio_thread = threading.Thread(target=play_audio_standin, args=(start_event, len(facial_data)))
+        data_thread = threading.Thread(target=reference_send, args=(encoded_facial_data, start_event, socket_connection))
+        audio_thread.start()
+        data_thread.start()
+        start_event.set()
+        audio_thread.join()
+        data_thread.join()
+        stop_idle.clear()
+        default_animation_thread = threading.Thread(target=reference_idle_loop, args=(py_face, stop_idle))
+        default_animation_thread.start()
+    time.sleep(0.5)
+    stop_idle.set()
+    default_animation_thread.join()
+
+
+def scheduler_run(utterances, py_face, socket_connection):
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
+    time.sleep(0.5)
+    for facial_data in utterances:
+        speech = animation_scheduler.speak(prepare_speech_frames(facial_data))
+        play_audio_standin(speech.started, len(facial_data))
+        speech.finished.wait()
+    time.sleep(0.5)
+    animation_scheduler.stop()
+
+
+def queued_run(utterances, py_face, socket_connection):
+    """The next utterance is queued while the current one plays, like GaplessSpeechPlayer."""
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
+    time.sleep(0.5)
+    speeches = [animation_scheduler.speak(prepare_speech_frames(facial_data)) for facial_data in utterances[:1]]
+    for index, facial_data in enumerate(utterances):
+        if index + 1 < len(utterances):
+            speeches.append(animation_scheduler.speak(prepare_speech_frames(utterances[index + 1])))
+        play_audio_standin(speeches[index].started, len(facial_data))
+    speeches[-1].finished.wait()
+    time.sleep(0.5)
+    animation_scheduler.stop()
+
+
+def speech_wav(seconds, sample_rate=22050):
+    """Silent 16-bit mono WAV bytes standing in for the TTS audio."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(2 * int(seconds * sample_rate)))
+    return buffer.getvalue()
+
+
+def interrupted_run(utterances, py_face, socket_connection):
+    """
+    Queues the utterances on audio_face_queue_worker with emote calls off and cuts them off
+    half a second in, as process_turn does for a new turn. Returns when that happened.
+    """
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
+    audio_queue = Queue()
+    worker = threading.Thread(target=audio_face_queue_worker,
+                              args=(audio_queue, py_face, socket_connection, animation_scheduler, False))
+    worker.start()
+    time.sleep(0.5)
+    for facial_data in utterances:
+        audio_queue.put((speech_wav(len(facial_data) / 60), facial_data))
+    time.sleep(0.5)
+    interrupted_at = time.perf_counter_ns()
+    end_previous_turn(ChunkQueue(), audio_queue, animation_scheduler=animation_scheduler)
+    time.sleep(0.5)
+    audio_queue.put(None)
+    worker.join()
+    animation_scheduler.stop()
+    return interrupted_at
+
+
+def check_interrupt(utterances, threshold=0.6):
+    parent, child = multiprocessing.Pipe()
+    receiver = multiprocessing.Process(target=udp_sink, args=(child, 2.0))
+    receiver.start()
+    parent.recv()
+    socket_connection = create_socket_connection()
+    interrupted_at = interrupted_run([list(map(list, u)) for u in utterances], initialize_py_face(), socket_connection)
+    socket_connection.close()
+    arrivals = parent.recv()
+    receiver.join()
+
+    if not any(arrival < interrupted_at and value > threshold for arrival, value in arrivals):
+        raise AssertionError("No speech frames before the interrupt; is the pygame mixer available?")
+    speaking = [arrival for arrival, value in arrivals if arrival > interrupted_at and value > threshold]
+    lasted = (max(speaking) - interrupted_at) / 1e6 if speaking else 0.0
+    print(f"interrupted, emote calls off: speech frames for {lasted:5.1f} ms after end_previous_turn")
+    if lasted > 200:
+        raise AssertionError(f"Speech frames kept going {lasted:.1f} ms after the interrupt")
+
+
+def idle_dips(values, threshold=0.6):
+    """Times JawOpen fell below threshold, i.e. the face blended back towards idle."""
+    speaking = values > threshold
+    return int(np.count_nonzero(speaking[:-1] & ~speaking[1:]))
+
+
+def measure(name, run, utterances):
+    parent, child = multiprocessing.Pipe()
+    duration = 1.5 + sum(len(u) for u in utterances) / 60 + 0.5 * len(utterances)
+    receiver = multiprocessing.Process(target=udp_sink, args=(child, duration))
+    receiver.start()
+    parent.recv()
+    threads_before = threading.active_count()
+    audio_spans.clear()
+    socket_connection = create_socket_connection()
+    run([list(map(list, u)) for u in utterances], initialize_py_face(), socket_connection)
+    socket_connection.close()
+    arrivals = parent.recv()
+    receiver.join()
+
+    times = np.array([arrival for arrival, _ in arrivals], dtype=np.float64) / 1e6
+    values = np.array([value for _, value in arrivals])
+    intervals = np.diff(times)
+    steps = np.abs(np.diff(values))
+    silences = np.array([start - end for (_, end), (start, _) in zip(audio_spans, audio_spans[1:])]) * 1000
+    print(f"{name:<26} {len(arrivals):5d} packets   max packet gap {intervals.max():5.1f} ms   "
+          f"largest JawOpen step {steps.max():.3f}   idle dips {idle_dips(values)}   silence between sentences mean {silences.mean():5.1f} ms "
+          f"max {silences.max():5.1f} ms   threads left: {threading.active_count() - threads_before}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back-to-back utterances: per-utterance threads vs AnimationScheduler vs queued")
+    parser.add_argument("--utterances", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=1.5)
+    args = parser.parse_args()
+
+    utterances = [utterance(args.seconds, seed) for seed in range(args.utterances)]
+    measure("per-utterance threads", reference_run, utterances)
+    measure("AnimationScheduler", scheduler_run, utterances)
+    measure("AnimationScheduler queued", queued_run, utterances)
+    check_interrupt(utterances[:2])
+
+
+if __name__ == "__main__":
+    main()
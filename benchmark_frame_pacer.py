@@ -0,0 +1,128 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_frame_pacer.py
+#
+# Sends a numbered utterance to a local UDP sink and measures, on arrival, how far each
+# frame lands from its slot on the schedule. Compares the previous time.time()/sleep
+# sender with the same loop on a FramePacer, as the animation scheduler paces its frames,
+# under both catch-up policies. The sink runs in its own process, so its timestamps don't wait on this
+# process's GIL. --load adds CPU-bound Python threads competing with the sender for it.
+#
+#   python benchmark_frame_pacer.py --seconds 5 --load 2
+
+import argparse
+import multiprocessing
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from livelink.connect.frame_pacer import FramePacer
+from livelink.connect.pylivelinkface import PyLiveLinkFace
+
+PACKET_SIZE = len(PyLiveLinkFace().encode())
+
+
+def reference_send(encoded_facial_data, start_event, fps, socket_connection):
+    """The previous send_pre_encoded_data_to_unreal loop, kept as the reference."""
+    start_event.wait()
+    frame_duration = 1 / fps
+    start_time = time.time()
+    for frame_index, frame_data in enumerate(encoded_facial_data):
+        elapsed_time = time.time() - start_time
+        expected_time = frame_index * frame_duration
+        if elapsed_time < expected_time:
+            time.sleep(expected_time - elapsed_time)
+        elif elapsed_time > expected_time + frame_duration:
+            continue
+        socket_connection.sendall(frame_data)
+
+
+def paced_send(encoded_facial_data, start_event, socket_connection, pacer):
+    start_event.wait()
+    pacer.start()
+    for frame_index, frame_data in enumerate(encoded_facial_data):
+        if pacer.wait(frame_index):
+            socket_connection.sendall(frame_data)
+
+
+def numbered_packets(count):
+    return [struct.pack('!I', index).ljust(PACKET_SIZE, b'\0') for index in range(count)]
+
+
+def burn_cpu(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(10000))
+
+
+def udp_sink(connection, count):
+    """Receives numbered packets and sends back {index: perf_counter_ns at arrival}."""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(1.0)
+    connection.send(sink.getsockname())
+    arrivals = {}
+    try:
+        while len(arrivals) < count:
+            data = sink.recv(2048)
+            arrivals[struct.unpack_from('!I', data)[0]] = time.perf_counter_ns()
+    except socket.timeout:
+        pass
+    sink.close()
+    connection.send(arrivals)
+
+
+def run_sender(name, send, packets, fps):
+    parent, child = multiprocessing.Pipe()
+    receiver = multiprocessing.Process(target=udp_sink, args=(child, len(packets)))
+    receiver.start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.connect(parent.recv())
+
+    start_event = threading.Event()
+    thread = threading.Thread(target=send, args=(packets, start_event, fps, sender))
+    thread.start()
+    start_ns = time.perf_counter_ns()
+    start_event.set()
+    thread.join()
+    arrivals = parent.recv()
+    receiver.join()
+    sender.close()
+
+    indices = np.array(sorted(arrivals))
+    lateness = (np.array([arrivals[i] for i in indices]) - start_ns - np.round(indices * 1e9 / fps)) / 1e6
+    interval = np.diff([arrivals[i] for i in indices]) / 1e6
+    print(f"{name:<24} sent {len(indices):5d}/{len(packets)}   lateness p50 {np.percentile(lateness, 50):6.2f} ms"
+          f"   p99 {np.percentile(lateness, 99):6.2f} ms   max {lateness.max():6.2f} ms"
+          f"   interval std {interval.std():5.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame pacing jitter against a local UDP sink")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--load", type=int, default=0, help="CPU-bound threads running alongside the sender")
+    args = parser.parse_args()
+
+    packets = numbered_packets(int(args.seconds * args.fps))
+    stop = threading.Event()
+    burners = [threading.Thread(target=burn_cpu, args=(stop,), daemon=True) for _ in range(args.load)]
+    for burner in burners:
+        burner.start()
+
+    try:
+        run_sender("time.time() + sleep", reference_send, packets, args.fps)
+        for policy in ("drop", "compress"):
+            def send(encoded_facial_data, start_event, fps, socket_connection, policy=policy):
+                paced_send(encoded_facial_data, start_event, socket_connection, FramePacer(fps, catch_up=policy))
+            run_sender(f"FramePacer ({policy})", send, packets, args.fps)
+    finally:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
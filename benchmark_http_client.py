@@ -0,0 +1,93 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_http_client.py
+#
+# Per-call latency of a fresh connection per request (module-level requests.post) against the
+# pooled keep-alive session in utils/http_client.py, measured against local stub servers that
+# stand in for the TTS and NeuroSync endpoints.
+#
+#   python benchmark_http_client.py --calls 500 --threads 1 4
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+from utils import http_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the threaded Flask servers
+    # Headers and body go out as separate writes; without this, a kept-alive connection
+    # stalls ~40 ms on Nagle + delayed ACK, which Flask avoids by buffering its writes.
+    disable_nagle_algorithm = True
+    response_body = b""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(self.response_body)))
+        self.end_headers()
+        self.wfile.write(self.response_body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(response_bytes):
+    handler = type("Handler", (StubHandler,), {"response_body": b"\0" * response_bytes})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def time_calls(post, url, body, calls, threads):
+    def one_call(_):
+        start = time.perf_counter()
+        response = post(url, data=body, headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = np.array(list(pool.map(one_call, range(calls)))) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fresh connections vs the pooled HTTP session")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    # A sentence of TTS audio going to NeuroSync, and a small blendshape reply coming back
+    stubs = {
+        "tts (json -> 200 KB wav)": (start_stub_server(200_000), b'{"text": "Hello there, how are you?"}'),
+        "neurosync (200 KB wav -> 30 KB)": (start_stub_server(30_000), b"\0" * 200_000),
+    }
+
+    for name, ((server, url), body) in stubs.items():
+        for threads in args.threads:
+            # Warm both paths once so neither pays for first-use imports
+            time_calls(requests.post, url, body, threads, threads)
+            time_calls(http_client.post, url, body, threads, threads)
+
+            fresh = time_calls(requests.post, url, body, args.calls, threads)
+            pooled = time_calls(http_client.post, url, body, args.calls, threads)
+            print(f"{name:<32} {threads:>2} threads | fresh p50 {fresh[0]:6.2f} ms p99 {fresh[1]:6.2f} ms | "
+                  f"pooled p50 {pooled[0]:6.2f} ms p99 {pooled[1]:6.2f} ms | "
+                  f"{fresh[0] - pooled[0]:+.2f} ms/call")
+        server.shutdown()
+
+    http_client.close_session()
+
+
+if __name__ == "__main__":
+    main()
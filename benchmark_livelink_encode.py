@@ -0,0 +1,185 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_livelink_encode.py
+#
+# Checks that the precompiled scale vector gives byte-identical LiveLink packets to the
+# original per-value section scaling, and that encode_into matches encode() apart from
+# the timecode. Reports frames per second for each, and the memory an utterance's packets
+# take encoded frame by frame against a PacketArena.
+#
+#   python benchmark_livelink_encode.py --frames 20000
+
+import argparse
+import struct
+import time
+import tracemalloc
+
+import numpy as np
+
+from livelink.connect.dimension_scalars import EYE_BLENDSHAPES, EYEBROW_BLENDSHAPES, MOUTH_BLENDSHAPES, apply_scale_vector
+from livelink.connect.faceblendshapes import FaceBlendShape
+from livelink.connect.packet_arena import PacketArena
+from livelink.connect.pylivelinkface import PyLiveLinkFace
+
+
+def reference_scale_blendshapes(blendshapes, mouth_scale, eye_scale, eyebrow_scale, threshold=0.0,
+                                eyewide_left_scale=1.0, eyewide_right_scale=1.0,
+                                eyesquint_left_scale=1.0, eyesquint_right_scale=1.0):
+    """The original per-value section scaling, kept as the reference."""
+    scaled_blendshapes = []
+    for i, value in enumerate(blendshapes):
+        if value > threshold:
+            if i in [bs.value for bs in MOUTH_BLENDSHAPES]:
+                scaled_value = value * mouth_scale
+            elif i in [bs.value for bs in EYE_BLENDSHAPES]:
+                if i == FaceBlendShape.EyeWideLeft.value:
+                    scaled_value = value * eyewide_left_scale
+                elif i == FaceBlendShape.EyeWideRight.value:
+                    scaled_value = value * eyewide_right_scale
+                elif i == FaceBlendShape.EyeSquintLeft.value:
+                    scaled_value = value * eyesquint_left_scale
+                elif i == FaceBlendShape.EyeSquintRight.value:
+                    scaled_value = value * eyesquint_right_scale
+                else:
+                    scaled_value = value * eye_scale
+            elif i in [bs.value for bs in EYEBROW_BLENDSHAPES]:
+                scaled_value = value * eyebrow_scale
+            else:
+                scaled_value = value
+            if scaled_value > 1.0:
+                scaled_value = 1.0
+            scaled_blendshapes.append(max(scaled_value, 0.0))
+        else:
+            scaled_blendshapes.append(max(value, 0.0))
+    return scaled_blendshapes
+
+
+def reference_data_packed(py_face):
+    scaled = reference_scale_blendshapes(
+        py_face._blend_shapes,
+        py_face._scaling_factor_mouth,
+        py_face._scaling_factor_eyes,
+        py_face._scaling_factor_eyebrows,
+        eyewide_left_scale=py_face._scaling_factor_eyewide_left,
+        eyewide_right_scale=py_face._scaling_factor_eyewide_right,
+        eyesquint_left_scale=py_face._scaling_factor_eyesquint_left,
+        eyesquint_right_scale=py_face._scaling_factor_eyesquint_right
+    )
+    return struct.pack('!B61f', 61, *scaled)
+
+
+def random_frames(count, seed=0):
+    """Blendshape-like frames, plus the edge cases: negatives, -0.0, values above 1."""
+    rng = np.random.default_rng(seed)
+    frames = rng.uniform(-0.2, 1.6, size=(count, 61))
+    frames[rng.random(frames.shape) < 0.05] = 0.0
+    frames[rng.random(frames.shape) < 0.01] = -0.0
+    return frames
+
+
+def check_identical(frames):
+    py_face = PyLiveLinkFace()
+    settings = [
+        {},
+        {"mouth": 1.3, "eyes": 0.8, "eyebrows": 1.7, "eyewide_left": 0.2, "eyewide_right": 2.5,
+         "eyesquint_left": 0.0, "eyesquint_right": 1.1},
+        {"mouth": -0.5, "eyes": 3.0},
+    ]
+    for setting in settings:
+        py_face.set_scaling_factors(**setting)
+        for frame in frames:
+            py_face._blend_shapes = frame.tolist()
+            expected = reference_data_packed(py_face)
+            actual = struct.pack('!B', 61) + apply_scale_vector(py_face._blend_shapes, py_face._scale_vector).astype('>f4').tobytes()
+            if actual != expected:
+                raise AssertionError(f"Packed frame differs with scaling {setting}: {frame}")
+            if not py_face.encode().endswith(expected):
+                raise AssertionError(f"encode() differs with scaling {setting}: {frame}")
+    print(f"identical output: {len(frames)} frames x {len(settings)} scaling settings")
+
+
+def check_batch_identical(frames):
+    """encode_into against encode() per frame, with the 4-byte timecode masked out."""
+    py_face = PyLiveLinkFace()
+    py_face.set_scaling_factors(mouth=1.3, eyes=0.8, eyebrows=1.7, eyewide_left=0.2)
+    timecode_offset = len(py_face._header_packed())
+    arena = py_face.encode_into(frames, start_frame=1000)
+    if len(arena) != len(frames):
+        raise AssertionError(f"encode_into returned {len(arena)} packets for {len(frames)} frames")
+    for index, (frame, packet) in enumerate(zip(frames, arena)):
+        packet = bytes(packet)
+        py_face._blend_shapes = frame.tolist()
+        expected = py_face.encode()
+        if packet[:timecode_offset] + packet[timecode_offset + 4:] != expected[:timecode_offset] + expected[timecode_offset + 4:]:
+            raise AssertionError(f"encode_into differs from encode() for frame {index}: {frame}")
+        if struct.unpack_from('!I', packet, timecode_offset)[0] != 1000 + index:
+            raise AssertionError(f"encode_into stamped the wrong timecode on frame {index}")
+    print(f"encode_into identical to encode(): {len(frames)} frames")
+
+
+def frames_per_second(function, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        function(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def packet_memory(encode, frames):
+    """Bytes held by the encoded utterance and the number of live allocations behind them."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    packets = encode(frames)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "traceback")
+    held = sum(stat.size_diff for stat in stats)
+    allocations = sum(stat.count_diff for stat in stats)
+    del packets
+    return held, allocations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Section scaling: identical-output check and frames per second")
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    frames = random_frames(args.frames)
+    check_identical(frames[:2000])
+    check_batch_identical(frames[:2000])
+
+    py_face = PyLiveLinkFace()
+    frame_lists = [frame.tolist() for frame in frames]
+
+    def reference_scaling(frame):
+        py_face._blend_shapes = frame
+        return reference_data_packed(py_face)
+
+    def vector_scaling(frame):
+        return struct.pack('!B', 61) + apply_scale_vector(frame, py_face._scale_vector).astype('>f4').tobytes()
+
+    def full_encode(frame):
+        py_face._blend_shapes = frame
+        return py_face.encode()
+
+    print(f"scale + pack, per-value loop:   {frames_per_second(reference_scaling, frame_lists):10.0f} frames/s")
+    print(f"scale + pack, scale vector:     {frames_per_second(vector_scaling, frame_lists):10.0f} frames/s")
+    print(f"PyLiveLinkFace.encode():        {frames_per_second(full_encode, frame_lists):10.0f} frames/s")
+
+    arena = PacketArena()
+    py_face.encode_into(frames, arena)
+    start = time.perf_counter()
+    py_face.encode_into(frames, arena)
+    print(f"PyLiveLinkFace.encode_into():   {len(frames) / (time.perf_counter() - start):10.0f} frames/s (reused arena)")
+
+    for seconds in (10, 100):
+        utterance = frames[:seconds * 60]
+        for name, encode in (("encode() each", lambda block: [full_encode(frame) for frame in block.tolist()]),
+                             ("PacketArena", py_face.encode_into)):
+            held, allocations = packet_memory(encode, utterance)
+            print(f"{seconds:>3} s utterance, {name:<14} {held / 1024:8.1f} KiB held in {allocations:6d} allocations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_neurosync_backends.py
+#
+# Side-by-side latency of the blendshape backends on one machine: the local API over HTTP
+# (JSON and binary responses) against the model running in this process. Start the local
+# API first (python neurosync_local_api.py in local_api/).
+#
+#   python benchmark_neurosync_backends.py --audio wav_input/audio.wav --calls 10
+
+import argparse
+import io
+import time
+
+import numpy as np
+import soundfile as sf
+
+from utils.neurosync import neurosync_api_connect
+from utils.neurosync.in_process_neurosync import generate_blendshapes_in_process
+
+
+def distinct_clips(audio_bytes, count, seed=0):
+    """Copies of the clip with one LSB of noise each, so no backend can serve a cached result."""
+    data, sr = sf.read(io.BytesIO(audio_bytes), dtype="int16")
+    rng = np.random.default_rng(seed)
+    clips = []
+    for _ in range(count):
+        noisy = np.clip(data.astype(np.int32) + rng.integers(-1, 2, size=data.shape), -32768, 32767).astype(np.int16)
+        buffer = io.BytesIO()
+        sf.write(buffer, noisy, sr, format="WAV", subtype="PCM_16")
+        clips.append(buffer.getvalue())
+    return clips
+
+
+def time_backend(name, backend, clips):
+    backend(clips[0])  # warm-up: model load, connection, first-call allocations
+    latencies = []
+    for clip in clips[1:]:
+        start = time.perf_counter()
+        result = backend(clip)
+        latencies.append(time.perf_counter() - start)
+        if result is None or len(result) == 0:
+            raise RuntimeError(f"{name} returned no blendshapes")
+    latencies = np.array(latencies) * 1000
+    print(f"{name:<22} p50 {np.percentile(latencies, 50):8.1f} ms   p90 {np.percentile(latencies, 90):8.1f} ms   "
+          f"({len(result)} frames)")
+    return np.asarray(result, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP vs in-process blendshape latency")
+    parser.add_argument("--audio", default="wav_input/audio.wav")
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.audio, "rb") as f:
+        audio_bytes = f.read()
+
+    def http_backend(binary):
+        def send(clip):
+            neurosync_api_connect.USE_IN_PROCESS_NEUROSYNC = False
+            neurosync_api_connect.REQUEST_BINARY_BLENDSHAPES = binary
+            return neurosync_api_connect.send_audio_to_neurosync(clip)
+        return send
+
+    # Each backend gets its own clips, so the server's and the in-process result caches both miss
+    json_result = time_backend("HTTP, JSON response", http_backend(False), distinct_clips(audio_bytes, args.calls + 1, seed=1))
+    binary_result = time_backend("HTTP, binary response", http_backend(True), distinct_clips(audio_bytes, args.calls + 1, seed=2))
+    in_process_result = time_backend("in-process", generate_blendshapes_in_process, distinct_clips(audio_bytes, args.calls + 1, seed=3))
+
+    print(f"frames match: {json_result.shape == binary_result.shape == in_process_result.shape}")
+
+
+if __name__ == "__main__":
+    main()
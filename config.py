@@ -23,7 +23,12 @@ DEFAULT_VOICE_NAME = 'af_bella'  # Default Kokoro voice
 USE_LOCAL_AUDIO = True
 USE_KOKORO = True  # New setting to enable Kokoro TTS
 LOCAL_TTS_URL = "http://127.0.0.1:8000/generate_speech"  # Updated to match Kokoro endpoint
+KOKORO_TTS_URL = "http://localhost:8000/generate_speech"  # Kokoro TTS endpoint (utils/tts/kokoro_tts.py)
 USE_COMBINED_ENDPOINT = False
+# TTS pipeline: sentences are generated concurrently and still played in order
+TTS_WORKERS = 2          # TTS (or combined endpoint) requests in flight at once
+BLENDSHAPE_WORKERS = 2   # NeuroSync blendshape requests in flight at once
+TTS_LOOKAHEAD = 4        # sentences generated ahead of the one waiting to play
 
 # STT Configuration (new)
 USE_LOCAL_WHISPER = True  # Set to True to use local Whisper model, False to use server
@@ -79,11 +84,48 @@ OPENAI_EMBEDDING_SIZE = 1536
 
 NEUROSYNC_LOCAL_URL = "http://127.0.0.1:5000/audio_to_blendshapes" # if using the realtime api below, you can still access this endpoint from it, just change the port to 6969
 
+# Run the blendshape model inside this process instead of calling the local API over HTTP.
+# Needs torch and the local_api requirements installed here; the model loads on the first request.
+USE_IN_PROCESS_NEUROSYNC = False
+IN_PROCESS_FEATURE_WORKERS = 0  # feature extraction processes for the in-process model, 0 = extract in the calling thread
+
 # ---------------------------
 # TTS with Blendshapes Endpoint (new)
 # ---------------------------
 TTS_WITH_BLENDSHAPES_REALTIME_API = "http://127.0.0.1:8000/synthesize_and_blendshapes"
 
+# ---------------------------
+# Outbound HTTP Client (new)
+# ---------------------------
+# Every service call goes through one pooled session (utils/http_client.py), so connections
+# to the TTS, NeuroSync, LLM, STT and embedding servers are kept alive between calls.
+HTTP_POOL_HOSTS = 10          # hosts with their own connection pool
+HTTP_POOL_MAXSIZE = 16        # kept-alive connections per host (match the number of worker threads)
+HTTP_CONNECT_TIMEOUT = 3.05   # seconds to establish a connection
+HTTP_READ_TIMEOUT = 120       # seconds to wait for (the next bytes of) a response
+HTTP_MAX_RETRIES = 2          # retries on connection failures and 429/502/503/504
+HTTP_BACKOFF_FACTOR = 0.25    # retry sleeps grow as 0.25s, 0.5s, ...
+# POSTs are only re-sent after a 429/502/503/504 to these local endpoints, where repeating a
+# request costs nothing and changes nothing. Third-party APIs (ElevenLabs, OpenAI) and the LLM
+# are never re-sent, since the first attempt may already have run (and been billed).
+HTTP_RETRY_POST_URLS = [
+    NEUROSYNC_LOCAL_URL,
+    LOCAL_TTS_URL,
+    KOKORO_TTS_URL,
+    TTS_WITH_BLENDSHAPES_REALTIME_API,
+    TRANSCRIPTION_SERVER_URL,
+    EMBEDDING_LOCAL_SERVER_URL,
+]
+
+# ---------------------------
+# LiveLink Frame Pacing (new)
+# ---------------------------
+# Speech and idle frames are sent on a fixed perf_counter schedule (livelink/connect/frame_pacer.py).
+FRAME_CATCH_UP_POLICY = "drop"    # frames that fall behind: "drop" them to stay in sync with the audio, or "compress" (send them back to back until caught up)
+FRAME_MAX_LATENESS_FRAMES = 1.0   # how far behind (in frames) a frame may be before the catch-up policy applies
+FRAME_SPIN_MS = 1.0               # the last part of each wait is spun instead of slept, as sleep can overshoot
+FRAME_PACER_REPORT = True         # print drift, drop and late-frame stats after each utterance
+
 ### ignore these
 #NEUROSYNC_API_KEY = "YOUR-NEUROSYNC-API-KEY" # ignore this
 #NEUROSYNC_REMOTE_URL = "https://api.neurosync.info/audio_to_blendshapes" #ignore this
@@ -0,0 +1,217 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# animation_scheduler.py
+#
+# One long-lived thread that owns the LiveLink socket and sends a frame on every 60 Hz
+# tick. The idle animation plays whenever nothing is being said. Utterances queued with
+# speak() start at once, crossfaded in from whatever is showing, follow each other
+# directly when they arrive back to back, and are crossfaded back out to idle when the
+# queue runs dry.
+
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import FRAME_CATCH_UP_POLICY, FRAME_MAX_LATENESS_FRAMES, FRAME_SPIN_MS, FRAME_PACER_REPORT
+from livelink.connect.faceblendshapes import FaceBlendShape
+from livelink.connect.frame_pacer import FramePacer
+from livelink.connect.livelink_init import create_socket_connection
+from livelink.connect.packet_arena import PacketArena
+from livelink.animations.default_animation import default_animation_data
+
+# set_blendshape clamps the head rotations to zero, so the idle loop never sent them
+HEAD_ROTATIONS = [FaceBlendShape.HeadYaw.value, FaceBlendShape.HeadPitch.value, FaceBlendShape.HeadRoll.value]
+
+# Packet buffers of finished utterances kept for the next ones to encode into
+MAX_SPARE_ARENAS = 2
+
+
+class SpeechClip:
+    """
+    One queued utterance: its (N, 61) frames and the same frames encoded into a PacketArena,
+    without timecodes yet. started is set once the first frame has gone out (start the
+    audio on it), finished once the last one has, or when the scheduler stops. packets is
+    handed back to the scheduler for reuse once the clip is done.
+    """
+
+    def __init__(self, frames, packets):
+        self.frames = frames
+        self.packets = packets
+        self.started = threading.Event()
+        self.finished = threading.Event()
+
+
+class AnimationScheduler:
+    """
+    Sends idle and speech frames from a single thread on one FramePacer schedule.
+
+    Speech queued while idle starts immediately (the schedule is re-anchored on it rather
+    than waiting out the idle tick), with a crossfade of blend_in_seconds from the last
+    frame sent. When no other utterance is queued its last blend_out_seconds fade into the
+    idle animation, which keeps running underneath. Frames that need no blending go out as
+    the packets encoded by speak(). Every packet, encoded ahead or not, has its timecode
+    written just before it is sent, so all of them share the send-time clock.
+    """
+
+    def __init__(self, py_face, socket_connection=None, fps: int = 60, blend_in_seconds: float = 0.1,
+                 blend_out_seconds: float = 0.2, idle_frames=None, pacer: FramePacer = None) -> None:
+        self.py_face = py_face
+        self.fps = fps
+        self.blend_in_frames = int(blend_in_seconds * fps)
+        self.blend_out_frames = int(blend_out_seconds * fps)
+        self._own_socket = socket_connection is None
+        self._socket = create_socket_connection() if socket_connection is None else socket_connection
+        self._pacer = pacer or FramePacer(fps, FRAME_CATCH_UP_POLICY, FRAME_SPIN_MS, FRAME_MAX_LATENESS_FRAMES)
+
+        idle = np.array(default_animation_data if idle_frames is None else idle_frames, dtype=np.float64)[:, :61]
+        idle[:, HEAD_ROTATIONS] = 0.0
+        self._idle = idle
+        self._last_frame = idle[0]
+
+        self._queue = deque()
+        self._spare_arenas = []
+        self._frame_arena = PacketArena()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._cancel = False
+        self._thread = None
+
+    def start(self) -> "AnimationScheduler":
+        self._thread = threading.Thread(target=self._run, name="animation-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop ticking; queued and playing utterances are marked finished."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def speak(self, frames) -> SpeechClip:
+        """Queue an utterance's (N, 61) frames to play after anything already queued."""
+        frames = np.asarray(frames, dtype=np.float64)
+        with self._lock:
+            arena = self._spare_arenas.pop() if self._spare_arenas else None
+        # Timecodes are stamped as each packet is sent
+        clip = SpeechClip(frames, self.py_face.encode_into(frames, arena, start_frame=0))
+        with self._lock:
+            if len(frames) and not self._stop.is_set():
+                self._queue.append(clip)
+                self._wake.set()
+                return clip
+        self._finish([clip])
+        return clip
+
+    def cancel_speech(self) -> None:
+        """Drop the playing and queued utterances; the face crossfades back to idle."""
+        with self._lock:
+            self._cancel = True
+
+    def _finish(self, clips) -> None:
+        """Mark clips started and finished and keep their packet buffers for reuse."""
+        with self._lock:
+            for clip in clips:
+                if clip.packets is not None and len(self._spare_arenas) < MAX_SPARE_ARENAS:
+                    self._spare_arenas.append(clip.packets)
+                clip.packets = None
+        for clip in clips:
+            clip.started.set()
+            clip.finished.set()
+
+    def _run(self) -> None:
+        pacer = self._pacer
+        py_face = self.py_face
+        tick = 0
+        idle_index = 0
+        clip, position, blending_out = None, 0, False
+        fade_from, fade_position = None, self.blend_in_frames
+        pacer.start()
+        try:
+            while not self._stop.is_set():
+                if clip is None and self._queue:
+                    # Start the speech now, not on the next idle tick (nor after dropping
+                    # ticks missed while it was on its way)
+                    self._wake.clear()
+                    pacer.resync(tick)
+                due = pacer.wait(tick, self._wake)
+                if due is None:
+                    # Woken before the tick was due; a missed (dropped) tick comes back False
+                    self._wake.clear()
+                    continue
+
+                if self._cancel:
+                    with self._lock:
+                        cancelled = ([clip] if clip is not None else []) + list(self._queue)
+                        self._queue.clear()
+                        self._cancel = False
+                    self._finish(cancelled)
+                    if clip is not None:
+                        clip = None
+                        fade_from, fade_position = self._last_frame, 0
+
+                idle_frame = self._idle[idle_index % len(self._idle)]
+                idle_index += 1
+
+                if clip is None:
+                    with self._lock:
+                        clip = self._queue.popleft() if self._queue else None
+                    if clip is not None:
+                        position, blending_out = 0, False
+                        fade_from, fade_position = self._last_frame, 0
+                        # This tick is the clip's first frame, so it opens the report window
+                        pacer.reset_stats(keep_last=True)
+
+                packet = None
+                if clip is None:
+                    frame = idle_frame
+                else:
+                    frame = clip.frames[position]
+                    remaining = len(clip.frames) - position
+                    if not blending_out and remaining <= self.blend_out_frames and not self._queue:
+                        blending_out = True
+                    if blending_out:
+                        weight = (self.blend_out_frames - remaining) / self.blend_out_frames
+                        frame = (1 - weight) * frame + weight * idle_frame
+                    elif fade_position >= self.blend_in_frames:
+                        packet = clip.packets[position]
+                    position += 1
+
+                if fade_position < self.blend_in_frames:
+                    weight = fade_position / self.blend_in_frames
+                    frame = (1 - weight) * fade_from + weight * frame
+                    fade_position += 1
+
+                if packet is None:
+                    packet = py_face.encode_into(frame[None], self._frame_arena, start_frame=0)[0]
+                self._last_frame = frame
+
+                if due:
+                    try:
+                        py_face.stamp_timecode(packet)
+                        self._socket.sendall(packet)
+                    except Exception as e:
+                        print(f"Error in animation scheduler sending: {e}")
+                tick += 1
+
+                if clip is not None:
+                    clip.started.set()
+                    if position == len(clip.frames):
+                        self._finish([clip])
+                        if FRAME_PACER_REPORT:
+                            pacer.print_summary("Speech frames")
+                        clip = None
+        finally:
+            with self._lock:
+                pending = list(self._queue)
+                self._queue.clear()
+            self._finish(([clip] if clip is not None else []) + pending)
+            if self._own_socket:
+                self._socket.close()
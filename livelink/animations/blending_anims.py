@@ -8,7 +8,7 @@
 import time
 import numpy as np
 
-from livelink.animations.default_animation import FaceBlendShape
+from livelink.connect.livelink_init import FaceBlendShape
 
 
 def play_full_animation(facial_data, fps, py_face, socket_connection, blend_in_frames, blend_out_frames):
@@ -24,21 +24,6 @@ def apply_blendshapes(frame_data: np.ndarray, weight: float, py_face, default_an
         blended_value = (1 - weight) * default_value + weight * facial_value
         py_face.set_blendshape(FaceBlendShape(i), float(blended_value))
 
-def blend_in(facial_data, fps, py_face, encoded_data, blend_in_frames, default_animation_data):
-    for frame_index in range(blend_in_frames):
-        weight = frame_index / blend_in_frames
-        apply_blendshapes(facial_data[frame_index], weight, py_face, default_animation_data)
-        encoded_data.append(py_face.encode())
-        time.sleep(1 / fps)
-
-def blend_out(facial_data, fps, py_face, encoded_data, blend_out_frames, default_animation_data):
-    for frame_index in range(blend_out_frames):
-        weight = frame_index / blend_out_frames
-        reverse_index = len(facial_data) - blend_out_frames + frame_index
-        apply_blendshapes(facial_data[reverse_index], 1.0 - weight, py_face, default_animation_data)
-        encoded_data.append(py_face.encode())
-        time.sleep(1 / fps)
-
 def blend_animation_start_end(data, blend_frames=16):
     last_frames = data[-blend_frames:]
     first_frames = data[:blend_frames]
@@ -2,7 +2,8 @@
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
-from typing import List
+import numpy as np
+
 from livelink.connect.faceblendshapes import FaceBlendShape
 
 # Define blendshape groups for each facial feature.
@@ -33,46 +34,43 @@ EYEBROW_BLENDSHAPES = [
     FaceBlendShape.BrowOuterUpLeft, FaceBlendShape.BrowOuterUpRight
 ]
 
-def scale_blendshapes_by_section(
-    blendshapes: List[float],
+MOUTH_INDICES = [bs.value for bs in MOUTH_BLENDSHAPES]
+EYE_INDICES = [bs.value for bs in EYE_BLENDSHAPES]
+EYEBROW_INDICES = [bs.value for bs in EYEBROW_BLENDSHAPES]
+
+def build_scale_vector(
     mouth_scale: float,
     eye_scale: float,
     eyebrow_scale: float,
-    threshold: float = 0.0,
     eyewide_left_scale: float = 1.0,
     eyewide_right_scale: float = 1.0,
     eyesquint_left_scale: float = 1.0,
-    eyesquint_right_scale: float = 1.0
-) -> List[float]:
+    eyesquint_right_scale: float = 1.0,
+    size: int = 61
+) -> np.ndarray:
+    """
+    Per-index scale factors for the section scaling: mouth, eye and eyebrow groups get
+    their section scale (eye wide/squint their own), everything else 1.0.
+    """
+    scale_vector = np.ones(size, dtype=np.float64)
+    scale_vector[MOUTH_INDICES] = mouth_scale
+    scale_vector[EYE_INDICES] = eye_scale
+    scale_vector[FaceBlendShape.EyeWideLeft.value] = eyewide_left_scale
+    scale_vector[FaceBlendShape.EyeWideRight.value] = eyewide_right_scale
+    scale_vector[FaceBlendShape.EyeSquintLeft.value] = eyesquint_left_scale
+    scale_vector[FaceBlendShape.EyeSquintRight.value] = eyesquint_right_scale
+    scale_vector[EYEBROW_INDICES] = eyebrow_scale
+    return scale_vector
+
+def apply_scale_vector(blendshapes, scale_vector: np.ndarray, threshold: float = 0.0) -> np.ndarray:
     """
-    Scale blendshapes based on facial regions.
+    Scale blendshapes with a vector from build_scale_vector. Values above the threshold
+    are scaled and capped at 1.0; every value is floored at 0.0.
+    Works on one frame (61,) or a batch of frames (n, 61).
     """
-    scaled_blendshapes = []
-    
-    for i, value in enumerate(blendshapes):
-        if value > threshold:
-            if i in [bs.value for bs in MOUTH_BLENDSHAPES]:
-                scaled_value = value * mouth_scale
-            elif i in [bs.value for bs in EYE_BLENDSHAPES]:
-                if i == FaceBlendShape.EyeWideLeft.value:
-                    scaled_value = value * eyewide_left_scale
-                elif i == FaceBlendShape.EyeWideRight.value:
-                    scaled_value = value * eyewide_right_scale
-                elif i == FaceBlendShape.EyeSquintLeft.value:
-                    scaled_value = value * eyesquint_left_scale
-                elif i == FaceBlendShape.EyeSquintRight.value:
-                    scaled_value = value * eyesquint_right_scale
-                else:
-                    scaled_value = value * eye_scale  
-            elif i in [bs.value for bs in EYEBROW_BLENDSHAPES]:
-                scaled_value = value * eyebrow_scale
-            else:
-                scaled_value = value
-            
-            if scaled_value > 1.0:
-                scaled_value = 1.0
-            scaled_blendshapes.append(max(scaled_value, 0.0))
-        else:
-            scaled_blendshapes.append(max(value, 0.0))
-    
-    return scaled_blendshapes
+    values = np.asarray(blendshapes, dtype=np.float64)
+    scaled = values * scale_vector
+    scaled = np.where(scaled > 1.0, 1.0, scaled)
+    scaled = np.where(values > threshold, scaled, values)
+    # where() rather than maximum(), so -0.0 and NaN pass through exactly as max(value, 0.0) did
+    return np.where(scaled < 0.0, 0.0, scaled)
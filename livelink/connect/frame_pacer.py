@@ -0,0 +1,119 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# frame_pacer.py
+#
+# Frame clock for the animation scheduler's idle and speech frames. Frame i is due at
+# start + i / fps on the perf_counter_ns clock, so errors never accumulate across frames.
+
+import time
+
+CATCH_UP_POLICIES = ("drop", "compress")
+
+
+class FramePacer:
+    """
+    Paces frames against a fixed schedule. wait() sleeps until spin_ms before a frame's
+    deadline and spins for the rest, since a plain sleep can overshoot by a millisecond
+    or more.
+
+    A frame more than max_lateness_frames behind when its turn comes is either dropped
+    ("drop": the face stays in sync with the audio) or sent at once, followed by the
+    frames after it, until the schedule is met again ("compress": every mouth shape is
+    shown). Sent frames more than late_ms past their deadline count as late.
+    """
+
+    def __init__(self, fps: float, catch_up: str = "drop", spin_ms: float = 1.0,
+                 max_lateness_frames: float = 1.0, late_ms: float = 1.0) -> None:
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}, got {catch_up!r}")
+        self.fps = fps
+        self.catch_up = catch_up
+        self.spin_ns = int(spin_ms * 1_000_000)
+        self.max_lateness_ns = int(max_lateness_frames * 1_000_000_000 / fps)
+        self.late_ns = int(late_ms * 1_000_000)
+        self.start()
+
+    def start(self, start_ns: int = None) -> None:
+        """Start the schedule (frame 0 is due now, or at start_ns) and clear the stats."""
+        self._start_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        self._last_due = None
+        self._last_lateness_ns = 0
+        self.reset_stats()
+
+    def reset_stats(self, keep_last: bool = False) -> None:
+        """
+        Clear the stats, e.g. to report on one stretch of frames. With keep_last the frame
+        wait() last returned for (sent or dropped) stays counted, as the first of the stretch.
+        """
+        last_due, last_lateness = self._last_due, self._last_lateness_ns
+        self.sent = 0
+        self.dropped = 0
+        self.late = 0
+        self._lateness_sum_ns = 0
+        self._max_lateness_ns = 0
+        self._last_lateness_ns = 0
+        if keep_last and last_due is not None:
+            self._count(last_due, last_lateness)
+
+    def resync(self, frame_index: int) -> None:
+        """Shift the schedule so frame_index is due now; the stats carry on."""
+        self._start_ns = time.perf_counter_ns() - round(frame_index * 1_000_000_000 / self.fps)
+
+    def deadline_ns(self, frame_index: int) -> int:
+        return self._start_ns + round(frame_index * 1_000_000_000 / self.fps)
+
+    def wait(self, frame_index: int, stop_event=None):
+        """
+        Block until frame_index is due and return True. Returns False if the drop policy
+        skips the frame (counted as dropped), or None if stop_event was set while waiting:
+        the frame is not due yet and nothing is counted, so wait for it again.
+        """
+        deadline = self.deadline_ns(frame_index)
+        now = time.perf_counter_ns()
+        if now - deadline > self.max_lateness_ns and self.catch_up == "drop":
+            self._count(False)
+            return False
+
+        sleep_ns = deadline - now - self.spin_ns
+        if sleep_ns > 0:
+            if stop_event is not None:
+                if stop_event.wait(sleep_ns / 1_000_000_000):
+                    return None
+            else:
+                time.sleep(sleep_ns / 1_000_000_000)
+        while time.perf_counter_ns() < deadline:
+            time.sleep(0)  # lets other threads have the GIL while spinning
+
+        self._count(True, time.perf_counter_ns() - deadline)
+        return True
+
+    def _count(self, due: bool, lateness: int = 0) -> None:
+        self._last_due = due
+        if not due:
+            self.dropped += 1
+            return
+        self.sent += 1
+        self._lateness_sum_ns += lateness
+        self._max_lateness_ns = max(self._max_lateness_ns, lateness)
+        self._last_lateness_ns = lateness
+        if lateness > self.late_ns:
+            self.late += 1
+
+    def summary(self) -> dict:
+        return {
+            "frames": self.sent + self.dropped,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "late": self.late,
+            "mean_lateness_ms": self._lateness_sum_ns / self.sent / 1_000_000 if self.sent else 0.0,
+            "max_lateness_ms": self._max_lateness_ns / 1_000_000,
+            "drift_ms": self._last_lateness_ns / 1_000_000,
+        }
+
+    def print_summary(self, label: str = "Frame pacing") -> None:
+        stats = self.summary()
+        print(f"{label}: {stats['sent']}/{stats['frames']} frames sent, {stats['dropped']} dropped, "
+              f"{stats['late']} late (mean {stats['mean_lateness_ms']:.2f} ms, max {stats['max_lateness_ms']:.2f} ms, "
+              f"drift {stats['drift_ms']:.2f} ms)")
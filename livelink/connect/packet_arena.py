@@ -0,0 +1,58 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# packet_arena.py
+#
+# Pre-encoded LiveLink packets for one utterance, stored back to back in a single
+# bytearray. A PyLiveLinkFace packet has a fixed size for a given name/UUID, so packet
+# i lives at i * packet_size and is sent as a memoryview slice, without a copy.
+
+
+class PacketArena:
+    """
+    N fixed-size packets in one contiguous buffer. Indexing and iteration give memoryview
+    slices into it. reserve() reuses the buffer for the next utterance and only allocates
+    when a longer one comes along.
+    """
+
+    def __init__(self, packet_size: int = 0, count: int = 0) -> None:
+        self._buffer = bytearray(packet_size * count)
+        self._view = memoryview(self._buffer)
+        self.packet_size = packet_size
+        self.count = count
+
+    def reserve(self, packet_size: int, count: int) -> memoryview:
+        """
+        Make room for count packets of packet_size bytes and return the writable region.
+        Packets handed out earlier stay valid only if the buffer didn't have to grow.
+        """
+        size = packet_size * count
+        if size > len(self._buffer):
+            self._buffer = bytearray(size)
+            self._view = memoryview(self._buffer)
+        self.packet_size = packet_size
+        self.count = count
+        return self._view[:size]
+
+    @property
+    def nbytes(self) -> int:
+        return self.packet_size * self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> memoryview:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("packet index out of range")
+        offset = index * self.packet_size
+        return self._view[offset:offset + self.packet_size]
+
+    def __iter__(self):
+        view, size = self._view, self.packet_size
+        if not size:
+            return
+        for offset in range(0, self.nbytes, size):
+            yield view[offset:offset + size]
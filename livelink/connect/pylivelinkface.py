@@ -13,8 +13,11 @@ import datetime
 import struct
 import uuid
 
-from livelink.connect.dimension_scalars import scale_blendshapes_by_section 
+import numpy as np
+
+from livelink.connect.dimension_scalars import build_scale_vector, apply_scale_vector
 from livelink.connect.faceblendshapes import FaceBlendShape
+from livelink.connect.packet_arena import PacketArena
 
 class PyLiveLinkFace:
     def __init__(self, name: str = "face1", uuid: str = str(uuid.uuid1()), fps=60, filter_size: int = 0) -> None:
@@ -31,6 +34,7 @@ class PyLiveLinkFace:
         self._scaling_factor_eyewide_right = 0.4
         self._scaling_factor_eyesquint_left = 1.0
         self._scaling_factor_eyesquint_right = 1.0
+        self._scale_vector = self._build_scale_vector()
 
         now = datetime.datetime.now()
         timcode = Timecode(self.fps, f'{now.hour}:{now.minute}:{now.second}:{now.microsecond * 0.001}')
@@ -39,31 +43,121 @@ class PyLiveLinkFace:
         self._denominator = int(self.fps / 60)
         self._blend_shapes = [0.0] * 61
         self._old_blend_shapes = [deque([0.0], maxlen=filter_size) for _ in range(61)]
+        self._header_key = None
+        self._header = b""
 
     def encode(self) -> bytes:
-        version_packed = struct.pack('<I', self._version)
-        uuid_packed = self.uuid.encode('utf-8')
-        name_packed = self.name.encode('utf-8')
-        name_length_packed = struct.pack('!i', len(self.name))
+        # Timecode, sub frame, frame rate, denominator and the blendshape count in one pack
+        fields_packed = struct.pack("!IIIIB", self.current_timecode_frames(), self._sub_frame, self.fps, self._denominator, 61)
+    
+        scaled_blend_shapes = apply_scale_vector(self._blend_shapes, self._scale_vector)
+    
+        # Same bytes as struct.pack('!61f', *scaled_blend_shapes)
+        return self._header_packed() + fields_packed + scaled_blend_shapes.astype('>f4').tobytes()
+
+    def encode_into(self, frames: np.ndarray, arena: PacketArena = None, start_frame: int = None) -> PacketArena:
+        """
+        Encode a (N, 61) block of blendshape frames into N packets in one pass, written
+        straight into one contiguous buffer (arena, reused if given) and read back as
+        memoryview slices, so an utterance costs one allocation however many frames it has.
+
+        Each packet is byte-identical to setting the frame and calling encode(), except for
+        the timecode: frame i is stamped start_frame + i (default: the current timecode)
+        instead of reading the clock per packet.
+        """
+        frames = self._check_frames(frames)
+        packet = self._packet_dtype()
+        arena = arena if arena is not None else PacketArena()
+        packets = np.frombuffer(arena.reserve(packet.itemsize, len(frames)), dtype=packet)
+        self._fill_packets(packets, frames, start_frame)
+        return arena
+
+    def stamp_timecode(self, packet, frames: int = None) -> None:
+        """
+        Overwrite the timecode of an encoded packet in place with frames (default: the
+        current timecode). packet has to be writable, e.g. a PacketArena slice.
+        """
+        if frames is None:
+            frames = self.current_timecode_frames()
+        struct.pack_into("!I", packet, len(self._header_packed()), frames)
+
+    def current_timecode_frames(self) -> int:
         now = datetime.datetime.now()
         timcode = Timecode(self.fps, f'{now.hour}:{now.minute}:{now.second}:{now.microsecond * 0.001}')
-        frames_packed = struct.pack("!II", timcode.frames, self._sub_frame)
-        frame_rate_packed = struct.pack("!II", self.fps, self._denominator)
-    
-        scaled_blend_shapes = scale_blendshapes_by_section(
-            self._blend_shapes, 
-            self._scaling_factor_mouth, 
-            self._scaling_factor_eyes, 
-            self._scaling_factor_eyebrows, 
-            eyewide_left_scale=self._scaling_factor_eyewide_left, 
-            eyewide_right_scale=self._scaling_factor_eyewide_right, 
-            eyesquint_left_scale=self._scaling_factor_eyesquint_left, 
+        return timcode.frames
+
+    def _header_packed(self) -> bytes:
+        # Packed once per version/UUID/name rather than on every frame
+        key = (self._version, self.uuid, self.name)
+        if key != self._header_key:
+            version_packed = struct.pack('<I', self._version)
+            uuid_packed = self.uuid.encode('utf-8')
+            name_packed = self.name.encode('utf-8')
+            name_length_packed = struct.pack('!i', len(self.name))
+            self._header = version_packed + uuid_packed + name_length_packed + name_packed
+            self._header_key = key
+        return self._header
+
+    def _packet_dtype(self) -> np.dtype:
+        """The byte layout of one encode() packet as a NumPy structured dtype."""
+        return np.dtype([
+            ('header', np.uint8, (len(self._header_packed()),)),
+            ('frames', '>u4'),
+            ('sub_frame', '>u4'),
+            ('fps', '>u4'),
+            ('denominator', '>u4'),
+            ('count', np.uint8),
+            ('values', '>f4', (61,)),
+        ])
+
+    def _fill_packets(self, packets: np.ndarray, frames: np.ndarray, start_frame: int = None) -> None:
+        if start_frame is None:
+            start_frame = self.current_timecode_frames()
+        packets['header'] = np.frombuffer(self._header_packed(), dtype=np.uint8)
+        packets['frames'] = start_frame + np.arange(len(frames))
+        packets['sub_frame'] = self._sub_frame
+        packets['fps'] = self.fps
+        packets['denominator'] = self._denominator
+        packets['count'] = 61
+        packets['values'] = apply_scale_vector(frames, self._scale_vector)
+
+    @staticmethod
+    def _check_frames(frames: np.ndarray) -> np.ndarray:
+        frames = np.asarray(frames)
+        if frames.ndim != 2 or frames.shape[1] != 61:
+            raise ValueError(f"expected a (N, 61) array of frames, got shape {frames.shape}")
+        return frames
+
+    def set_scaling_factors(self, mouth: float = None, eyes: float = None, eyebrows: float = None,
+                            eyewide_left: float = None, eyewide_right: float = None,
+                            eyesquint_left: float = None, eyesquint_right: float = None) -> None:
+        """Update the section scaling factors (None keeps the current value) and recompile the scale vector."""
+        if mouth is not None:
+            self._scaling_factor_mouth = mouth
+        if eyes is not None:
+            self._scaling_factor_eyes = eyes
+        if eyebrows is not None:
+            self._scaling_factor_eyebrows = eyebrows
+        if eyewide_left is not None:
+            self._scaling_factor_eyewide_left = eyewide_left
+        if eyewide_right is not None:
+            self._scaling_factor_eyewide_right = eyewide_right
+        if eyesquint_left is not None:
+            self._scaling_factor_eyesquint_left = eyesquint_left
+        if eyesquint_right is not None:
+            self._scaling_factor_eyesquint_right = eyesquint_right
+        self._scale_vector = self._build_scale_vector()
+
+    def _build_scale_vector(self) -> np.ndarray:
+        return build_scale_vector(
+            self._scaling_factor_mouth,
+            self._scaling_factor_eyes,
+            self._scaling_factor_eyebrows,
+            eyewide_left_scale=self._scaling_factor_eyewide_left,
+            eyewide_right_scale=self._scaling_factor_eyewide_right,
+            eyesquint_left_scale=self._scaling_factor_eyesquint_left,
             eyesquint_right_scale=self._scaling_factor_eyesquint_right
         )
-    
-        data_packed = struct.pack('!B61f', 61, *scaled_blend_shapes)
-
-        return version_packed + uuid_packed + name_length_packed + name_packed + frames_packed + frame_rate_packed + data_packed
 
     def set_blendshape(self, index: FaceBlendShape, value: float, no_filter: bool = True) -> None:        
         if index in [FaceBlendShape.HeadYaw, FaceBlendShape.HeadPitch, FaceBlendShape.HeadRoll]:
@@ -3,12 +3,12 @@
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
-import time
 from typing import List
 
-from livelink.connect.livelink_init import create_socket_connection, FaceBlendShape
+import numpy as np
+
+from livelink.connect.livelink_init import FaceBlendShape
 from livelink.animations.default_animation import default_animation_data
-from livelink.animations.blending_anims import blend_in, blend_out  
 
 
 def apply_blink_to_facial_data(facial_data: List, default_animation_data: List[List[float]]):
@@ -25,64 +25,36 @@ def apply_blink_to_facial_data(facial_data: List, default_animation_data: List[L
                 frame[blink_idx] = default_animation_data[default_idx][blink_idx]
 
 
-def smooth_facial_data(facial_data: list) -> list:
+def smooth_facial_array(facial_data: np.ndarray) -> np.ndarray:
+    """Every frame after the first is averaged with the one before."""
     if len(facial_data) < 2:
-        return facial_data.copy()  
-
-    smoothed_data = [facial_data[0]]
-    for i in range(1, len(facial_data)):
-        previous_frame = facial_data[i - 1]
-        current_frame = facial_data[i]
-        averaged_frame = [(a + b) / 2 for a, b in zip(previous_frame, current_frame)]
-        smoothed_data.append(averaged_frame)
-    
+        return facial_data.copy()
+    smoothed_data = np.empty_like(facial_data)
+    smoothed_data[0] = facial_data[0]
+    smoothed_data[1:] = (facial_data[:-1] + facial_data[1:]) / 2
     return smoothed_data
 
-def pre_encode_facial_data(facial_data: list, py_face, fps: int = 60, smooth: bool = True) -> list:
+def prepare_facial_array(facial_data: list, smooth: bool = True) -> np.ndarray:
+    """Applies the default animation's blinks to facial_data and returns it as a smoothed float array."""
     apply_blink_to_facial_data(facial_data, default_animation_data)
+
+    facial_data = np.asarray(facial_data)
+    if not np.issubdtype(facial_data.dtype, np.floating):
+        facial_data = facial_data.astype(np.float64)
     
     # If smoothing is enabled, apply smoothing to the facial data
     if smooth:
-        facial_data = smooth_facial_data(facial_data)  
-
-    encoded_data = []
-    blend_in_frames = int(0.1 * fps)
-    blend_out_frames = int(0.2 * fps)
-
-    blend_in(facial_data, fps, py_face, encoded_data, blend_in_frames, default_animation_data)
-
-    for frame_index, frame_data in enumerate(facial_data[blend_in_frames:-blend_out_frames]):
-        for i in range(min(len(frame_data), 51)):
-            py_face.set_blendshape(FaceBlendShape(i), frame_data[i])
-        encoded_data.append(py_face.encode())
-    
-    blend_out(facial_data, fps, py_face, encoded_data, blend_out_frames, default_animation_data)
-    return encoded_data
-
-def send_pre_encoded_data_to_unreal(encoded_facial_data: List[bytes], start_event, fps: int, socket_connection=None):
-    try:
-        own_socket = False
-        if socket_connection is None:
-            socket_connection = create_socket_connection()
-            own_socket = True
-
-        start_event.wait()  
-        frame_duration = 1 / fps  
-        start_time = time.time()  
-
-        for frame_index, frame_data in enumerate(encoded_facial_data):
-            current_time = time.time()
-            elapsed_time = current_time - start_time
-            expected_time = frame_index * frame_duration 
-            if elapsed_time < expected_time:
-                time.sleep(expected_time - elapsed_time)
-            elif elapsed_time > expected_time + frame_duration:
-                continue
+        facial_data = smooth_facial_array(facial_data)
+    return facial_data
 
-            socket_connection.sendall(frame_data)  
-
-    except KeyboardInterrupt:
-        pass
-    finally:
-        if own_socket:
-            socket_connection.close()
+def prepare_speech_frames(facial_data: list, smooth: bool = True) -> np.ndarray:
+    """
+    The (N, 61) frames AnimationScheduler.speak() takes: blinked and smoothed, with the first
+    51 blendshapes from the facial data and the rest at zero.
+    The blends into and out of speech are left to the scheduler's crossfades.
+    """
+    facial_data = prepare_facial_array(facial_data, smooth)
+    frames = np.zeros((len(facial_data), 61))
+    columns = min(facial_data.shape[1], 51)
+    frames[:, :columns] = facial_data[:, :columns]
+    return frames
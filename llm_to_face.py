@@ -22,8 +22,6 @@ try:
     import time
     import string
     
-    from livelink.animations.default_animation import stop_default_animation
-    
     from utils.stt.transcribe_whisper import transcribe_audio
     
     from utils.audio.record_audio import record_audio_until_release
@@ -85,7 +83,7 @@ def main():
         audio_queue = system_objects['audio_queue']
         tts_worker_thread = system_objects['tts_worker_thread']
         audio_worker_thread = system_objects['audio_worker_thread']
-        default_animation_thread = system_objects['default_animation_thread']
+        animation_scheduler = system_objects['animation_scheduler']
         
         # Show LLM and TTS configuration
         if USE_OLLAMA:
@@ -139,7 +137,7 @@ def main():
                         if user_input.lower() == 'q':
                             break
 
-                    chat_history = process_turn(user_input, chat_history, full_history, llm_config, chunk_queue, audio_queue, vector_db, base_system_message=BASE_SYSTEM_MESSAGE)
+                    chat_history = process_turn(user_input, chat_history, full_history, llm_config, chunk_queue, audio_queue, vector_db, base_system_message=BASE_SYSTEM_MESSAGE, animation_scheduler=animation_scheduler)
                 except KeyboardInterrupt:
                     print("\nInterrupted by user. Exiting.")
                     break
@@ -158,8 +156,7 @@ def main():
                 audio_queue.join()
                 audio_queue.put(None)
                 audio_worker_thread.join()
-                stop_default_animation.set()
-                default_animation_thread.join()
+                animation_scheduler.stop()
                 pygame.quit()
                 socket_connection.close()
                 print("Cleanup complete")
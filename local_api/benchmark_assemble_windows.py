@@ -0,0 +1,94 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_assemble_windows.py
+#
+# Post-processing of decoded windows for one clip: the previous blend_chunks chain (per-row
+# cross-fade, np.vstack per window, /100, easing, copying zero_columns) against
+# assemble_decoded_windows. Reports time and peak traced memory against the size of the
+# output itself, and checks the outputs agree. Model inference is left out; the decoded
+# windows are synthetic.
+# Run from the local_api directory:
+#
+#   python benchmark_assemble_windows.py --minutes 10
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils.audio.processing.audio_processing import assemble_decoded_windows, get_window_starts
+from utils.config import config
+
+
+def reference_blend_chunks(chunk1, chunk2, overlap):
+    actual_overlap = min(overlap, len(chunk1), len(chunk2))
+    if actual_overlap == 0:
+        return np.vstack((chunk1, chunk2))
+
+    blended_chunk = np.copy(chunk1)
+    for i in range(actual_overlap):
+        alpha = i / actual_overlap
+        blended_chunk[-actual_overlap + i] = (1 - alpha) * chunk1[-actual_overlap + i] + alpha * chunk2[i]
+
+    return np.vstack((blended_chunk, chunk2[actual_overlap:]))
+
+
+def reference_assemble(decoded_windows, window_starts, num_frames, overlap):
+    """The previous process_audio_features post-processing, kept as the reference."""
+    all_decoded_outputs = []
+    for window, start_idx in zip(decoded_windows, window_starts):
+        decoded_outputs = window[:min(len(window), num_frames - start_idx)]
+        if all_decoded_outputs:
+            last_chunk = all_decoded_outputs.pop()
+            all_decoded_outputs.append(reference_blend_chunks(last_chunk, decoded_outputs, overlap))
+        else:
+            all_decoded_outputs.append(decoded_outputs)
+
+    final_decoded_outputs = np.concatenate(all_decoded_outputs, axis=0)[:num_frames]
+    final_decoded_outputs[:, :61] /= 100
+
+    ease_duration_frames = min(int(0.1 * 60), final_decoded_outputs.shape[0])
+    easing_factors = np.linspace(0, 1, ease_duration_frames)[:, None]
+    final_decoded_outputs[:ease_duration_frames] *= easing_factors
+
+    columns_to_zero = [0, 1, 2, 3, 4, 7, 8, 9, 10, 11, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60]
+    modified_data = np.copy(final_decoded_outputs)
+    modified_data[:, columns_to_zero] = 0
+    return modified_data
+
+
+def measure(name, assemble, decoded_windows, window_starts, num_frames, overlap):
+    start = time.perf_counter()
+    output = assemble(decoded_windows, window_starts, num_frames, overlap)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    assemble(decoded_windows, window_starts, num_frames, overlap)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<26} {elapsed:7.3f} s   peak {peak / 2 ** 20:6.1f} MB ({peak / output.nbytes:.1f}x the output)")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="blend_chunks chain vs assemble_decoded_windows")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    args = parser.parse_args()
+
+    frame_length = config['frame_size']
+    overlap = config.get('overlap', 32)
+    num_frames = int(args.minutes * 60 * config['frame_rate'])
+    window_starts = get_window_starts(num_frames, frame_length, overlap)
+    decoded_windows = np.random.default_rng(0).uniform(0, 100, (len(window_starts), frame_length, config['output_dim'])).astype(np.float32)
+    print(f"{num_frames} frames, {len(window_starts)} windows of {frame_length}, overlap {overlap}")
+
+    reference = measure("blend_chunks chain", reference_assemble, decoded_windows, window_starts, num_frames, overlap)
+    output = measure("assemble_decoded_windows", assemble_decoded_windows, decoded_windows, window_starts, num_frames, overlap)
+    print(f"max difference {np.max(np.abs(reference - output)):.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# benchmark_rope.py
+#
+# Per-layer timing of the rotary embedding: the previous apply_rope_qk (tables rebuilt on
+# every call, even/odd split and stack/flatten interleave) against the cached tables and
+# fused rotation. Times RoPE on q and k alone, one encoder layer and one decoder layer at
+# the configured model size on randomly initialised weights, and checks the outputs agree.
+# Run from the local_api directory:
+#
+#   python benchmark_rope.py --batch 16 --repeats 5
+
+import argparse
+import time
+
+import torch
+
+import utils.model.model as model_module
+from utils.model.model import CustomTransformerDecoderLayer, CustomTransformerEncoderLayer, RotaryEmbeddingCache
+from utils.config import config
+
+
+def reference_apply_rope_qk(q, k, use_local_positional_encoding=True, rope_cache=None):
+    """The previous apply_rope_qk, kept as the reference (rope_cache is ignored)."""
+    if not use_local_positional_encoding:
+        return q, k
+
+    batch_size, num_heads, seq_len, head_dim = q.size()
+    position = torch.arange(seq_len, dtype=torch.float, device=q.device).unsqueeze(1)
+    dim_indices = torch.arange(0, head_dim, 2, dtype=torch.float, device=q.device)
+    div_term = torch.exp(-torch.log(torch.tensor(10000.0)) * dim_indices / head_dim)
+
+    angle = position * div_term
+    sin = torch.sin(angle).unsqueeze(0).unsqueeze(0)
+    cos = torch.cos(angle).unsqueeze(0).unsqueeze(0)
+
+    def rope_transform(x):
+        x1, x2 = x[..., ::2], x[..., 1::2]
+        x_rope_even = x1 * cos - x2 * sin
+        x_rope_odd = x1 * sin + x2 * cos
+        return torch.stack([x_rope_even, x_rope_odd], dim=-1).flatten(-2)
+
+    return rope_transform(q), rope_transform(k)
+
+
+def best_time(fn, repeats):
+    fn()  # warm-up
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RoPE per call and per layer: rebuilt tables vs cached, fused rotation")
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    hidden_dim, num_heads, seq_len = config['hidden_dim'], config['num_heads'], config['frame_size']
+    head_dim = hidden_dim // num_heads
+    rope_cache = RotaryEmbeddingCache(seq_len)
+    encoder_layer = CustomTransformerEncoderLayer(hidden_dim, num_heads).eval()
+    decoder_layer = CustomTransformerDecoderLayer(hidden_dim, num_heads).eval()
+    for module in list(encoder_layer.modules()) + list(decoder_layer.modules()):
+        if isinstance(module, model_module.MultiHeadAttention):
+            module.rope_cache = rope_cache
+
+    q = torch.randn(args.batch, num_heads, seq_len, head_dim)
+    k = torch.randn(args.batch, num_heads, seq_len, head_dim)
+    x = torch.randn(args.batch, seq_len, hidden_dim)
+    cases = [
+        ("RoPE on q+k", lambda: model_module.apply_rope_qk(q, k, rope_cache=rope_cache)),
+        ("encoder layer", lambda: encoder_layer(x)),
+        ("decoder layer", lambda: decoder_layer(x, x)),
+    ]
+    print(f"batch {args.batch} x {seq_len} frames, hidden {hidden_dim}, {num_heads} heads, "
+          f"{torch.get_num_threads()} threads, best of {args.repeats}")
+
+    current_apply_rope_qk = model_module.apply_rope_qk
+    with torch.no_grad():
+        for name, fn in cases:
+            model_module.apply_rope_qk = reference_apply_rope_qk
+            reference_output = fn()
+            reference_time = best_time(fn, args.repeats)
+            model_module.apply_rope_qk = current_apply_rope_qk
+            output = fn()
+            cached_time = best_time(fn, args.repeats)
+
+            outputs = zip(reference_output, output) if isinstance(output, tuple) else [(reference_output, output)]
+            max_diff = max(float((a - b).abs().max()) for a, b in outputs)
+            print(f"{name:<14} rebuilt {reference_time * 1000:8.2f} ms   cached {cached_time * 1000:8.2f} ms   "
+                  f"max diff {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# check_feature_modes.py
+#
+# Regression check for feature_mode='native': decodes the same TTS-rate clips through both
+# feature modes and fails (exit code 1) if the native blendshapes drift from the upsample
+# ones by more than MAX_RELATIVE_MAE of the output's mean magnitude.
+# Run from the local_api directory:  python check_feature_modes.py
+#
+# The clips are synthetic voiced speech (a gliding harmonic source through moving formants)
+# at the sample rates the TTS backends produce. If utils/model/model.pth is missing or
+# empty, a seeded, randomly initialised model of the configured shape is used instead.
+
+import copy
+import io
+import os
+import sys
+
+import numpy as np
+import soundfile as sf
+import torch
+
+from utils.audio.extraction.extract_features import extract_audio_features
+from utils.audio.processing.audio_processing import process_audio_features
+from utils.model.model import Decoder, Encoder, Seq2Seq, load_model
+from utils.config import config
+
+MODEL_PATH = 'utils/model/model.pth'
+SAMPLE_RATES = [16000, 22050, 24000, 44100]
+CLIP_SECONDS = 5.0
+MAX_RELATIVE_MAE = 0.05
+
+
+def synthetic_speech(sr, seconds, seed):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sr * seconds)) / sr
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 2 * np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    formants = [(500 + 200 * np.sin(2 * np.pi * 1.3 * t), 80), (1500 + 400 * np.sin(2 * np.pi * 0.9 * t), 120),
+                (2500, 160)]
+    y = np.zeros_like(t)
+    for harmonic in range(1, 40):
+        frequency = harmonic * f0
+        gain = sum(np.exp(-0.5 * ((frequency - centre) / width) ** 2) for centre, width in formants)
+        y += np.where(frequency < sr / 2, gain * np.sin(harmonic * phase), 0.0)
+    y *= 0.5 + 0.5 * np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None)  # syllable-like envelope
+    y += 0.005 * rng.standard_normal(len(t))
+    return y / np.max(np.abs(y))
+
+
+def wav_bytes(y, sr):
+    buffer = io.BytesIO()
+    sf.write(buffer, y.astype(np.float32), sr, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+def build_model(model_config, device):
+    if os.path.exists(MODEL_PATH) and os.path.getsize(MODEL_PATH) > 0:
+        return load_model(MODEL_PATH, model_config, device)
+    print(f"{MODEL_PATH} is missing or empty, using a seeded random model")
+    torch.manual_seed(0)
+    encoder = Encoder(model_config['input_dim'], model_config['hidden_dim'], model_config['n_layers'], model_config['num_heads'])
+    decoder = Decoder(model_config['output_dim'], model_config['hidden_dim'], model_config['n_layers'], model_config['num_heads'])
+    return Seq2Seq(encoder, decoder, device, max_seq_len=model_config['frame_size']).to(device).eval()
+
+
+def decode(audio_bytes, feature_mode, model, device, model_config):
+    features, _ = extract_audio_features(audio_bytes, from_bytes=True, feature_mode=feature_mode)
+    return features, np.asarray(process_audio_features(features, model, device, model_config))
+
+
+def main():
+    device = torch.device('cpu')
+    model_config = copy.deepcopy(config)
+    model_config.update(quantization=None, compile_model=False, use_half_precision=False)
+    model = build_model(model_config, device)
+
+    failures = 0
+    for seed, sr in enumerate(SAMPLE_RATES):
+        audio_bytes = wav_bytes(synthetic_speech(sr, CLIP_SECONDS, seed), sr)
+        upsample_features, upsample_output = decode(audio_bytes, 'upsample', model, device, model_config)
+        native_features, native_output = decode(audio_bytes, 'native', model, device, model_config)
+
+        if upsample_output.shape != native_output.shape:
+            print(f"{sr} Hz: FAIL, output shapes differ {upsample_output.shape} vs {native_output.shape}")
+            failures += 1
+            continue
+
+        feature_mae = float(np.mean(np.abs(upsample_features - native_features)))
+        mae = float(np.mean(np.abs(upsample_output - native_output)))
+        relative_mae = mae / max(float(np.mean(np.abs(upsample_output))), 1e-12)
+        ok = relative_mae <= MAX_RELATIVE_MAE
+        failures += not ok
+        print(f"{sr} Hz: {len(native_output)} frames, feature MAE {feature_mae:.4f}, blendshape MAE {mae:.2e} "
+              f"(max {np.max(np.abs(upsample_output - native_output)):.2e}, {relative_mae:.1%} of mean output) "
+              f"{'ok' if ok else 'FAIL'}")
+
+    print(f"{len(SAMPLE_RATES) - failures}/{len(SAMPLE_RATES)} sample rates within {MAX_RELATIVE_MAE:.0%}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# check_quantization.py
+#
+# Compares dynamic int8 inference against fp32 on the bundled audio:
+# mean absolute blendshape error, latency and serialized model size.
+# Run from the local_api directory:  python check_quantization.py
+
+import copy
+import glob
+import io
+import os
+import time
+
+import numpy as np
+import torch
+
+from utils.generate_face_shapes import generate_facial_data_from_bytes
+from utils.model.model import load_model
+from utils.config import config
+
+MODEL_PATH = 'utils/model/model.pth'
+AUDIO_FILES = ['../wav_input/audio.wav'] + sorted(glob.glob('../generated/*/audio.wav'))
+
+
+def model_size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def run(model, audio_bytes, model_config):
+    start = time.perf_counter()
+    output = generate_facial_data_from_bytes(audio_bytes, model, 'cpu', model_config)
+    return np.asarray(output), time.perf_counter() - start
+
+
+def main():
+    device = torch.device('cpu')
+
+    fp32_config = copy.deepcopy(config)
+    fp32_config.update(quantization=None, compile_model=False, use_half_precision=False)
+    int8_config = copy.deepcopy(fp32_config)
+    int8_config['quantization'] = 'dynamic_int8'
+
+    fp32_model = load_model(MODEL_PATH, fp32_config, device)
+    int8_model = load_model(MODEL_PATH, int8_config, device)
+    print(f"Model size: fp32 {model_size_mb(fp32_model):.1f} MB, int8 {model_size_mb(int8_model):.1f} MB")
+
+    errors, fp32_times, int8_times = [], [], []
+    for path in AUDIO_FILES:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            print(f"Skipping {path} (missing or empty)")
+            continue
+        with open(path, 'rb') as f:
+            audio_bytes = f.read()
+
+        fp32_output, fp32_time = run(fp32_model, audio_bytes, fp32_config)
+        int8_output, int8_time = run(int8_model, audio_bytes, int8_config)
+        if fp32_output.size == 0:
+            print(f"Skipping {path} (no audio decoded)")
+            continue
+
+        mae = float(np.mean(np.abs(fp32_output - int8_output)))
+        errors.append(mae)
+        fp32_times.append(fp32_time)
+        int8_times.append(int8_time)
+        print(f"{path}: {len(fp32_output)} frames, MAE {mae:.6f}, "
+              f"fp32 {fp32_time:.2f}s, int8 {int8_time:.2f}s")
+
+    if errors:
+        print(f"Mean absolute blendshape error over {len(errors)} files: {np.mean(errors):.6f}")
+        print(f"Total latency: fp32 {sum(fp32_times):.2f}s, int8 {sum(int8_times):.2f}s "
+              f"({sum(fp32_times) / sum(int8_times):.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
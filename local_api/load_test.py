@@ -0,0 +1,83 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# load_test.py
+#
+# Fires concurrent /audio_to_blendshapes requests at a running local API and reports
+# p50/p99 latency and decoded windows per second for each concurrency level. Rejected
+# requests (429 from the async server) are counted rather than treated as failures.
+# Point --url at port 5001 to load test neurosync_async_api.py instead of the Flask server.
+# Run from the local_api directory:  python load_test.py --audio ../wav_input/audio.wav
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import requests
+
+from utils.config import config
+from utils.response_format import HEADER
+
+
+def count_windows(num_frames):
+    step = config['frame_size'] - config.get('overlap', 32)
+    return len(range(0, num_frames, step))
+
+
+def client(url, audio_bytes, num_requests, latencies, windows, statuses, lock):
+    session = requests.Session()
+    for _ in range(num_requests):
+        start = time.perf_counter()
+        response = session.post(url, data=audio_bytes, params={'format': 'f32'},
+                                headers={'Content-Type': 'application/octet-stream'})
+        elapsed = time.perf_counter() - start
+        with lock:
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.ok:
+                _, _, _, frames, _ = HEADER.unpack_from(response.content)
+                latencies.append(elapsed)
+                windows.append(count_windows(frames))
+
+
+def run_level(url, audio_bytes, num_clients, requests_per_client):
+    latencies, windows, statuses, lock = [], [], {}, threading.Lock()
+    threads = [
+        threading.Thread(target=client, args=(url, audio_bytes, requests_per_client, latencies, windows, statuses, lock))
+        for _ in range(num_clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    errors = ', '.join(f"{count} x {status}" for status, count in sorted(statuses.items()) if status != 200)
+    if not latencies:
+        print(f"{num_clients:>3} clients | no successful requests | {errors}")
+        return
+    latencies = np.array(latencies) * 1000
+    print(f"{num_clients:>3} clients | {len(latencies):>4} ok | "
+          f"p50 {np.percentile(latencies, 50):8.1f} ms | p99 {np.percentile(latencies, 99):8.1f} ms | "
+          f"{sum(windows) / wall:7.1f} windows/s" + (f" | {errors}" if errors else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the local blendshape API")
+    parser.add_argument('--url', default='http://127.0.0.1:5000/audio_to_blendshapes')
+    parser.add_argument('--audio', default='../wav_input/audio.wav')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=8, help="requests per client")
+    args = parser.parse_args()
+
+    with open(args.audio, 'rb') as f:
+        audio_bytes = f.read()
+
+    for num_clients in args.clients:
+        run_level(args.url, audio_bytes, num_clients, args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# neurosync_async_api.py
+#
+# asyncio entry point serving the same /audio_to_blendshapes contract as neurosync_local_api.py
+# (JSON by default, binary frames via Accept / ?format=). Requests go into a bounded queue in
+# front of the inference workers: when it is full the server answers 429 straight away instead
+# of letting work pile up, requests that wait too long get 504, requests whose client hangs up
+# are dropped from the queue, and on shutdown the server stops accepting connections, drains
+# what is already queued and writes those responses before exiting.
+#
+# Run from the local_api directory:  python neurosync_async_api.py [--port 5001]
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import torch
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from utils.config import config
+from utils.response_format import BINARY_MIMETYPE, encode_blendshapes, negotiate_format
+from utils.server_setup import InferenceStack
+
+MODEL_PATH = 'utils/model/model.pth'
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class AsyncBlendshapeServer:
+    def __init__(self, inference_stack, config):
+        self.stack = inference_stack
+        self.queue_size = config.get('async_queue_size', 64)
+        self.num_workers = config.get('async_workers', 4)
+        self.request_timeout = config.get('async_request_timeout', 30.0)
+        self.drain_timeout = config.get('async_drain_timeout', 30.0)
+        self.max_request_bytes = config.get('max_request_bytes', 64 * 1024 * 1024)
+        self.max_header_count = config.get('max_header_count', 100)
+        self.max_header_bytes = config.get('max_header_bytes', 64 * 1024)
+        self.disconnect_poll_interval = 0.05
+
+        self._queue = None
+        self._workers = []
+        self._server = None
+        self._draining = False
+        self._connections = set()  # Every open connection's handler task
+        self._busy = set()  # Handlers between reading a request and writing its response
+        # Inference runs in threads; the scheduler batches across them.
+        self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix='inference')
+        self.stats = {'accepted': 0, 'rejected': 0, 'timed_out': 0, 'disconnected': 0, 'completed': 0, 'failed': 0}
+
+    async def serve(self, host, port):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.num_workers)]
+        # The stream limit bounds every line read, so also a single header or chunk-size line
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=self.max_header_bytes)
+        if hasattr(signal, 'SIGTERM') and os.name != 'nt':
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        print(f"Async blendshape API listening on http://{host}:{port} "
+              f"(queue {self.queue_size}, workers {self.num_workers})")
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.drain()
+
+    async def drain(self):
+        """
+        Stop accepting connections, finish queued requests and write their responses, then
+        close idle connections and stop the workers.
+        """
+        print("Draining in-flight requests...")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        self._draining = True
+        self._server.close()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            print(f"Drain timed out with {self._queue.qsize()} requests still queued.")
+        if self._busy:
+            # Their futures have resolved; let them write the responses (with Connection: close)
+            _, pending = await asyncio.wait(set(self._busy), timeout=max(deadline - loop.time(), 0))
+            if pending:
+                print(f"{len(pending)} responses were not written before the drain timeout.")
+        for task in self._connections | set(self._workers):
+            task.cancel()
+        await asyncio.gather(*self._connections, *self._workers, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            audio_bytes, future = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue  # The client timed out or went away while this was queued
+                result = await loop.run_in_executor(self._executor, self.stack.generate, audio_bytes)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    self._busy.add(task)
+                    method, path, query, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    status, content_type, payload, extra_headers = await self._dispatch(method, path, query, headers, body, reader)
+                except HTTPError as e:
+                    self._busy.add(task)
+                    keep_alive = False
+                    status, content_type, payload, extra_headers = e.status, 'application/json', \
+                        json.dumps({'error': str(e)}).encode('utf-8'), {}
+                keep_alive = keep_alive and not self._draining
+                self._write_response(writer, status, content_type, payload, extra_headers, keep_alive)
+                await writer.drain()
+                self._busy.discard(task)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._busy.discard(task)
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader, status):
+        """readline(), answering a line longer than the stream limit with `status`."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise HTTPError(status)
+
+    async def _read_request(self, reader):
+        request_line = await self._read_line(reader, HTTPStatus.REQUEST_URI_TOO_LONG)
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+
+        headers = {}
+        header_bytes = 0
+        while True:
+            line = await self._read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            header_bytes += len(line)
+            if len(headers) >= self.max_header_count or header_bytes > self.max_header_bytes:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while True:
+                size_line = await self._read_line(reader, HTTPStatus.BAD_REQUEST)
+                try:
+                    size = int(size_line.split(b';')[0], 16)
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, 'Malformed chunk size')
+                if size < 0:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, 'Malformed chunk size')
+                if size == 0:
+                    await reader.readline()
+                    break
+                if len(body) + size > self.max_request_bytes:
+                    raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+            body = bytes(body)
+        else:
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'Malformed Content-Length')
+            if length < 0:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'Malformed Content-Length')
+            if length > self.max_request_bytes:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body = await reader.readexactly(length) if length else b''
+
+        url = urlsplit(target)
+        return method.upper(), url.path, parse_qs(url.query), headers, body
+
+    async def _dispatch(self, method, path, query, headers, body, reader):
+        if path == '/audio_to_blendshapes' and method == 'POST':
+            return await self._audio_to_blendshapes(query, headers, body, reader)
+        if path == '/cache_stats' and method == 'GET':
+            return HTTPStatus.OK, 'application/json', json.dumps(self.stack.cache_stats()).encode('utf-8'), {}
+        if path == '/server_stats' and method == 'GET':
+            stats = dict(self.stats, queued=self._queue.qsize(), queue_size=self.queue_size)
+            return HTTPStatus.OK, 'application/json', json.dumps(stats).encode('utf-8'), {}
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    async def _audio_to_blendshapes(self, query, headers, body, reader):
+        try:
+            accept = parse_accept_header(headers.get('accept'), MIMEAccept)
+            response_format = negotiate_format(query.get('format', [None])[0], accept)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        if self._draining:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, 'Server is shutting down')
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((body, future))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            return HTTPStatus.TOO_MANY_REQUESTS, 'application/json', \
+                json.dumps({'error': 'Inference queue is full'}).encode('utf-8'), {'Retry-After': '1'}
+        self.stats['accepted'] += 1
+
+        # Cancelling the future makes the worker skip the request if it is still queued
+        disconnect = asyncio.create_task(self._wait_for_disconnect(reader))
+        try:
+            done, _ = await asyncio.wait({future, disconnect}, timeout=self.request_timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect.cancel()
+        if future not in done:
+            future.cancel()
+            if disconnect in done:
+                self.stats['disconnected'] += 1
+                raise ConnectionResetError("Client disconnected while its request was queued")
+            self.stats['timed_out'] += 1
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, 'Inference timed out')
+
+        try:
+            generated_facial_data = future.result()
+        except Exception as e:
+            self.stats['failed'] += 1
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        self.stats['completed'] += 1
+
+        if response_format:
+            return HTTPStatus.OK, BINARY_MIMETYPE, encode_blendshapes(generated_facial_data, response_format), {}
+
+        generated_facial_data_list = generated_facial_data.tolist() if isinstance(generated_facial_data, np.ndarray) else generated_facial_data
+        return HTTPStatus.OK, 'application/json', json.dumps({'blendshapes': generated_facial_data_list}, separators=(',', ':')).encode('utf-8'), {}
+
+    async def _wait_for_disconnect(self, reader):
+        """Returns once the client has closed its end of the connection."""
+        while not reader.at_eof():
+            await asyncio.sleep(self.disconnect_poll_interval)
+
+    @staticmethod
+    def _write_response(writer, status, content_type, payload, extra_headers, keep_alive):
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines += [f"{name}: {value}" for name, value in extra_headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        writer.write(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio server for the local blendshape API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    args = parser.parse_args()
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    print("Activated device:", device)
+    inference_stack = InferenceStack(MODEL_PATH, config, device)
+    server = AsyncBlendshapeServer(inference_stack, config)
+
+    started = time.perf_counter()
+    try:
+        # Ctrl+C and SIGTERM cancel serve(), which drains before returning
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        inference_stack.shutdown()
+        print(f"Stopped after {time.perf_counter() - started:.0f}s: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
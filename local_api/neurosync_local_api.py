@@ -4,13 +4,15 @@
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
 from flask import request, jsonify
+import multiprocessing
 import numpy as np
 import torch
 import flask
 
-from utils.generate_face_shapes import generate_facial_data_from_bytes
-from utils.model.model import load_model
 from utils.config import config
+from utils.server_setup import InferenceStack
+from utils.response_format import BINARY_MIMETYPE, DTYPE_CODES, encode_blendshapes, negotiate_format
+from utils.stream_face_shapes import STREAM_READ_SIZE, FaceShapeStream, read_stream_format
 
 app = flask.Flask(__name__)
 
@@ -18,15 +20,67 @@ device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 print("Activated device:", device)
 
 model_path = 'utils/model/model.pth'
-blendshape_model = load_model(model_path, config, device)
+
+# Feature workers started with "spawn" (Windows/macOS) re-import this module; only the
+# server process loads the model and owns the inference stage.
+if multiprocessing.parent_process() is None:
+    inference_stack = InferenceStack(model_path, config, device)
 
 @app.route('/audio_to_blendshapes', methods=['POST'])
 def audio_to_blendshapes_route():
+    try:
+        response_format = negotiate_format(request.args.get('format'), request.accept_mimetypes)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     audio_bytes = request.data
-    generated_facial_data = generate_facial_data_from_bytes(audio_bytes, blendshape_model, device, config)
+    generated_facial_data = inference_stack.generate(audio_bytes)
+
+    if response_format:
+        return flask.Response(encode_blendshapes(generated_facial_data, response_format), mimetype=BINARY_MIMETYPE)
+
     generated_facial_data_list = generated_facial_data.tolist() if isinstance(generated_facial_data, np.ndarray) else generated_facial_data
 
     return jsonify({'blendshapes': generated_facial_data_list})
 
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats_route():
+    return jsonify(inference_stack.cache_stats())
+
+@app.route('/audio_to_blendshapes_stream', methods=['POST'])
+def audio_to_blendshapes_stream_route():
+    """
+    Streaming variant: the body is 16-bit PCM (a WAV stream, or raw PCM described by ?sr= and
+    ?channels=) and may be sent chunked. The response is a chunked stream of binary blendshape
+    messages (see utils/response_format.py, ?format=f32|f16), one per batch of frames that is
+    final, sent as soon as each window is decoded.
+    """
+    response_format = request.args.get('format', 'f32').lower()
+    if response_format not in DTYPE_CODES:
+        return jsonify({'error': f"Unsupported format: {response_format}"}), 400
+
+    read = request.stream.read
+    try:
+        sr, channels, first_bytes = read_stream_format(
+            read, request.args.get('sr', 22050, type=int), request.args.get('channels', 1, type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        stream = FaceShapeStream(inference_stack.model, device, config, sr, channels, inference_stack.scheduler)
+        chunk = first_bytes
+        while chunk:
+            rows = stream.push(chunk)
+            if rows is not None and len(rows):
+                yield encode_blendshapes(rows, response_format)
+            chunk = read(STREAM_READ_SIZE)
+
+        rows = stream.finish()
+        if rows is not None and len(rows):
+            yield encode_blendshapes(rows, response_format)
+
+    return flask.Response(flask.stream_with_context(generate()), mimetype=BINARY_MIMETYPE)
+
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=5000)
+    app.run(host='127.0.0.1', port=5000, threaded=True)
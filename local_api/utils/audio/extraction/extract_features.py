@@ -3,22 +3,55 @@
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
 # extract_features.py
+import functools
 import io
+import math
+import warnings
 import librosa
 import numpy as np
+import scipy.fft
 import scipy.signal
 
+# The model was trained on features computed at 88.2 kHz with a 735-sample hop,
+# i.e. 120 feature frames per second before the 2:1 reduction.
+REFERENCE_SR = 88200
+FRAMES_PER_SECOND = 120
+
+
+def extract_audio_features(audio_input, sr=88200, from_bytes=False, autocorr_method="fft", feature_mode="upsample"):
+    """
+    feature_mode="upsample" resamples everything to `sr` (88.2 kHz) as the model was trained.
+    feature_mode="native" keeps the source rate (rounded up to a multiple of 120 Hz with a
+    cached polyphase resampler when needed), rescales frame/hop lengths to the same durations,
+    evaluates the 88.2 kHz mel layout on the native FFT bins and interpolates the
+    autocorrelation onto the 88.2 kHz lag grid, so the output layout is unchanged. That
+    interpolation is done in the FFT, so native mode needs autocorr_method="fft".
+    """
+    native = feature_mode == "native"
+    if not native and feature_mode != "upsample":
+        raise ValueError(f"Unknown feature mode: {feature_mode}")
+    if native and autocorr_method != "fft":
+        raise ValueError(f"feature_mode='native' requires autocorr_method='fft', got {autocorr_method!r}")
 
-def extract_audio_features(audio_input, sr=88200, from_bytes=False):
     try:
         if from_bytes:
-            y, sr = load_audio_from_bytes(audio_input, sr)
+            y, sr = load_audio_from_bytes(audio_input, None if native else sr)
         else:
-            y, sr = load_and_preprocess_audio(audio_input, sr)
+            y, sr = load_and_preprocess_audio(audio_input, None if native else sr)
     except Exception as e:
             print(f"Loading as WAV failed: {e}\nFalling back to PCM loading.")
-            y = load_pcm_audio_from_bytes(audio_input)  
-    
+            if native:
+                y = load_pcm_audio_from_bytes(audio_input, target_sr=None)
+                sr = 22050
+            else:
+                y = load_pcm_audio_from_bytes(audio_input)
+
+    if native:
+        feature_sr = native_feature_rate(sr)
+        if feature_sr != sr:
+            y = resample_polyphase(y, sr, feature_sr)
+            sr = feature_sr
+
     frame_length = int(0.01667 * sr)  # Frame length set to 0.01667 seconds (~60 fps)
     hop_length = frame_length // 2  # 2x overlap for smoother transitions
     min_frames = 9  # Minimum number of frames needed for delta calculation
@@ -29,19 +62,22 @@ def extract_audio_features(audio_input, sr=88200, from_bytes=False):
         print(f"Audio file is too short: {num_frames} frames, required: {min_frames} frames")
         return None, None
 
-    combined_features = extract_and_combine_features(y, sr, frame_length, hop_length)
+    combined_features = extract_and_combine_features(
+        y, sr, frame_length, hop_length, autocorr_method=autocorr_method,
+        reference_sr=REFERENCE_SR if native else None
+    )
     
     return combined_features, y
 
-def extract_and_combine_features(y, sr, frame_length, hop_length, include_autocorr=True):
+def extract_and_combine_features(y, sr, frame_length, hop_length, include_autocorr=True, autocorr_method="fft", reference_sr=None):
    
     all_features = []
-    mfcc_features = extract_mfcc_features(y, sr, frame_length, hop_length)
+    mfcc_features = extract_mfcc_features(y, sr, frame_length, hop_length, reference_sr=reference_sr)
     all_features.append(mfcc_features)
 
     if include_autocorr:
         autocorr_features = extract_autocorrelation_features(
-            y, sr, frame_length, hop_length
+            y, sr, frame_length, hop_length, method=autocorr_method, lag_sr=reference_sr
         )
         all_features.append(autocorr_features)
     
@@ -50,8 +86,42 @@ def extract_and_combine_features(y, sr, frame_length, hop_length, include_autoco
     return combined_features
 
 
-def extract_mfcc_features(y, sr, frame_length, hop_length, num_mfcc=23):
-    mfcc_features = extract_overlapping_mfcc(y, sr, num_mfcc, frame_length, hop_length)
+def native_feature_rate(sr):
+    """Smallest rate >= sr whose hop (sr / 120) is a whole number of samples."""
+    return int(math.ceil(sr / FRAMES_PER_SECOND)) * FRAMES_PER_SECOND
+
+
+@functools.lru_cache(maxsize=None)
+def get_mel_filterbank(sr, n_fft, n_mels=128, fmax=None):
+    """Mel filterbank cached per (sr, n_fft, n_mels, fmax) instead of rebuilt for every clip."""
+    with warnings.catch_warnings():
+        # Bands above the native Nyquist are legitimately empty when fmax is a reference rate's Nyquist.
+        warnings.simplefilter("ignore", UserWarning)
+        mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels, fmax=fmax)
+    mel_basis.setflags(write=False)
+    return mel_basis
+
+
+@functools.lru_cache(maxsize=None)
+def _polyphase_filter(up, down):
+    # Same Kaiser-windowed low-pass that scipy.signal.resample_poly designs internally.
+    max_rate = max(up, down)
+    taps = scipy.signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    taps.setflags(write=False)
+    return taps
+
+
+def resample_polyphase(y, orig_sr, target_sr, axis=0):
+    """Rational-factor polyphase resampling with the FIR design cached per rate pair."""
+    if orig_sr == target_sr:
+        return y
+    g = math.gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // g, int(orig_sr) // g
+    return scipy.signal.resample_poly(y, up, down, axis=axis, window=_polyphase_filter(up, down)).astype(y.dtype, copy=False)
+
+
+def extract_mfcc_features(y, sr, frame_length, hop_length, num_mfcc=23, reference_sr=None):
+    mfcc_features = extract_overlapping_mfcc(y, sr, num_mfcc, frame_length, hop_length, reference_sr=reference_sr)
     reduced_mfcc_features = reduce_features(mfcc_features)
     return reduced_mfcc_features.T
 
@@ -61,8 +131,13 @@ def cepstral_mean_variance_normalization(mfcc):
     return (mfcc - mean) / (std + 1e-10)
 
 
-def extract_overlapping_mfcc(chunk, sr, num_mfcc, frame_length, hop_length, include_deltas=True, include_cepstral=True, threshold=1e-5):
-    mfcc = librosa.feature.mfcc(y=chunk, sr=sr, n_mfcc=num_mfcc, n_fft=frame_length, hop_length=hop_length)
+def extract_overlapping_mfcc(chunk, sr, num_mfcc, frame_length, hop_length, include_deltas=True, include_cepstral=True, threshold=1e-5, reference_sr=None):
+    # With a reference rate, keep the mel bands of the reference layout (fmax = reference Nyquist).
+    fmax = reference_sr / 2 if reference_sr else None
+    mel_basis = get_mel_filterbank(sr, frame_length, fmax=fmax)
+    power = np.abs(librosa.stft(y=chunk, n_fft=frame_length, hop_length=hop_length)) ** 2
+    mel_spectrogram = np.einsum("...ft,mf->...mt", power, mel_basis, optimize=True)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel_spectrogram), n_mfcc=num_mfcc)
     if include_cepstral:
         mfcc = cepstral_mean_variance_normalization(mfcc)
 
@@ -90,7 +165,7 @@ def reduce_features(features):
 
 
 
-def extract_overlapping_autocorr(y, sr, frame_length, hop_length, num_autocorr_coeff=187, pad_signal=True, padding_mode="reflect", trim_padded=False):
+def extract_overlapping_autocorr(y, sr, frame_length, hop_length, num_autocorr_coeff=187, pad_signal=True, padding_mode="reflect", trim_padded=False, method="fft", lag_sr=None):
     if pad_signal:
         pad = frame_length // 2
         y_padded = np.pad(y, pad_width=pad, mode=padding_mode)
@@ -104,28 +179,81 @@ def extract_overlapping_autocorr(y, sr, frame_length, hop_length, num_autocorr_c
         valid_idx = np.where((start_indices >= pad) & (start_indices + frame_length <= len(y) + pad))[0]
         frames = frames[:, valid_idx]
 
-    frames = frames - np.mean(frames, axis=0, keepdims=True)
+    # Work frame-major (num_frames, frame_length) so every frame is contiguous in memory.
+    frames = frames.T
+    frames = frames - np.mean(frames, axis=1, keepdims=True)
     hann_window = np.hanning(frame_length)
-    windowed_frames = frames * hann_window[:, np.newaxis]
+    windowed_frames = frames * hann_window[np.newaxis, :]
+
+    if lag_sr and lag_sr != sr:
+        if method != "fft":
+            raise ValueError(f"Interpolating onto another lag grid requires method='fft', got {method!r}")
+        # Band-limited interpolation onto the lag grid of `lag_sr`: zero-pad the power
+        # spectrum so that the inverse FFT length scales by lag_sr / sr.
+        step = sr // math.gcd(int(sr), int(lag_sr))
+        n_fft = -(-(2 * frame_length - 1) // step) * step
+        autocorr_features = autocorr_fft(windowed_frames, num_autocorr_coeff + 1,
+                                         n_fft=n_fft, n_ifft=n_fft * lag_sr // sr)
+    elif method == "fft":
+        autocorr_features = autocorr_fft(windowed_frames, num_autocorr_coeff + 1)
+    elif method == "direct":
+        autocorr_features = autocorr_direct(windowed_frames, num_autocorr_coeff + 1)
+    else:
+        raise ValueError(f"Unknown autocorrelation method: {method}")
+
+    # Remove the first coefficient to avoid redundancy
+    autocorr_features = autocorr_features[1:, :]
 
+    autocorr_features = fix_edge_frames_autocorr(autocorr_features)
+                                     
+    return autocorr_features
+
+
+def autocorr_direct(windowed_frames, num_lags):
+    """Reference path: one np.correlate per frame, O(frame_length^2) each."""
+    frame_length = windowed_frames.shape[1]
     autocorr_list = []
-    for frame in windowed_frames.T:
+    for frame in windowed_frames:
         full_corr = np.correlate(frame, frame, mode='full')
         mid = frame_length - 1  # Zero-lag index.
-        # Extract `num_autocorr_coeff + 1` to include the first column initially
-        wanted = full_corr[mid: mid + num_autocorr_coeff + 1]
+        # Extract `num_lags` coefficients, including the zero lag
+        wanted = full_corr[mid: mid + num_lags]
         # Normalize by the zero-lag (energy) if nonzero.
         if wanted[0] != 0:
             wanted = wanted / wanted[0]
         autocorr_list.append(wanted)
 
-    # Convert list to array and transpose so that shape is (num_autocorr_coeff + 1, num_valid_frames)
-    autocorr_features = np.array(autocorr_list).T
-    # Remove the first coefficient to avoid redundancy
-    autocorr_features = autocorr_features[1:, :]
+    # Convert list to array and transpose so that shape is (num_lags, num_frames)
+    return np.array(autocorr_list).T
 
-    autocorr_features = fix_edge_frames_autocorr(autocorr_features)
-                                     
+
+def autocorr_fft(windowed_frames, num_lags, block_frames=2048, n_fft=None, n_ifft=None):
+    """
+    Batched autocorrelation via Wiener-Khinchin: irfft(|rfft(frame)|^2).
+
+    `windowed_frames` is (num_frames, frame_length). The FFT is zero-padded to at
+    least 2 * frame_length - 1 so the circular correlation equals the linear one,
+    and frames are processed in blocks to bound the size of the complex spectrum
+    on long clips. Matches `autocorr_direct` to within 1e-12 absolute on the
+    normalised coefficients (float64 round-off only). An `n_ifft` larger than
+    `n_fft` returns the autocorrelation sinc-interpolated onto a finer lag grid.
+    """
+    num_frames, frame_length = windowed_frames.shape
+    if n_fft is None:
+        n_fft = scipy.fft.next_fast_len(2 * frame_length - 1, real=True)
+    if n_ifft is None:
+        n_ifft = n_fft
+    autocorr_features = np.empty((num_lags, num_frames), dtype=np.float64)
+
+    for start in range(0, num_frames, block_frames):
+        block = windowed_frames[start:start + block_frames]
+        spectrum = scipy.fft.rfft(block, n=n_fft, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        autocorr_features[:, start:start + block.shape[0]] = scipy.fft.irfft(power, n=n_ifft, axis=1)[:, :num_lags].T
+
+    # Normalize by the zero-lag (energy) where nonzero, as the direct path does.
+    energy = autocorr_features[0:1, :]
+    np.divide(autocorr_features, energy, out=autocorr_features, where=energy != 0)
     return autocorr_features
 
 
@@ -140,14 +268,14 @@ def fix_edge_frames_autocorr(autocorr_features, zero_threshold=1e-7):
     return autocorr_features
 
 def extract_autocorrelation_features(
-    y, sr, frame_length, hop_length, include_deltas=False
+    y, sr, frame_length, hop_length, include_deltas=False, method="fft", lag_sr=None
 ):
     """
     Extract autocorrelation features, optionally with deltas/delta-deltas,
     then align with the MFCC frame count, reduce, and handle first/last frames.
     """
     autocorr_features = extract_overlapping_autocorr(
-        y, sr, frame_length, hop_length
+        y, sr, frame_length, hop_length, method=method, lag_sr=lag_sr
     )
     
     if include_deltas:
@@ -165,10 +293,11 @@ def compute_autocorr_with_deltas(autocorr_base):
     return combined_autocorr
 
 def load_and_preprocess_audio(audio_path, sr=88200):
+    target_sr = sr  # None keeps the file's native rate
     y, sr = load_audio(audio_path, sr)
-    if sr != 88200:
-        y = librosa.resample(y, orig_sr=sr, target_sr=88200)
-        sr = 88200
+    if target_sr is not None and sr != target_sr:
+        y = librosa.resample(y, orig_sr=sr, target_sr=target_sr)
+        sr = target_sr
     
     max_val = np.max(np.abs(y))
     if max_val > 0:
@@ -205,9 +334,10 @@ def load_audio_file_from_memory(audio_bytes, sr=88200):
 
 
 
-def load_pcm_audio_from_bytes(audio_bytes, sr=22050, channels=1, sample_width=2):
+def load_pcm_audio_from_bytes(audio_bytes, sr=22050, channels=1, sample_width=2, target_sr=88200):
     """
-    Load raw PCM bytes into a normalized numpy array and upsample to 88200 Hz.
+    Load raw PCM bytes into a normalized numpy array and resample to `target_sr`
+    (88200 Hz by default, None keeps `sr`) with the cached polyphase resampler.
     Assumes little-endian, 16-bit PCM data.
     """
     # Determine the appropriate numpy dtype.
@@ -227,19 +357,8 @@ def load_pcm_audio_from_bytes(audio_bytes, sr=22050, channels=1, sample_width=2)
     # Normalize the data to range [-1, 1]
     y = data.astype(np.float32) / max_val
     
-    # Upsample the audio from the current sample rate to 88200 Hz.
-    target_sr = 88200
-    if sr != target_sr:
-        # Calculate the number of samples in the resampled signal.
-        num_samples = int(len(y) * target_sr / sr)
-        if channels > 1:
-            # Resample each channel separately.
-            y_resampled = np.zeros((num_samples, channels), dtype=np.float32)
-            for ch in range(channels):
-                y_resampled[:, ch] = scipy.signal.resample(y[:, ch], num_samples)
-        else:
-            y_resampled = scipy.signal.resample(y, num_samples)
-        y = y_resampled
-        sr = target_sr
+    # Resample all channels at once along the time axis.
+    if target_sr is not None and sr != target_sr:
+        y = resample_polyphase(y, sr, target_sr, axis=0)
 
     return y
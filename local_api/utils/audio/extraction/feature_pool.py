@@ -0,0 +1,130 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# feature_pool.py
+#
+# Feature extraction in a pool of worker processes, so the NumPy/librosa work no longer
+# holds the server's GIL while the model runs. Audio bytes go to the worker and features
+# come back through shared memory blocks; only block names and shapes are pickled.
+
+import io
+import os
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .extract_features import extract_audio_features
+
+# Output blocks a worker still holds open (Windows only). There a block only lives while a
+# handle is open, so the worker keeps its handle until the server has surely copied it.
+_OUTPUT_BLOCKS = {}
+_OUTPUT_BLOCK_TTL = 60.0
+
+_WORKER_OPTIONS = {}
+
+
+def _warm_up_wav(seconds=0.5, sr=22050):
+    samples = (np.random.default_rng(0).standard_normal(int(seconds * sr)) * 1000).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sr)
+        wav_file.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _init_worker(options):
+    """Import librosa and run one small extraction so the first real request doesn't pay for it."""
+    _WORKER_OPTIONS.update(options)
+    extract_audio_features(_warm_up_wav(), from_bytes=True, **_WORKER_OPTIONS)
+
+
+def _release_expired_blocks():
+    now = time.monotonic()
+    for name, (block, created) in list(_OUTPUT_BLOCKS.items()):
+        if now - created > _OUTPUT_BLOCK_TTL:
+            block.close()
+            del _OUTPUT_BLOCKS[name]
+
+
+def _extract_worker(input_name, input_size):
+    _release_expired_blocks()
+
+    input_block = shared_memory.SharedMemory(name=input_name)
+    try:
+        audio_bytes = bytes(input_block.buf[:input_size])
+    finally:
+        input_block.close()
+
+    audio_features, y = extract_audio_features(audio_bytes, from_bytes=True, **_WORKER_OPTIONS)
+    if audio_features is None or y is None:
+        return None
+
+    audio_features = np.ascontiguousarray(audio_features)
+    output_block = shared_memory.SharedMemory(create=True, size=max(audio_features.nbytes, 1))
+    np.ndarray(audio_features.shape, dtype=audio_features.dtype, buffer=output_block.buf)[...] = audio_features
+    if os.name == 'nt':
+        _OUTPUT_BLOCKS[output_block.name] = (output_block, time.monotonic())
+    else:
+        output_block.close()  # the block persists until the server unlinks it
+    return output_block.name, audio_features.shape, audio_features.dtype.str
+
+
+def _worker_pid(_):
+    _release_expired_blocks()
+    return os.getpid()
+
+
+def default_feature_workers():
+    """One worker per core, leaving a core for the inference stage."""
+    return max((os.cpu_count() or 1) - 1, 0)
+
+
+class FeaturePool:
+    def __init__(self, config, max_workers=None):
+        options = {
+            'autocorr_method': config.get('autocorr_method', 'fft'),
+            'feature_mode': config.get('feature_mode', 'upsample'),
+        }
+        self.max_workers = max_workers or default_feature_workers() or 1
+        # Workers must share this process's tracker, otherwise each one reports the blocks
+        # the server unlinks as leaked.
+        resource_tracker.ensure_running()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(options,)
+        )
+
+    def warm_up(self):
+        """Start every worker now (running its initializer) instead of on the first requests."""
+        return set(self._executor.map(_worker_pid, range(self.max_workers)))
+
+    def extract(self, audio_bytes):
+        """Extract features for one clip in a worker process. Returns None if the audio is unusable."""
+        input_block = shared_memory.SharedMemory(create=True, size=max(len(audio_bytes), 1))
+        try:
+            input_block.buf[:len(audio_bytes)] = audio_bytes
+            result = self._executor.submit(_extract_worker, input_block.name, len(audio_bytes)).result()
+        finally:
+            input_block.close()
+            input_block.unlink()
+
+        if result is None:
+            return None
+
+        output_name, shape, dtype = result
+        output_block = shared_memory.SharedMemory(name=output_name)
+        try:
+            return np.ndarray(shape, dtype=np.dtype(dtype), buffer=output_block.buf).copy()
+        finally:
+            output_block.close()
+            if os.name != 'nt':
+                output_block.unlink()
+
+    def shutdown(self):
+        self._executor.shutdown()
+
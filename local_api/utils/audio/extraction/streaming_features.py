@@ -0,0 +1,345 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# streaming_features.py
+import math
+
+import numpy as np
+import scipy.fft
+import scipy.signal
+
+from .extract_features import _polyphase_filter, autocorr_direct, autocorr_fft, get_mel_filterbank
+
+
+class StreamingResampler:
+    """
+    Chunked counterpart of `resample_polyphase`.
+
+    Concatenating the outputs of every `push()` and the final `flush()` gives the
+    same samples as resampling the whole signal at once (same FIR, same zero
+    padding and delay compensation as scipy.signal.resample_poly).
+    """
+
+    def __init__(self, orig_sr, target_sr):
+        g = math.gcd(int(orig_sr), int(target_sr))
+        self.up, self.down = int(target_sr) // g, int(orig_sr) // g
+        self.passthrough = self.up == self.down
+
+        taps = _polyphase_filter(self.up, self.down)
+        half_len = (len(taps) - 1) // 2
+        n_pre_pad = self.down - half_len % self.down
+        self._filter = np.concatenate((np.zeros(n_pre_pad), taps * self.up))
+        self._pre_remove = (half_len + n_pre_pad) // self.down
+        self.reset()
+
+    def reset(self):
+        self._samples = np.zeros(0)
+        self._buffer_offset = 0  # Absolute input index of self._samples[0]
+        self._total_samples = 0
+        self._next_output = self._pre_remove  # Next index into the un-trimmed upfirdn output
+
+    def push(self, samples):
+        """Append input samples and return every output sample that no longer depends on future input."""
+        samples = np.asarray(samples, dtype=np.float64).reshape(-1)
+        if self.passthrough:
+            return samples
+        self._samples = np.concatenate((self._samples, samples))
+        self._total_samples += len(samples)
+        # Output j only uses inputs i <= j * down / up.
+        return self._resample_until(-(-self._total_samples * self.up // self.down))
+
+    def flush(self):
+        """Return the tail, which uses the zero padding after the last input sample."""
+        if self.passthrough:
+            return np.zeros(0)
+        num_out = -(-self._total_samples * self.up // self.down)
+        return self._resample_until(self._pre_remove + num_out)
+
+    def _first_input(self, j):
+        return max(0, -(-(j * self.down - len(self._filter) + 1) // self.up))
+
+    def _resample_until(self, end):
+        start = self._next_output
+        if end <= start:
+            return np.zeros(0)
+
+        # Start the slice on a multiple of `down` so upfirdn's output grid lines up with ours.
+        first = self._first_input(start) // self.down * self.down
+        last = min(self._total_samples, (end - 1) * self.down // self.up + 1)
+        block = self._samples[first - self._buffer_offset:last - self._buffer_offset]
+        offset = first * self.up // self.down
+        out = scipy.signal.upfirdn(self._filter, block, self.up, self.down)[start - offset:end - offset]
+
+        self._next_output = end
+        keep_from = self._first_input(end) // self.down * self.down
+        if keep_from > self._buffer_offset:
+            self._samples = self._samples[keep_from - self._buffer_offset:]
+            self._buffer_offset = keep_from
+        return out
+
+
+class StreamingFeatureExtractor:
+    """
+    Incremental counterpart of `extract_and_combine_features` for chunked PCM input.
+
+    Feed audio with `push()` as it arrives and call `flush()` once the utterance
+    ends. Both return the newly computable feature rows in the same 256-dim layout
+    as the batch path (23 MFCC + 23 delta + 23 delta-delta, then 187 autocorrelation
+    coefficients, with consecutive frames averaged in pairs).
+
+    Frame boundaries, padding, deltas and the autocorrelation match the batch path.
+    Two statistics can only be estimated causally and therefore differ slightly
+    from a whole-clip run: CMVN uses the running mean/std up to the current frame,
+    and the 80 dB log-mel floor tracks the running peak. Input is not peak
+    normalised; both feature groups are (near) scale invariant after CMVN and
+    zero-lag normalisation.
+    """
+
+    def __init__(self, sr=88200, num_mfcc=23, num_autocorr_coeff=187, delta_width=9,
+                 autocorr_method="fft", n_mels=128, top_db=80.0, amin=1e-10):
+        self.sr = sr
+        self.frame_length = int(0.01667 * sr)
+        self.hop_length = self.frame_length // 2
+        self.pad = self.frame_length // 2
+        self.num_mfcc = num_mfcc
+        self.num_autocorr_coeff = num_autocorr_coeff
+        self.delta_width = delta_width
+        self.autocorr_method = autocorr_method
+        self.top_db = top_db
+        self.amin = amin
+
+        # Same analysis setup as librosa.feature.mfcc / extract_overlapping_autocorr.
+        self._mfcc_window = scipy.signal.get_window("hann", self.frame_length, fftbins=True)
+        self._autocorr_window = np.hanning(self.frame_length)
+        self._mel_basis = get_mel_filterbank(sr, self.frame_length, n_mels=n_mels)
+        self._delta_coeffs = [
+            scipy.signal.savgol_coeffs(delta_width, order, deriv=order, use="dot") for order in (1, 2)
+        ]
+
+        self.reset()
+
+    @property
+    def num_features(self):
+        return 3 * self.num_mfcc + self.num_autocorr_coeff
+
+    def reset(self):
+        """Forget all buffered audio and statistics to start a new utterance."""
+        self._samples = np.zeros(0, dtype=np.float64)
+        self._buffer_offset = 0  # Absolute sample index of self._samples[0]
+        self._total_samples = 0
+        self._byte_remainder = b""
+        self._next_frame = 0  # First frame not yet analysed
+        self._delta_next = 0  # First frame whose deltas are not yet known
+        self._finished = False
+
+        self._db_peak = -np.inf
+        self._cmvn_count = 0
+        self._cmvn_sum = np.zeros(self.num_mfcc)
+        self._cmvn_sum_sq = np.zeros(self.num_mfcc)
+
+        self._norm_mfcc = np.zeros((0, self.num_mfcc))  # Normalised MFCC rows for delta context
+        self._norm_offset = 0  # Frame index of self._norm_mfcc[0]
+        self._pending_autocorr = np.zeros((0, self.num_autocorr_coeff))  # Rows from frame self._delta_next on
+        self._last_autocorr = None  # Last emitted autocorrelation row, for the final edge fix
+        self._unpaired_row = None  # Frame waiting for its partner before reduction
+
+    def push(self, chunk):
+        """
+        Append a chunk of audio and return the feature rows that became computable.
+
+        `chunk` is either a float array at `self.sr` in [-1, 1] or raw little-endian
+        16-bit PCM bytes (a trailing odd byte is kept for the next chunk).
+        """
+        if self._finished:
+            raise RuntimeError("StreamingFeatureExtractor.push() called after flush(); call reset() first")
+        samples = self._to_float(chunk)
+        if len(samples):
+            self._samples = np.concatenate((self._samples, samples))
+            self._total_samples += len(samples)
+        return self._process(final=False)
+
+    def flush(self):
+        """
+        Mark the end of the utterance and return the remaining rows.
+
+        Returns an empty array if the whole utterance was shorter than the
+        delta window (the batch path rejects such clips as too short).
+        """
+        if self._finished:
+            return self._empty()
+        self._finished = True
+        return self._process(final=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _empty(self):
+        return np.zeros((0, self.num_features))
+
+    def _to_float(self, chunk):
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            data = self._byte_remainder + bytes(chunk)
+            usable = len(data) - len(data) % 2
+            self._byte_remainder = data[usable:]
+            return np.frombuffer(data[:usable], dtype="<i2").astype(np.float64) / 32768.0
+        return np.asarray(chunk, dtype=np.float64).reshape(-1)
+
+    def _process(self, final):
+        n = self._total_samples
+        if final:
+            end_frame = 1 + (n + 2 * self.pad - self.frame_length) // self.hop_length if n > 0 else 0
+        elif n + self.pad >= self.frame_length:
+            # Frames that lie fully inside the audio received so far (no tail padding needed).
+            end_frame = (n + self.pad - self.frame_length) // self.hop_length + 1
+        else:
+            end_frame = 0
+
+        if end_frame > self._next_frame:
+            self._analyse_frames(self._next_frame, end_frame, final)
+            self._next_frame = end_frame
+
+        if self._next_frame < self.delta_width:
+            return self._empty()
+
+        rows = self._emit_rows(final)
+        self._trim_buffers()
+        return rows
+
+    def _frame_matrix(self, start_frame, end_frame, final, mode):
+        """Gather frames as (num_frames, frame_length), padding like the batch path."""
+        starts = np.arange(start_frame, end_frame) * self.hop_length - self.pad
+        idx = starts[:, np.newaxis] + np.arange(self.frame_length)[np.newaxis, :]
+        n = self._total_samples
+
+        if mode == "reflect":
+            idx = np.where(idx < 0, -idx, idx)
+            if final:
+                idx = np.where(idx >= n, 2 * (n - 1) - idx, idx)
+            return self._samples[idx - self._buffer_offset]
+
+        valid = (idx >= 0) & (idx < n)
+        frames = np.zeros(idx.shape)
+        frames[valid] = self._samples[idx[valid] - self._buffer_offset]
+        return frames
+
+    def _analyse_frames(self, start_frame, end_frame, final):
+        # MFCC: |STFT|^2 -> mel -> dB -> DCT, as librosa.feature.mfcc with center=True.
+        frames = self._frame_matrix(start_frame, end_frame, final, mode="constant")
+        spectrum = scipy.fft.rfft(frames * self._mfcc_window, axis=1)
+        mel = (spectrum.real ** 2 + spectrum.imag ** 2) @ self._mel_basis.T
+        log_mel = 10.0 * np.log10(np.maximum(self.amin, mel))
+        # Causal peak so the result does not depend on how the audio was chunked.
+        peaks = np.maximum.accumulate(np.maximum(log_mel.max(axis=1), self._db_peak))
+        self._db_peak = peaks[-1]
+        log_mel = np.maximum(log_mel, peaks[:, np.newaxis] - self.top_db)
+        mfcc = scipy.fft.dct(log_mel, type=2, norm="ortho", axis=1)[:, :self.num_mfcc]
+
+        # Running CMVN: each frame is normalised with the statistics up to and including itself.
+        counts = self._cmvn_count + np.arange(1, len(mfcc) + 1)[:, np.newaxis]
+        sums = self._cmvn_sum + np.cumsum(mfcc, axis=0)
+        sums_sq = self._cmvn_sum_sq + np.cumsum(mfcc ** 2, axis=0)
+        mean = sums / counts
+        std = np.sqrt(np.maximum(sums_sq / counts - mean ** 2, 0.0))
+        norm_mfcc = (mfcc - mean) / (std + 1e-10)
+        self._cmvn_count = int(counts[-1, 0])
+        self._cmvn_sum = sums[-1]
+        self._cmvn_sum_sq = sums_sq[-1]
+        self._norm_mfcc = np.vstack((self._norm_mfcc, norm_mfcc))
+
+        # Autocorrelation: mean-removed, Hann-windowed, zero-lag normalised, lag 0 dropped.
+        frames = self._frame_matrix(start_frame, end_frame, final, mode="reflect")
+        frames = frames - np.mean(frames, axis=1, keepdims=True)
+        windowed_frames = frames * self._autocorr_window[np.newaxis, :]
+        if self.autocorr_method == "fft":
+            autocorr = autocorr_fft(windowed_frames, self.num_autocorr_coeff + 1)
+        else:
+            autocorr = autocorr_direct(windowed_frames, self.num_autocorr_coeff + 1)
+        self._pending_autocorr = np.vstack((self._pending_autocorr, autocorr[1:, :].T))
+
+    def _compute_deltas(self, final):
+        """Return (delta, delta2) rows for frames [self._delta_next, new_delta_next)."""
+        half = self.delta_width // 2
+        stop = self._next_frame if final else self._next_frame - half
+        pieces = [[], []]
+
+        def history(first, last):
+            return self._norm_mfcc[first - self._norm_offset:last - self._norm_offset]
+
+        start = self._delta_next
+        if start < half:
+            # Leading edge: polynomial fit over the first window, as savgol_filter(mode='interp').
+            head = history(0, self.delta_width)
+            for order, piece in zip((1, 2), pieces):
+                piece.append(scipy.signal.savgol_filter(
+                    head, self.delta_width, polyorder=order, deriv=order, mode="interp", axis=0)[:half])
+            start = half
+
+        interior_stop = min(stop, self._next_frame - half)
+        if interior_stop > start:
+            context = history(start - half, interior_stop + half)
+            windows = np.lib.stride_tricks.sliding_window_view(context, self.delta_width, axis=0)
+            for coeffs, piece in zip(self._delta_coeffs, pieces):
+                piece.append(windows @ coeffs)
+            start = interior_stop
+
+        if final and stop > start:
+            # Trailing edge: polynomial fit over the last window.
+            tail = history(self._next_frame - self.delta_width, self._next_frame)
+            for order, piece in zip((1, 2), pieces):
+                piece.append(scipy.signal.savgol_filter(
+                    tail, self.delta_width, polyorder=order, deriv=order, mode="interp", axis=0)[-(stop - start):])
+
+        deltas = [np.vstack(piece) if piece else np.zeros((0, self.num_mfcc)) for piece in pieces]
+        return deltas[0], deltas[1], stop
+
+    def _emit_rows(self, final):
+        delta, delta2, stop = self._compute_deltas(final)
+        count = stop - self._delta_next
+        if count <= 0:
+            return self._empty()
+
+        start = self._delta_next
+        mfcc = self._norm_mfcc[start - self._norm_offset:stop - self._norm_offset]
+        autocorr = self._pending_autocorr[:count].copy()
+        self._pending_autocorr = self._pending_autocorr[count:]
+
+        # Mirror fix_edge_frames_autocorr on the first and last frames of the utterance.
+        if start == 0 and np.all(np.abs(autocorr[0]) < 1e-7):
+            autocorr[0] = autocorr[1]
+        if final:
+            previous = autocorr[-2] if count > 1 else self._last_autocorr
+            if previous is not None and np.all(np.abs(autocorr[-1]) < 1e-7):
+                autocorr[-1] = previous
+        self._last_autocorr = autocorr[-1]
+        self._delta_next = stop
+
+        rows = np.hstack((mfcc, delta, delta2, autocorr))
+        return self._reduce_rows(rows, final)
+
+    def _reduce_rows(self, rows, final):
+        """Average consecutive frames in pairs, like reduce_features on the full clip."""
+        if self._unpaired_row is not None:
+            rows = np.vstack((self._unpaired_row, rows))
+            self._unpaired_row = None
+
+        num_pairs = len(rows) // 2
+        reduced = rows[:num_pairs * 2].reshape(num_pairs, 2, rows.shape[1]).mean(axis=1)
+        if len(rows) % 2 == 1:
+            if final:
+                reduced = np.vstack((reduced, rows[-1:]))
+            else:
+                self._unpaired_row = rows[-1:]
+        return reduced
+
+    def _trim_buffers(self):
+        keep_from = max(0, self._next_frame * self.hop_length - self.pad)
+        if keep_from > self._buffer_offset:
+            self._samples = self._samples[keep_from - self._buffer_offset:]
+            self._buffer_offset = keep_from
+
+        half = self.delta_width // 2
+        keep_frame = min(max(0, self._delta_next - half), self._next_frame - self.delta_width)
+        if keep_frame > self._norm_offset:
+            self._norm_mfcc = self._norm_mfcc[keep_frame - self._norm_offset:]
+            self._norm_offset = keep_frame
@@ -4,44 +4,58 @@
 
 # audio_processing.py
 
+import functools
+
 import numpy as np
 import torch
 from torch.cuda.amp import autocast
 
-def decode_audio_chunk(audio_chunk, model, device, config):
+def decode_audio_chunks(audio_chunks, model, device, config):
+    """
+    Decode a stack of windows shaped (num_windows, frame_size, num_features).
+
+    Windows are sent through the model `inference_batch_size` at a time, so a clip
+    costs one host->device copy and one device->host sync per batch instead of per window.
+    """
     # Use precision based on config
     use_half_precision = config.get("use_half_precision", True)
+    batch_size = config.get("inference_batch_size", 16)
     
     # Force float16 if half precision is desired; else float32
     dtype = torch.float16 if use_half_precision else torch.float32
 
-    # Convert audio chunk directly to the desired precision
-    src_tensor = torch.tensor(audio_chunk, dtype=dtype).unsqueeze(0).to(device)
-
+    decoded_batches = []
     with torch.no_grad():
-        if use_half_precision:
+        for start in range(0, len(audio_chunks), batch_size):
+            # Convert the batch directly to the desired precision
+            src_tensor = torch.as_tensor(audio_chunks[start:start + batch_size], dtype=dtype).to(device)
+
+            if use_half_precision:
+
+                with autocast(dtype=torch.float16):
+                    output_sequence = model(src_tensor)
+            else:
+                output_sequence = model(src_tensor)
 
-            with autocast(dtype=torch.float16):
-                encoder_outputs = model.encoder(src_tensor)
-                output_sequence = model.decoder(encoder_outputs)
-        else:
-            encoder_outputs = model.encoder(src_tensor)
-            output_sequence = model.decoder(encoder_outputs)
+            # Convert output tensor back to numpy array
+            decoded_batches.append(output_sequence.cpu().numpy())
+    return np.concatenate(decoded_batches, axis=0)
 
-        # Convert output tensor back to numpy array
-        decoded_outputs = output_sequence.squeeze(0).cpu().numpy()
-    return decoded_outputs
 
+def get_window_starts(num_frames, frame_length, overlap):
+    """Start frame of every window, stepping by frame_length - overlap."""
+    return np.arange(0, num_frames, frame_length - overlap)
 
-def concatenate_outputs(all_decoded_outputs, num_frames):
-    final_decoded_outputs = np.concatenate(all_decoded_outputs, axis=0)
-    final_decoded_outputs = final_decoded_outputs[:num_frames]
-    return final_decoded_outputs
 
-def ensure_2d(final_decoded_outputs):
-    if final_decoded_outputs.ndim == 3:
-        final_decoded_outputs = final_decoded_outputs.reshape(-1, final_decoded_outputs.shape[-1])
-    return final_decoded_outputs
+def stack_audio_windows(audio_features, window_starts, frame_length):
+    """Gather all (padded) windows of a clip into one (num_windows, frame_length, num_features) array."""
+    num_features = audio_features.shape[1]
+    windows = np.empty((len(window_starts), frame_length, num_features), dtype=audio_features.dtype)
+    for i, start_idx in enumerate(window_starts):
+        audio_chunk = audio_features[start_idx:start_idx + frame_length]
+        windows[i] = pad_audio_chunk(audio_chunk, frame_length, num_features)
+    return windows
+
 
 def pad_audio_chunk(audio_chunk, frame_length, num_features):
     if audio_chunk.shape[0] < frame_length:
@@ -55,83 +69,188 @@ def pad_audio_chunk(audio_chunk, frame_length, num_features):
     return audio_chunk
 
 
-def blend_chunks(chunk1, chunk2, overlap):
-    actual_overlap = min(overlap, len(chunk1), len(chunk2))
-    if actual_overlap == 0:
-        return np.vstack((chunk1, chunk2))
-    
-    blended_chunk = np.copy(chunk1)
-    for i in range(actual_overlap):
-        alpha = i / actual_overlap 
-        blended_chunk[-actual_overlap + i] = (1 - alpha) * chunk1[-actual_overlap + i] + alpha * chunk2[i]
-        
-    return np.vstack((blended_chunk, chunk2[actual_overlap:]))
-
-def process_audio_features(audio_features, model, device, config):
+@functools.lru_cache(maxsize=None)
+def linear_ramp(length):
+    """Cross-fade weights (fade_in, fade_out) as (length, 1) columns, alpha = i / length."""
+    fade_in = (np.arange(length) / length)[:, None]
+    fade_out = 1 - fade_in
+    fade_in.setflags(write=False)
+    fade_out.setflags(write=False)
+    return fade_in, fade_out
+
+
+COLUMNS_TO_ZERO = [0, 1, 2, 3, 4, 7, 8, 9, 10, 11, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60]
+
+
+@functools.lru_cache(maxsize=None)
+def output_column_scale(output_dim):
+    """Per-column factor folding the /100 normalisation and the zeroed columns into one multiply."""
+    scale = np.ones(output_dim)
+    scale[:61] /= 100
+    scale[[c for c in COLUMNS_TO_ZERO if c < output_dim]] = 0
+    scale.setflags(write=False)
+    return scale
+
+
+def assemble_decoded_windows(decoded_windows, window_starts, num_frames, overlap):
+    """
+    Overlap-add decoded windows into one preallocated (num_frames, output_dim) array.
+
+    Produces the same sequence as chaining blend_chunks over the windows: each window
+    is linearly cross-faded into the previous one over the first `overlap` rows
+    (fewer for a short final window), then the rest of the window is copied. The
+    column normalisation and zeroing are applied while each window is written, and
+    the start easing afterwards, so the clip is never copied again.
+    """
+    frame_length, output_dim = decoded_windows.shape[1:]
+    output = np.empty((num_frames, output_dim), dtype=decoded_windows.dtype)
+    column_scale = output_column_scale(output_dim).astype(output.dtype)
+
+    first_length = min(frame_length, num_frames)
+    np.multiply(decoded_windows[0, :first_length], column_scale, out=output[:first_length])
+
+    for window, start_idx in zip(decoded_windows[1:], window_starts[1:]):
+        length = min(frame_length, num_frames - start_idx)
+        actual_overlap = min(overlap, length)
+        fade_in, fade_out = linear_ramp(actual_overlap)
+        region = output[start_idx:start_idx + actual_overlap]
+        region *= fade_out
+        region += fade_in * (window[:actual_overlap] * column_scale)
+        np.multiply(window[actual_overlap:length], column_scale,
+                    out=output[start_idx + actual_overlap:start_idx + length])
+
+    ease_in_start(output)
+    return output
+
+
+class StreamingWindowAssembler:
+    """
+    Incremental counterpart of get_window_starts / stack_audio_windows / assemble_decoded_windows.
+
+    Feature rows go in with add_features(), which returns the windows that are now complete.
+    Decoded windows go back in, in order, with add_decoded(), which returns the output rows
+    that no later window can touch any more. Only the `overlap` rows the next window still
+    cross-fades into are held back. finish() marks the end of the features and returns the
+    remaining, padded windows. Once those are decoded, the final add_decoded() call emits
+    the tail.
+    """
+
+    def __init__(self, frame_length, overlap, fps=60, ease_duration=0.1):
+        self.frame_length = frame_length
+        self.overlap = overlap
+        self.step = frame_length - overlap
+        self.ease_frames = int(ease_duration * fps)
+
+        self._features = None
+        self._features_offset = 0  # Frame index of self._features[0]
+        self._num_frames = 0
+        self._finished = False
+        self._next_window = 0  # Start frame of the next window to hand out
+
+        self._next_decoded = 0  # Start frame of the next window expected by add_decoded
+        self._pending = None  # Output rows from self._pending_offset on, not emitted yet
+        self._pending_offset = 0
+
+    def add_features(self, rows):
+        """Append feature rows; returns (window_starts, windows) for every newly complete window."""
+        if len(rows):
+            self._features = rows if self._features is None else np.concatenate((self._features, rows))
+            self._num_frames += len(rows)
+        return self._take_windows(lambda start: start + self.frame_length <= self._num_frames)
+
+    def finish(self):
+        """
+        No more features: returns the remaining windows, reflect-padded by pad_audio_chunk
+        exactly as the batch path pads them, so the streamed tail matches process_audio_features.
+        """
+        self._finished = True
+        return self._take_windows(lambda start: start < self._num_frames)
+
+    def _take_windows(self, ready):
+        starts = []
+        while ready(self._next_window):
+            starts.append(self._next_window)
+            self._next_window += self.step
+        if not starts:
+            return np.array(starts, dtype=int), None
+
+        num_features = self._features.shape[1]
+        windows = stack_audio_windows(self._features, np.array(starts) - self._features_offset, self.frame_length)
+
+        # Windows only ever look forward, so rows before the next start are done with.
+        drop = min(self._next_window, self._num_frames) - self._features_offset
+        self._features = self._features[drop:].reshape(-1, num_features)
+        self._features_offset += drop
+        return np.array(starts), windows
+
+    def add_decoded(self, decoded_windows):
+        """
+        Cross-fade decoded windows (in window order) and return the rows that are final,
+        or None if nothing has been decoded yet.
+        """
+        for window in decoded_windows:
+            column_scale = output_column_scale(window.shape[1]).astype(window.dtype)
+            start = self._next_decoded
+            length = min(self.frame_length, self._num_frames - start) if self._finished else self.frame_length
+            scaled = window[:length] * column_scale
+            if self._pending is None:
+                self._pending = scaled
+                self._pending_offset = start
+            else:
+                actual_overlap = min(self.overlap, length)
+                fade_in, fade_out = linear_ramp(actual_overlap)
+                region = self._pending[start - self._pending_offset:start - self._pending_offset + actual_overlap]
+                region *= fade_out
+                region += fade_in * scaled[:actual_overlap]
+                self._pending = np.concatenate((self._pending, scaled[actual_overlap:]))
+            self._next_decoded += self.step
+
+        if self._pending is None:
+            return None
+
+        # Everything before the next window's start is final, unless no window is left.
+        done = self._finished and self._next_decoded >= self._next_window
+        emit_until = self._pending_offset + len(self._pending) if done else self._next_decoded
+        ready = self._pending[:emit_until - self._pending_offset]
+        self._pending = self._pending[emit_until - self._pending_offset:]
+
+        # Same easing as ease_in_start. Before finish() at least one full window exists,
+        # so the clip is known to be longer than the easing.
+        ease_total = min(self.ease_frames, self._num_frames) if self._finished else self.ease_frames
+        ease_rows = min(ease_total - self._pending_offset, len(ready))
+        if ease_rows > 0:
+            ramp = np.linspace(0, 1, ease_total)[self._pending_offset:self._pending_offset + ease_rows]
+            ready[:ease_rows] *= ramp[:, None]
+
+        self._pending_offset = emit_until
+        return ready
+
+
+def ease_in_start(data, fps=60, duration=0.1):
+    """Easing effect for smooth start: fades in the first `duration` seconds in place."""
+    ease_duration_frames = min(int(duration * fps), data.shape[0])
+    data[:ease_duration_frames] *= np.linspace(0, 1, ease_duration_frames)[:, None]
+    return data
+
+
+def process_audio_features(audio_features, model, device, config, scheduler=None):
     # Configuration settings
     frame_length = config['frame_size']  # Number of frames per chunk (e.g., 64)
     overlap = config.get('overlap', 32)  # Number of overlapping frames between chunks
-    num_features = audio_features.shape[1]
     num_frames = audio_features.shape[0]
-    all_decoded_outputs = []
 
     # Set model to evaluation mode
     model.eval()
 
-    # Process chunks with the specified overlap
-    start_idx = 0
-    while start_idx < num_frames:
-        end_idx = min(start_idx + frame_length, num_frames)
-
-        # Select and pad chunk if needed
-        audio_chunk = audio_features[start_idx:end_idx]
-        audio_chunk = pad_audio_chunk(audio_chunk, frame_length, num_features)
-
-        # 🔥 Pass config to dynamically choose precision
-        decoded_outputs = decode_audio_chunk(audio_chunk, model, device, config)
-        decoded_outputs = decoded_outputs[:end_idx - start_idx]
-
-        # Blend with the last chunk if it exists
-        if all_decoded_outputs:
-            last_chunk = all_decoded_outputs.pop()
-            blended_chunk = blend_chunks(last_chunk, decoded_outputs, overlap)
-            all_decoded_outputs.append(blended_chunk)
-        else:
-            all_decoded_outputs.append(decoded_outputs)
-
-        # Move start index forward by (frame_length - overlap)
-        start_idx += frame_length - overlap
-
-    # Process any remaining frames to ensure total frame count matches input
-    current_length = sum(len(chunk) for chunk in all_decoded_outputs)
-    if current_length < num_frames:
-        remaining_frames = num_frames - current_length
-        final_chunk_start = num_frames - remaining_frames
-        audio_chunk = audio_features[final_chunk_start:num_frames]
-        audio_chunk = pad_audio_chunk(audio_chunk, frame_length, num_features)
-        decoded_outputs = decode_audio_chunk(audio_chunk, model, device, config)
-        all_decoded_outputs.append(decoded_outputs[:remaining_frames])
-
-    # Concatenate all chunks and trim to the original frame count
-    final_decoded_outputs = np.concatenate(all_decoded_outputs, axis=0)[:num_frames]
-
-    # Normalize or apply any post-processing
-    final_decoded_outputs = ensure_2d(final_decoded_outputs)
-    final_decoded_outputs[:, :61] /= 100  # Normalize specific columns
-
-    # Easing effect for smooth start (fades in first 0.2 seconds)
-    ease_duration_frames = min(int(0.1 * 60), final_decoded_outputs.shape[0])
-    easing_factors = np.linspace(0, 1, ease_duration_frames)[:, None]
-    final_decoded_outputs[:ease_duration_frames] *= easing_factors
-
-    # Zero out unnecessary columns (optional post-processing)
-    final_decoded_outputs = zero_columns(final_decoded_outputs)
-
-    return final_decoded_outputs
-
-
-def zero_columns(data):
-    columns_to_zero = [0, 1, 2, 3, 4, 7, 8, 9, 10, 11, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60]
-    modified_data = np.copy(data) 
-    modified_data[:, columns_to_zero] = 0
-    return modified_data
+    # Stack every window (the last ones padded) and decode them in batched forward passes
+    window_starts = get_window_starts(num_frames, frame_length, overlap)
+    audio_windows = stack_audio_windows(audio_features, window_starts, frame_length)
+    if scheduler is not None:
+        # Shared with other in-flight requests and decoded in the same forward passes
+        decoded_windows = scheduler.decode(audio_windows)
+    else:
+        decoded_windows = decode_audio_chunks(audio_windows, model, device, config)
+
+    # Cross-fade the overlapping windows into a single sequence of num_frames rows, normalising
+    # the first 61 columns, zeroing unused ones and easing in the start in the same pass
+    return assemble_decoded_windows(decoded_windows, window_starts, num_frames, overlap)
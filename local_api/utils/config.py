@@ -8,5 +8,24 @@ config = {
     'output_dim': 68, # if you trained your own, this should also be 61
     'input_dim': 256,
     'frame_size': 128, 
-    'use_half_precision': False
+    'inference_batch_size': 16,  # windows per batched Seq2Seq forward pass
+    'use_inference_scheduler': True,  # batch windows from concurrent requests into shared forward passes
+    'batch_max_wait_ms': 5,  # how long the scheduler waits for more requests before running a batch
+    'batch_max_windows': 32,  # run the batch as soon as this many windows are queued
+    'result_cache_max_bytes': 64 * 1024 * 1024,  # in-memory LRU budget for generated blendshapes, 0 disables the cache
+    'result_cache_dir': None,  # e.g. 'utils/model/result_cache' to also keep float16 results on disk
+    'async_queue_size': 64,  # neurosync_async_api: requests allowed to wait for inference before new ones get 429
+    'async_workers': 4,  # neurosync_async_api: requests run through the inference stack at once
+    'async_request_timeout': 30.0,  # seconds a request may wait and run before it gets 504
+    'async_drain_timeout': 30.0,  # seconds to finish queued requests on shutdown
+    'max_request_bytes': 64 * 1024 * 1024,  # larger uploads get 413 from the async server
+    'max_header_count': 100,  # async server: more request headers than this get 431
+    'max_header_bytes': 64 * 1024,  # async server: longest header block (and any single line) before 431
+    'feature_workers': None,  # feature extraction processes: None = cores - 1, 0 = extract in the request thread
+    'use_half_precision': False,
+    'quantization': None,  # None or 'dynamic_int8' (CPU only: int8 weights for every nn.Linear)
+    'compile_model': False,  # trace the model with TorchScript, cached under compiled_model_dir keyed by checkpoint hash
+    'compiled_model_dir': 'utils/model/compiled',
+    'autocorr_method': 'fft',  # 'fft' (batched Wiener-Khinchin) or 'direct' (per-frame np.correlate)
+    'feature_mode': 'upsample'  # 'upsample' (resample to 88.2 kHz) or 'native' (features at the source rate, needs autocorr_method 'fft')
 }
@@ -6,17 +6,36 @@
 
 import numpy as np
 
-from utils.audio.extraction.extract_features import extract_audio_features
-from utils.audio.processing.audio_processing import process_audio_features
+from .audio.extraction.extract_features import extract_audio_features
+from .audio.processing.audio_processing import process_audio_features
 
-def generate_facial_data_from_bytes(audio_bytes, model, device, config):
+def generate_facial_data_from_bytes(audio_bytes, model, device, config, scheduler=None, feature_pool=None, result_cache=None):
     
-    audio_features, y = extract_audio_features(audio_bytes, from_bytes=True)
-    
-    if audio_features is None or y is None:
-        return [], np.array([])
+    if result_cache is not None:
+        cache_key = result_cache.key(audio_bytes)
+        cached_outputs = result_cache.get(cache_key)
+        if cached_outputs is not None:
+            return cached_outputs
+
+    if feature_pool is not None:
+        # Extracted in a worker process, off this process's GIL
+        audio_features = feature_pool.extract(audio_bytes)
+        if audio_features is None:
+            return [], np.array([])
+    else:
+        audio_features, y = extract_audio_features(
+            audio_bytes, from_bytes=True,
+            autocorr_method=config.get('autocorr_method', 'fft'),
+            feature_mode=config.get('feature_mode', 'upsample')
+        )
+
+        if audio_features is None or y is None:
+            return [], np.array([])
   
-    final_decoded_outputs = process_audio_features(audio_features, model, device, config)
+    final_decoded_outputs = process_audio_features(audio_features, model, device, config, scheduler)
+
+    if result_cache is not None:
+        final_decoded_outputs = result_cache.put(cache_key, final_decoded_outputs)
 
     return final_decoded_outputs
 
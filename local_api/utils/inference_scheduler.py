@@ -0,0 +1,92 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# inference_scheduler.py
+#
+# Micro-batching between concurrent requests: windows from every request that arrives
+# within `batch_max_wait_ms` (or until `batch_max_windows` windows are queued) are decoded
+# together and the results are scattered back to each request's future.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from .audio.processing.audio_processing import decode_audio_chunks
+
+
+class InferenceScheduler:
+    def __init__(self, model, device, config):
+        self.model = model
+        self.device = device
+        self.config = config
+        self.max_wait = config.get('batch_max_wait_ms', 5) / 1000.0
+        self.max_windows = config.get('batch_max_windows', config.get('inference_batch_size', 16))
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._thread.start()
+
+    def submit(self, audio_windows):
+        """Queue a (num_windows, frame_size, num_features) stack; the future resolves to the decoded windows."""
+        future = Future()
+        if len(audio_windows) == 0:
+            future.set_result(np.empty((0,) + audio_windows.shape[1:-1] + (self.config['output_dim'],), dtype=np.float32))
+        else:
+            self._queue.put((audio_windows, future))
+        return future
+
+    def decode(self, audio_windows):
+        """Blocking helper with the same contract as decode_audio_chunks."""
+        return self.submit(audio_windows).result()
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first_job):
+        jobs = [first_job]
+        num_windows = len(first_job[0])
+        deadline = time.perf_counter() + self.max_wait
+        while num_windows < self.max_windows:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if job is None:
+                # Shutdown requested: finish this batch, then stop.
+                self._queue.put(None)
+                break
+            jobs.append(job)
+            num_windows += len(job[0])
+        return jobs
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            jobs = self._collect(job)
+            jobs = [(windows, future) for windows, future in jobs if future.set_running_or_notify_cancel()]
+            if not jobs:
+                continue
+
+            try:
+                stacked = np.concatenate([windows for windows, _ in jobs], axis=0) if len(jobs) > 1 else jobs[0][0]
+                decoded = decode_audio_chunks(stacked, self.model, self.device, self.config)
+            except Exception as e:
+                for _, future in jobs:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for windows, future in jobs:
+                future.set_result(decoded[start:start + len(windows)])
+                start += len(windows)
@@ -2,6 +2,10 @@
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
+import hashlib
+import os
+import warnings
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -27,10 +31,11 @@ def load_model(model_path, config, device):
     
     encoder = Encoder(config['input_dim'], hidden_dim, n_layers, num_heads)
     decoder = Decoder(config['output_dim'], hidden_dim, n_layers, num_heads)
-    model = Seq2Seq(encoder, decoder, device).to(device)
+    model = Seq2Seq(encoder, decoder, device, max_seq_len=config.get('frame_size', 128)).to(device)
 
     state_dict = torch.load(model_path, map_location=device)
     model.load_state_dict(state_dict, strict=True)
+    del state_dict  # don't keep a second copy of the weights alive
 
     # Convert the model to half precision if applicable
     if use_half_precision and device.type == 'cuda':
@@ -40,20 +45,134 @@ def load_model(model_path, config, device):
         print("🚫 Half-precision not applied (CPU or unsupported GPU or False set in config).")
 
     model.eval()
+
+    quantization = config.get('quantization')
+    if quantization == 'dynamic_int8':
+        if device.type == 'cpu':
+            model = quantize_dynamic_int8(model)
+            print("⚡ Model linear layers quantized to dynamic int8.")
+        else:
+            print("⚠ Dynamic int8 quantization is CPU-only. Skipping it on", device)
+    elif quantization:
+        raise ValueError(f"Unknown quantization mode: {quantization!r}")
+
+    if config.get('compile_model', False):
+        model = load_compiled_model(model, model_path, config, device)
+
     return model
 
 
+def quantize_dynamic_int8(model):
+    """
+    Dynamically quantize every nn.Linear (embedding, attention projections, FFN and output head)
+    to int8 weights. Activations stay float and are quantized on the fly per batch.
+    """
+    # In place, so the float weights are released instead of living next to a quantized copy.
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+# -------------------------------------------------------------------------------------------
+# Compiled (TorchScript) inference artifact
+# -------------------------------------------------------------------------------------------
+def checkpoint_hash(model_path, chunk_size=1 << 20):
+    sha256 = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def compiled_model_path(model_path, config, device):
+    """
+    Location of the traced artifact for this checkpoint. The file name is keyed by the checkpoint hash
+    plus everything baked into the trace (architecture, window shape, precision, device and torch version).
+    """
+    device = torch.device(device)
+    key = '|'.join(str(part) for part in (
+        checkpoint_hash(model_path), torch.__version__, device.type,
+        config.get('use_half_precision', True), config.get('quantization'), config['hidden_dim'], config['n_layers'],
+        config['num_heads'], config['input_dim'], config['output_dim'], config['frame_size'],
+    ))
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    compiled_dir = config.get('compiled_model_dir') or os.path.join(os.path.dirname(model_path), 'compiled')
+    return os.path.join(compiled_dir, f"seq2seq_{digest}.pt")
+
+
+def load_compiled_model(model, model_path, config, device):
+    """
+    Return a TorchScript version of `model`, loading it from disk when a trace for this checkpoint exists
+    and tracing + saving it otherwise. Falls back to the eager model if tracing fails.
+    """
+    path = compiled_model_path(model_path, config, device)
+    if os.path.exists(path):
+        print(f"⚡ Loading compiled model from {path}")
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            return torch.jit.load(path, map_location=device)
+
+    dtype = torch.float16 if config.get('use_half_precision', True) else torch.float32
+    example = torch.zeros(config.get('inference_batch_size', 16), config['frame_size'], config['input_dim'],
+                          dtype=dtype, device=device)
+    try:
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter('ignore', torch.jit.TracerWarning)
+            warnings.simplefilter('ignore', FutureWarning)
+            # One eager pass first so the RoPE tables are cached and get baked into the
+            # trace as constants.
+            model(example)
+            traced = torch.jit.freeze(torch.jit.trace(model, example))
+    except Exception as e:
+        print(f"⚠ Could not trace the model, using the eager model instead: {e}")
+        return model
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        torch.jit.save(traced, tmp_path)
+    os.replace(tmp_path, path)
+    print(f"⚡ Compiled model saved to {path}")
+    return traced
+
+
+def warm_up_model(model, config, device, runs=2):
+    """
+    Run dummy windows through the model so lazy initialisation (allocator, kernels, TorchScript
+    profiling/optimisation passes) happens before the first real request. Both the full
+    inference batch and a single window are exercised, since the last batch of a clip is usually short.
+    """
+    use_half_precision = config.get('use_half_precision', True)
+    dtype = torch.float16 if use_half_precision else torch.float32
+    batch_size = config.get('inference_batch_size', 16)
+
+    with torch.no_grad(), torch.autocast(device_type=torch.device(device).type, dtype=torch.float16,
+                                         enabled=use_half_precision):
+        for batch in sorted({batch_size, 1}):
+            src = torch.zeros(batch, config['frame_size'], config['input_dim'], dtype=dtype, device=device)
+            for _ in range(runs):
+                model(src)
+    if torch.device(device).type == 'cuda':
+        torch.cuda.synchronize()
+
+
 
 # -------------------------------------------------------------------------------------------
 # Seq2Seq Model
 # -------------------------------------------------------------------------------------------
 class Seq2Seq(nn.Module):
-    def __init__(self, encoder, decoder, device):
+    def __init__(self, encoder, decoder, device, max_seq_len=128):
         super(Seq2Seq, self).__init__()
         self.encoder = encoder
         self.decoder = decoder
         self.device = device
 
+        # One RoPE table cache shared by every attention block in the model.
+        # It is a plain attribute (not a buffer) so the state_dict is unchanged.
+        self.rope_cache = RotaryEmbeddingCache(max_seq_len)
+        for module in self.modules():
+            if isinstance(module, MultiHeadAttention):
+                module.rope_cache = self.rope_cache
+
     def forward(self, src):
         encoder_outputs = self.encoder(src)
         output = self.decoder(encoder_outputs)
@@ -62,29 +181,67 @@ class Seq2Seq(nn.Module):
 # -------------------------------------------------------------------------------------------
 # Rotary Positional Embedding (RoPE) for Local Attention
 # -------------------------------------------------------------------------------------------
-def apply_rope_qk(q, k, use_local_positional_encoding=True):
-    if not use_local_positional_encoding:
-        return q, k  # Return unmodified q, k if RoPE is disabled
-
-    batch_size, num_heads, seq_len, head_dim = q.size()
+def build_rope_tables(seq_len, head_dim, device=None, dtype=torch.float):
+    """
+    Build the sin/cos tables for the fused interleaved rotation, each of shape (seq_len, head_dim).
+    cos holds cos(angle) repeated for every (even, odd) pair, sin holds (-sin(angle), +sin(angle)).
+    """
     assert head_dim % 2 == 0, "head_dim must be even for RoPE"
 
-    position = torch.arange(seq_len, dtype=torch.float, device=q.device).unsqueeze(1)  # (seq_len, 1)
-    dim_indices = torch.arange(0, head_dim, 2, dtype=torch.float, device=q.device)  # (head_dim // 2)
+    position = torch.arange(seq_len, dtype=torch.float, device=device).unsqueeze(1)  # (seq_len, 1)
+    dim_indices = torch.arange(0, head_dim, 2, dtype=torch.float, device=device)  # (head_dim // 2)
     div_term = torch.exp(-torch.log(torch.tensor(10000.0)) * dim_indices / head_dim)
 
     angle = position * div_term  # (seq_len, head_dim // 2)
-    sin = torch.sin(angle).unsqueeze(0).unsqueeze(0)  # (1, 1, seq_len, head_dim // 2)
-    cos = torch.cos(angle).unsqueeze(0).unsqueeze(0)  # (1, 1, seq_len, head_dim // 2)
+    sin = torch.sin(angle)
+    cos = torch.cos(angle).repeat_interleave(2, dim=-1)
+    sin = torch.stack([-sin, sin], dim=-1).flatten(-2)
+    return sin.to(dtype), cos.to(dtype)
+
+
+class RotaryEmbeddingCache:
+    """
+    Precomputed RoPE tables, kept per (device, dtype, head_dim) and grown lazily
+    when a longer sequence than any seen so far comes through.
+    """
+    def __init__(self, max_seq_len=128):
+        self.max_seq_len = max_seq_len
+        self._tables = {}
+
+    def get(self, seq_len, head_dim, device, dtype):
+        key = (device, dtype, head_dim)
+        tables = self._tables.get(key)
+        if tables is None or tables[0].size(0) < seq_len:
+            length = max(seq_len, self.max_seq_len if tables is None else 2 * tables[0].size(0))
+            tables = build_rope_tables(length, head_dim, device, dtype)
+            self._tables[key] = tables
+        sin, cos = tables
+        return sin[:seq_len], cos[:seq_len]
+
+    def clear(self):
+        self._tables.clear()
+
+
+def rope_rotate(x, sin, cos):
+    # Swap each (even, odd) pair in one pass; the signs are folded into the sin table.
+    x_pairs = x.unflatten(-1, (-1, 2))
+    x_swapped = torch.stack((x_pairs[..., 1], x_pairs[..., 0]), dim=-1).flatten(-2)
+    return torch.addcmul(x * cos, x_swapped, sin)
+
+
+def apply_rope_qk(q, k, use_local_positional_encoding=True, rope_cache=None):
+    if not use_local_positional_encoding:
+        return q, k  # Return unmodified q, k if RoPE is disabled
+
+    batch_size, num_heads, seq_len, head_dim = q.size()
 
-    def rope_transform(x):
-        x1, x2 = x[..., ::2], x[..., 1::2]  # Split into even and odd parts
-        x_rope_even = x1 * cos - x2 * sin
-        x_rope_odd = x1 * sin + x2 * cos
-        return torch.stack([x_rope_even, x_rope_odd], dim=-1).flatten(-2)
+    if rope_cache is not None:
+        sin, cos = rope_cache.get(seq_len, head_dim, q.device, q.dtype)
+    else:
+        sin, cos = build_rope_tables(seq_len, head_dim, q.device)
 
-    q = rope_transform(q)
-    k = rope_transform(k)
+    q = rope_rotate(q, sin, cos)
+    k = rope_rotate(k, sin, cos)
     return q, k
 
 
@@ -108,6 +265,9 @@ class MultiHeadAttention(nn.Module):
         self.resid_dropout = nn.Dropout(dropout)
         self.dropout = dropout
 
+        # Shared RoPE tables, attached by Seq2Seq; None falls back to building them per call.
+        self.rope_cache = None
+
         self.flash = hasattr(torch.nn.functional, 'scaled_dot_product_attention')
         if not self.flash:
             print("WARNING: Flash Attention requires PyTorch >= 2.0")
@@ -125,7 +285,7 @@ class MultiHeadAttention(nn.Module):
         value = value.view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
 
         # Apply RoPE to Q and K (if enabled)
-        query, key = apply_rope_qk(query, key)
+        query, key = apply_rope_qk(query, key, rope_cache=self.rope_cache)
 
         if self.flash:
             attn_output = torch.nn.functional.scaled_dot_product_attention(
@@ -0,0 +1,60 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# response_format.py
+#
+# Binary blendshape payload: a 16 byte little-endian header followed by the raw frames.
+#
+#   magic   4s  b'NSBS'
+#   version H   1
+#   dtype   H   1 = float32, 2 = float16
+#   frames  I   number of rows
+#   dims    I   values per row
+#
+# The frames follow as frames * dims little-endian values in row-major order,
+# so a client can decode them with a single np.frombuffer call.
+
+import struct
+
+import numpy as np
+
+BINARY_MIMETYPE = 'application/octet-stream'
+
+HEADER = struct.Struct('<4sHHII')
+MAGIC = b'NSBS'
+VERSION = 1
+
+DTYPE_CODES = {
+    'f32': (1, np.dtype('<f4')),
+    'f16': (2, np.dtype('<f2')),
+}
+
+
+def negotiate_format(format_arg, accept_mimetypes):
+    """
+    Pick the response format for a request: 'f32', 'f16' or None for JSON.
+    An explicit ?format= wins, otherwise Accept: application/octet-stream selects float32.
+    JSON stays the default.
+    """
+    if format_arg:
+        format_arg = format_arg.lower()
+        if format_arg == 'json':
+            return None
+        if format_arg not in DTYPE_CODES:
+            raise ValueError(f"Unsupported format: {format_arg}")
+        return format_arg
+
+    if accept_mimetypes and accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE]) == BINARY_MIMETYPE:
+        return 'f32'
+    return None
+
+
+def encode_blendshapes(data, fmt='f32'):
+    """Pack a (frames, dims) array into the binary payload."""
+    code, dtype = DTYPE_CODES[fmt]
+    array = np.ascontiguousarray(data, dtype=dtype)
+    if array.size == 0:
+        array = array.reshape(0, 0)
+    frames, dims = array.shape
+    return HEADER.pack(MAGIC, VERSION, code, frames, dims) + array.tobytes()
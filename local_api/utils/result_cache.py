@@ -0,0 +1,114 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# result_cache.py
+#
+# Content-addressed cache of generated blendshapes. The key is the sha256 of the audio bytes
+# combined with the checkpoint hash and every config value that changes the output, so a new
+# model or setting never serves stale frames. Results live in an in-memory LRU bounded by a byte
+# budget and, optionally, on disk as float16 .npy files that survive restarts.
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Config values that change the generated frames
+OUTPUT_CONFIG_KEYS = (
+    'sr', 'frame_rate', 'hidden_dim', 'n_layers', 'num_heads', 'output_dim', 'input_dim', 'frame_size',
+    'overlap', 'use_half_precision', 'quantization', 'autocorr_method', 'feature_mode',
+)
+
+
+class ResultCache:
+    def __init__(self, model_hash, config, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        fingerprint = json.dumps({key: config.get(key) for key in OUTPUT_CONFIG_KEYS}, sort_keys=True)
+        self._prefix = hashlib.sha256(f"{model_hash}|{fingerprint}".encode('utf-8')).digest()
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def key(self, audio_bytes):
+        return hashlib.sha256(self._prefix + hashlib.sha256(audio_bytes).digest()).hexdigest()
+
+    def get(self, key):
+        """Cached frames for `key` (read-only float32 array), or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return result
+
+        result = self._load(key)
+        with self._lock:
+            if result is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._insert(key, result)
+        return result
+
+    def put(self, key, result):
+        result = np.array(result, dtype=np.float32)
+        result.setflags(write=False)
+        with self._lock:
+            self._insert(key, result)
+        self._store(key, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update(entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes,
+                         disk_dir=self.cache_dir)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _insert(self, key, result):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).nbytes
+        if result.nbytes > self.max_bytes:
+            return
+        self._entries[key] = result
+        self._bytes += result.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._counters['evictions'] += 1
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            result = np.load(self._path(key)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+        result.setflags(write=False)
+        return result
+
+    def _store(self, key, result):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, result.astype(np.float16))
+        os.replace(tmp_path, path)
@@ -0,0 +1,55 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# server_setup.py
+#
+# The model and the stages around it, shared by the Flask and asyncio entry points.
+
+from .audio.extraction.feature_pool import FeaturePool, default_feature_workers
+from .generate_face_shapes import generate_facial_data_from_bytes
+from .inference_scheduler import InferenceScheduler
+from .model.model import checkpoint_hash, load_model, warm_up_model
+from .result_cache import ResultCache
+
+
+class InferenceStack:
+    """Feature workers, model, micro-batching scheduler and result cache for one server process."""
+
+    def __init__(self, model_path, config, device):
+        self.config = config
+        self.device = device
+
+        # Start the feature workers first, so with "fork" they don't inherit the model or its threads
+        feature_workers = config.get('feature_workers')
+        if feature_workers is None:
+            feature_workers = default_feature_workers()
+        self.feature_pool = FeaturePool(config, feature_workers) if feature_workers > 0 else None
+        if self.feature_pool is not None:
+            self.feature_pool.warm_up()
+
+        self.model = load_model(model_path, config, device)
+        warm_up_model(self.model, config, device)
+        self.scheduler = InferenceScheduler(self.model, device, config) if config.get('use_inference_scheduler', True) else None
+
+        # Created after load_model, which may have switched precision settings in config
+        result_cache_max_bytes = config.get('result_cache_max_bytes', 0)
+        self.result_cache = ResultCache(
+            checkpoint_hash(model_path), config, result_cache_max_bytes, config.get('result_cache_dir')
+        ) if result_cache_max_bytes or config.get('result_cache_dir') else None
+
+    def generate(self, audio_bytes):
+        return generate_facial_data_from_bytes(
+            audio_bytes, self.model, self.device, self.config, self.scheduler, self.feature_pool, self.result_cache
+        )
+
+    def cache_stats(self):
+        if self.result_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.result_cache.stats()}
+
+    def shutdown(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+        if self.feature_pool is not None:
+            self.feature_pool.shutdown()
@@ -0,0 +1,127 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# stream_face_shapes.py
+#
+# Incremental audio -> blendshape decoding for the streaming endpoint. Audio arrives as
+# 16-bit PCM chunks (raw, or a WAV stream whose header is read first), is resampled to
+# 88.2 kHz and turned into features chunk by chunk, and each 128-frame window is decoded
+# as soon as its features exist.
+
+import struct
+
+import numpy as np
+
+from .audio.extraction.extract_features import REFERENCE_SR
+from .audio.extraction.streaming_features import StreamingFeatureExtractor, StreamingResampler
+from .audio.processing.audio_processing import StreamingWindowAssembler, decode_audio_chunks
+
+STREAM_READ_SIZE = 8192
+MAX_WAV_HEADER_BYTES = 1 << 16
+
+
+def read_stream_format(read, sr=22050, channels=1):
+    """
+    Work out the PCM layout of an incoming stream from its first bytes.
+
+    WAV streams (starting with 'RIFF') are parsed up to their data chunk and must be
+    16-bit PCM; anything else is treated as raw 16-bit PCM with the given sr/channels.
+    Returns (sr, channels, first_audio_bytes).
+    """
+    data = b''
+    while len(data) < 12:
+        chunk = read(STREAM_READ_SIZE)
+        if not chunk:
+            break
+        data += chunk
+    if not data.startswith(b'RIFF'):
+        return sr, channels, data
+    if data[8:12] != b'WAVE':
+        raise ValueError("RIFF stream is not a WAV file")
+
+    offset = 12
+    fmt = None
+    while True:
+        while len(data) < offset + 8:
+            chunk = read(STREAM_READ_SIZE)
+            if not chunk or len(data) > MAX_WAV_HEADER_BYTES:
+                raise ValueError("WAV stream ended before its data chunk")
+            data += chunk
+        chunk_id, chunk_size = struct.unpack_from('<4sI', data, offset)
+        offset += 8
+        if chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            return fmt[0], fmt[1], data[offset:]
+
+        # Chunks are word aligned
+        chunk_end = offset + chunk_size + (chunk_size & 1)
+        while len(data) < chunk_end:
+            chunk = read(STREAM_READ_SIZE)
+            if not chunk or len(data) > MAX_WAV_HEADER_BYTES:
+                raise ValueError("WAV stream ended inside its header")
+            data += chunk
+        if chunk_id == b'fmt ':
+            audio_format, num_channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', data, offset)
+            if audio_format not in (1, 0xFFFE) or bits != 16:
+                raise ValueError(f"Only 16-bit PCM WAV can be streamed (format {audio_format}, {bits} bits)")
+            fmt = (sample_rate, num_channels)
+        offset = chunk_end
+
+
+class FaceShapeStream:
+    """
+    One streaming request: push() PCM bytes as they arrive and get back the blendshape
+    rows that are final so far; finish() returns the rest. Rows come out exactly as
+    process_audio_features would produce them from the streamed features.
+    """
+
+    def __init__(self, model, device, config, sr, channels=1, scheduler=None):
+        self.model = model
+        self.device = device
+        self.config = config
+        self.channels = channels
+        self.scheduler = scheduler
+        self.frame_bytes = 2 * channels
+
+        self._remainder = b''
+        self._resampler = StreamingResampler(sr, REFERENCE_SR)
+        self._extractor = StreamingFeatureExtractor(
+            sr=REFERENCE_SR, autocorr_method=config.get('autocorr_method', 'fft')
+        )
+        self._assembler = StreamingWindowAssembler(config['frame_size'], config.get('overlap', 32))
+
+    def push(self, pcm_bytes):
+        data = self._remainder + bytes(pcm_bytes)
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float64) / 32768.0
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+
+        features = self._extractor.push(self._resampler.push(samples))
+        _, windows = self._assembler.add_features(features.astype(np.float32))
+        return self._decode(windows)
+
+    def finish(self):
+        features = self._extractor.push(self._resampler.flush())
+        features = np.concatenate((features, self._extractor.flush()))
+        _, windows = self._assembler.add_features(features.astype(np.float32))
+        rows = self._decode(windows)
+
+        _, windows = self._assembler.finish()
+        tail = self._decode(windows, final=True)
+        if rows is None:
+            return tail
+        return rows if tail is None else np.concatenate((rows, tail))
+
+    def _decode(self, windows, final=False):
+        if windows is None:
+            return self._assembler.add_decoded([]) if final else None
+        if self.scheduler is not None:
+            decoded = self.scheduler.decode(windows)
+        else:
+            decoded = decode_audio_chunks(windows, self.model, self.device, self.config)
+        return self._assembler.add_decoded(decoded)
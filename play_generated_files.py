@@ -8,8 +8,7 @@ warnings.filterwarnings(
     "ignore", 
     message="Couldn't find ffmpeg or avconv - defaulting to ffmpeg, but may not work"
 )
-from threading import Thread
-from livelink.animations.default_animation import default_animation_loop, stop_default_animation
+from livelink.animations.animation_scheduler import AnimationScheduler
 from livelink.connect.livelink_init import create_socket_connection, initialize_py_face
 from utils.files.file_utils import list_generated_files
 from utils.generated_runners import run_audio_animation
@@ -21,8 +20,7 @@ ENABLE_EMOTE_CALLS = False
 
 py_face = initialize_py_face()
 socket_connection = create_socket_connection()
-default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-default_animation_thread.start()
+animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
 
 def main():
     generated_files = list_generated_files()
@@ -52,7 +50,7 @@ def main():
             if ENABLE_EMOTE_CALLS:
                 EmoteConnect.send_emote("startspeaking")          
             try:
-                run_audio_animation(audio_path, generated_facial_data, py_face, socket_connection, default_animation_thread)
+                run_audio_animation(audio_path, generated_facial_data, py_face, socket_connection, animation_scheduler)
             except Exception as e:
                 print("Error running audio animation:", e)
             finally:
@@ -65,9 +63,7 @@ if __name__ == '__main__':
     try:
         main()
     finally:
-        stop_default_animation.set()
-        if default_animation_thread:
-            default_animation_thread.join()
+        animation_scheduler.stop()
         pygame.quit()
         socket_connection.close()
 
@@ -9,10 +9,9 @@ warnings.filterwarnings(
     message="Couldn't find ffmpeg or avconv - defaulting to ffmpeg, but may not work"
 )
 import keyboard
-from threading import Thread
 
 from livelink.connect.livelink_init import create_socket_connection, initialize_py_face
-from livelink.animations.default_animation import default_animation_loop, stop_default_animation
+from livelink.animations.animation_scheduler import AnimationScheduler
 from utils.tts.eleven_labs import get_speech_to_speech_audio
 from utils.audio.record_audio import record_audio_until_release
 from utils.generated_runners import run_audio_animation
@@ -34,8 +33,7 @@ if __name__ == "__main__":
     py_face = initialize_py_face()
     socket_connection = create_socket_connection()
 
-    default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-    default_animation_thread.start()
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
     try:
         while True:
             print("Press Right Ctrl to start recording (or 'q' to quit): ")
@@ -71,7 +69,7 @@ if __name__ == "__main__":
                         EmoteConnect.send_emote("startspeaking")
 
                     try:
-                        run_audio_animation(processed_audio_bytes, generated_facial_data, py_face, socket_connection, default_animation_thread)
+                        run_audio_animation(processed_audio_bytes, generated_facial_data, py_face, socket_connection, animation_scheduler)
                     finally:
                         if ENABLE_EMOTE_CALLS:
                             EmoteConnect.send_emote("stopspeaking")
@@ -82,8 +80,6 @@ if __name__ == "__main__":
             if keyboard.is_pressed('q'):
                 break
     finally:
-        stop_default_animation.set()
-        if default_animation_thread:
-            default_animation_thread.join()
+        animation_scheduler.stop()
         pygame.quit()
         socket_connection.close()
@@ -2,7 +2,6 @@
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
-from threading import Thread
 import pygame
 import warnings
 import time
@@ -17,7 +16,7 @@ from utils.neurosync.neurosync_api_connect import send_audio_to_neurosync
 from utils.tts.eleven_labs import get_elevenlabs_audio
 from utils.tts.local_tts import call_local_tts
 from livelink.connect.livelink_init import create_socket_connection, initialize_py_face
-from livelink.animations.default_animation import default_animation_loop, stop_default_animation
+from livelink.animations.animation_scheduler import AnimationScheduler
 
 from utils.emote_sender.send_emote import EmoteConnect
 
@@ -30,8 +29,7 @@ if __name__ == "__main__":
     initialize_directories()
     py_face = initialize_py_face()
     socket_connection = create_socket_connection()
-    default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-    default_animation_thread.start()
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
     try:
         while True:
             text_input = input("Enter the text to generate speech (or 'q' to quit): ").strip()
@@ -47,7 +45,7 @@ if __name__ == "__main__":
                         if ENABLE_EMOTE_CALLS:
                             EmoteConnect.send_emote("startspeaking")
                         try:
-                            run_audio_animation(audio_bytes, blendshapes, py_face, socket_connection, default_animation_thread)
+                            run_audio_animation(audio_bytes, blendshapes, py_face, socket_connection, animation_scheduler)
                         finally:
                             if ENABLE_EMOTE_CALLS:
                                 EmoteConnect.send_emote("stopspeaking")
@@ -67,7 +65,7 @@ if __name__ == "__main__":
                             if ENABLE_EMOTE_CALLS:
                                 EmoteConnect.send_emote("startspeaking")
                             try:
-                                run_audio_animation(audio_bytes, generated_facial_data, py_face, socket_connection, default_animation_thread)
+                                run_audio_animation(audio_bytes, generated_facial_data, py_face, socket_connection, animation_scheduler)
                             finally:
                                 if ENABLE_EMOTE_CALLS:
                                     EmoteConnect.send_emote("stopspeaking")
@@ -79,8 +77,6 @@ if __name__ == "__main__":
             else:
                 print("⚠️ No text provided.")           
     finally:
-        stop_default_animation.set()
-        if default_animation_thread:
-            default_animation_thread.join()
+        animation_scheduler.stop()
         pygame.quit()
         socket_connection.close()
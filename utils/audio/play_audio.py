@@ -21,6 +21,34 @@ def init_pygame_mixer():
         pygame.mixer.init()
 
 
+def get_speech_channel():
+    """
+    The mixer channel reserved for speech, so Sound.play() elsewhere never picks it.
+    """
+    init_pygame_mixer()
+    pygame.mixer.set_reserved(1)
+    return pygame.mixer.Channel(0)
+
+
+def load_sound(audio_input):
+    """
+    Load audio (bytes or a file path) as a fully decoded pygame Sound, ready to be
+    queued on a channel. Returns None if it cannot be read.
+    """
+    try:
+        init_pygame_mixer()
+        if isinstance(audio_input, (bytes, bytearray, memoryview)):
+            return pygame.mixer.Sound(file=io.BytesIO(audio_input))
+        try:
+            return pygame.mixer.Sound(audio_input)
+        except pygame.error:
+            print(f"Unsupported format for {audio_input}. Converting to WAV.")
+            return pygame.mixer.Sound(convert_to_wav(audio_input))
+    except Exception as e:
+        print(f"Error in load_sound: {e}")
+        return None
+
+
 def sync_playback_loop():
     """
     A playback loop that synchronizes elapsed time with the music position.
@@ -7,7 +7,7 @@
 import os
 from threading import Lock
 
-from utils.generated_runners import run_audio_animation
+from utils.generated_runners import run_audio_animation, GaplessSpeechPlayer
 from utils.files.file_utils import save_generated_data_from_wav
 from utils.neurosync.neurosync_api_connect import send_audio_to_neurosync
 from utils.audio.play_audio import read_audio_file_as_bytes
@@ -16,11 +16,13 @@ from utils.emote_sender.send_emote import EmoteConnect
 queue_lock = Lock()
 
 
-def audio_face_queue_worker(audio_face_queue, py_face, socket_connection, default_animation_thread, enable_emote_calls=True):
+def audio_face_queue_worker(audio_face_queue, py_face, socket_connection, animation_scheduler, enable_emote_calls=True):
     speaking = False
+    speech_player = GaplessSpeechPlayer(animation_scheduler)
     while True:
         item = audio_face_queue.get()
         if item is None:
+            speech_player.wait_until_done()
             audio_face_queue.task_done()
             break
 
@@ -29,12 +31,14 @@ def audio_face_queue_worker(audio_face_queue, py_face, socket_connection, defaul
             speaking = True
 
         audio_bytes, facial_data = item
-        run_audio_animation(audio_bytes, facial_data, py_face, socket_connection, default_animation_thread)
+        # Queued behind the utterance playing, so sentences run on without a gap
+        speech_player.append(audio_bytes, facial_data)
         audio_face_queue.task_done()
 
         if speaking and audio_face_queue.empty() and enable_emote_calls:
-            EmoteConnect.send_emote("stopspeaking")
-            speaking = False
+            if speech_player.wait_until_done(interrupt=lambda: not audio_face_queue.empty()):
+                EmoteConnect.send_emote("stopspeaking")
+                speaking = False
     
     
 def log_timing_worker(log_queue):
@@ -48,7 +52,7 @@ def log_timing_worker(log_queue):
             print(f"Logging error: {e}")
 
 
-def process_wav_file(wav_file, py_face, socket_connection, default_animation_thread):
+def process_wav_file(wav_file, py_face, socket_connection, animation_scheduler):
 
     if not os.path.exists(wav_file):
         print(f"File {wav_file} does not exist.")  
@@ -66,7 +70,7 @@ def process_wav_file(wav_file, py_face, socket_connection, default_animation_thr
         print("Failed to get blendshapes from the API.") 
         return
 
-    run_audio_animation(wav_file, blendshapes, py_face, socket_connection, default_animation_thread)
+    run_audio_animation(wav_file, blendshapes, py_face, socket_connection, animation_scheduler)
     save_generated_data_from_wav(wav_file, blendshapes)
 
     print("Processing completed successfully.")  
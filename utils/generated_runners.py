@@ -3,21 +3,20 @@
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
 
-from threading import Thread, Event, Lock
+import time
 import numpy as np
 import random
 
-from utils.audio.play_audio import play_audio_from_path, play_audio_from_memory
-from livelink.send_to_unreal import pre_encode_facial_data, send_pre_encoded_data_to_unreal
-from livelink.animations.default_animation import default_animation_loop, stop_default_animation
-from livelink.connect.livelink_init import initialize_py_face 
+from utils.audio.play_audio import play_audio_from_path, play_audio_from_memory, get_speech_channel, load_sound
+from livelink.send_to_unreal import prepare_speech_frames
 from livelink.animations.animation_emotion import determine_highest_emotion,  merge_emotion_data_into_facial_data_wrapper
 from livelink.animations.animation_loader import emotion_animations
 
-queue_lock = Lock()
-
-def run_audio_animation(audio_input, generated_facial_data, py_face, socket_connection, default_animation_thread):
-
+def prepare_animation_frames(generated_facial_data):
+    """
+    Adds an emotion overlay matching the dominant emotion in generated_facial_data, if the
+    model output carries emotion columns, and returns the (N, 61) frames for the scheduler.
+    """
     if (generated_facial_data is not None and 
         len(generated_facial_data) > 0 and 
         len(generated_facial_data[0]) > 61):
@@ -33,34 +32,104 @@ def run_audio_animation(audio_input, generated_facial_data, py_face, socket_conn
             selected_animation = random.choice(emotion_animations[dominant_emotion])
             generated_facial_data = merge_emotion_data_into_facial_data_wrapper(generated_facial_data, selected_animation)
 
-    encoding_face = initialize_py_face()
-    encoded_facial_data = pre_encode_facial_data(generated_facial_data, encoding_face)
-
-    with queue_lock:
-        stop_default_animation.set()
-        if default_animation_thread and default_animation_thread.is_alive():
-            default_animation_thread.join()
-
-    start_event = Event()
-
-    if isinstance(audio_input, bytes):
-        audio_thread = Thread(target=play_audio_from_memory, args=(audio_input, start_event))
-    else:
-        audio_thread = Thread(target=play_audio_from_path, args=(audio_input, start_event))
-
-    data_thread = Thread(target=send_pre_encoded_data_to_unreal, args=(encoded_facial_data, start_event, 60, socket_connection))
-
-    audio_thread.start()
-    data_thread.start()
+    return prepare_speech_frames(generated_facial_data)
 
-    start_event.set()
 
-    audio_thread.join()
-    data_thread.join()
-
-    with queue_lock:
-        stop_default_animation.clear()
-        default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-        default_animation_thread.start()
+def run_audio_animation(audio_input, generated_facial_data, py_face, socket_connection, animation_scheduler):
+    """
+    Plays audio_input with its facial data. The frames are queued on the long-lived
+    animation_scheduler, which crossfades them in from the idle animation (or the previous
+    sentence) and back out again; the audio starts as the first speech frame goes out.
+    py_face and socket_connection belong to the scheduler now and are not used here.
+    """
 
+    speech = animation_scheduler.speak(prepare_animation_frames(generated_facial_data))
 
+    # Playback waits on speech.started, so the audio and the first speech frame start together
+    if isinstance(audio_input, (bytes, bytearray, memoryview)):
+        play_audio_from_memory(audio_input, speech.started)
+    else:
+        play_audio_from_path(audio_input, speech.started)
+
+    speech.finished.wait()
+
+
+class GaplessSpeechPlayer:
+    """
+    Plays utterances back to back as one stream. Each decoded Sound is queued on the speech
+    channel behind the one playing and its frames on the animation scheduler behind the
+    playing clip, so the face only blends back to idle where the speech actually stops.
+
+    Every utterance's frames are trimmed or padded to the length of its audio, keeping the
+    face within a frame of the voice however many sentences are chained. The channel is the
+    clock: once it has nothing playing or queued, frames still waiting on the scheduler
+    belong to audio that was stopped and are dropped.
+    """
+
+    def __init__(self, animation_scheduler, fps: int = 60, poll_interval: float = 0.005) -> None:
+        self.animation_scheduler = animation_scheduler
+        self.fps = fps
+        self.poll_interval = poll_interval
+        self._channel = get_speech_channel()
+        self._last_speech = None
+        self._reset_timeline()
+
+    def _reset_timeline(self) -> None:
+        self._audio_seconds = 0.0
+        self._frame_count = 0
+
+    def _fit_frames(self, frames, seconds):
+        """Trim or pad (holding the last frame) so the timeline's frames match its audio."""
+        self._audio_seconds += seconds
+        count = max(round(self._audio_seconds * self.fps) - self._frame_count, 0)
+        if len(frames) < count and len(frames):
+            frames = np.vstack([frames, np.repeat(frames[-1:], count - len(frames), axis=0)])
+        frames = frames[:count]
+        self._frame_count += len(frames)
+        return frames
+
+    def is_playing(self) -> bool:
+        if self._channel.get_busy() or self._channel.get_queue() is not None:
+            return True
+        if self._last_speech is not None and not self._last_speech.finished.is_set():
+            # Stopped from outside (a new turn calls pygame.mixer.stop()), so drop the frames too
+            self.animation_scheduler.cancel_speech()
+            self._reset_timeline()
+        return False
+
+    def append(self, audio_input, generated_facial_data) -> bool:
+        """
+        Queue one utterance after whatever is playing. It is decoded and its frames prepared
+        straight away; the call then blocks while an earlier utterance is still waiting its turn.
+        """
+        sound = load_sound(audio_input)
+        if sound is None:
+            return False
+        frames = prepare_animation_frames(generated_facial_data)
+        seconds = sound.get_length()
+
+        while self._channel.get_queue() is not None:
+            time.sleep(self.poll_interval)
+
+        if self.is_playing():
+            self._last_speech = self.animation_scheduler.speak(self._fit_frames(frames, seconds))
+            self._channel.queue(sound)
+        else:
+            self._reset_timeline()
+            self._last_speech = self.animation_scheduler.speak(self._fit_frames(frames, seconds))
+            self._last_speech.started.wait()
+            self._channel.play(sound)
+        return True
+
+    def wait_until_done(self, interrupt=None) -> bool:
+        """
+        Block until the queued speech has played out. Returns False early if interrupt()
+        becomes true, e.g. because another utterance has arrived to be appended.
+        """
+        while self.is_playing():
+            if interrupt is not None and interrupt():
+                return False
+            time.sleep(self.poll_interval)
+        if self._last_speech is not None:
+            self._last_speech.finished.wait()
+        return True
@@ -0,0 +1,96 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# utils/http_client.py
+#
+# One requests.Session for every outbound service call. Its adapter keeps a pool of
+# kept-alive connections per host, so repeated calls to the same TTS / NeuroSync / LLM
+# server skip the TCP (and TLS) handshake, and transient failures are retried with backoff.
+# POSTs are only retried after an error response for the local endpoints listed in
+# HTTP_RETRY_POST_URLS, which get an adapter of their own.
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_POST_URLS
+)
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_retry(retry_post=False):
+    """
+    Retry connection failures (the request never reached the server) for any method, and
+    overloaded/unavailable responses for urllib3's idempotent methods, plus POST when
+    retry_post is set. A 502/504 can arrive after the upstream has done the work, so
+    retry_post is only for endpoints where running a request twice is harmless. Read
+    errors are not retried, since the server may still be working on the request, and
+    the last response is returned rather than raised so callers keep handling status
+    codes themselves.
+    """
+    return Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=0,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=None if retry_post else Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=build_retry()
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Mounted per URL prefix; requests picks the longest matching prefix for each call.
+    retry_post_adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=build_retry(retry_post=True)
+    )
+    for url in HTTP_RETRY_POST_URLS:
+        session.mount(url, retry_post_adapter)
+    return session
+
+
+def get_session():
+    """
+    The shared session, created on first use. It is shared between threads: urllib3's
+    connection pools are thread-safe and none of these services rely on cookies.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def post(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session().post(url, timeout=timeout, **kwargs)
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
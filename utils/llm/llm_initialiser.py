@@ -5,8 +5,8 @@ from queue import Queue
 
 
 from livelink.connect.livelink_init import create_socket_connection, initialize_py_face
-from livelink.animations.default_animation import default_animation_loop
-from utils.tts.tts_bridge import tts_worker
+from livelink.animations.animation_scheduler import AnimationScheduler
+from utils.tts.tts_bridge import tts_worker, ChunkQueue
 from utils.files.file_utils import initialize_directories
 from utils.llm.llm_utils import warm_up_llm_connection
 from utils.audio_face_workers import audio_face_queue_worker
@@ -17,6 +17,9 @@ from config import (
     USE_LOCAL_AUDIO,
     USE_COMBINED_ENDPOINT,
     USE_KOKORO,
+    TTS_WORKERS,
+    BLENDSHAPE_WORKERS,
+    TTS_LOOKAHEAD,
     ENABLE_EMOTE_CALLS,
     BASE_SYSTEM_MESSAGE,
     get_llm_config,
@@ -40,7 +43,7 @@ def initialize_system():
               - socket_connection: the active socket connection.
               - full_history: the full conversation history.
               - chat_history: the rolling conversation history.
-              - default_animation_thread: the thread running the default animation.
+              - animation_scheduler: the scheduler sending idle and speech frames.
               - chunk_queue: the queue for TTS chunks.
               - audio_queue: the queue for audio data.
               - tts_worker_thread: the thread running the TTS worker.
@@ -58,25 +61,25 @@ def initialize_system():
     # Warm up the LLM connection.
     warm_up_llm_connection(llm_config)
     
-    # Start the default animation thread.
-    default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-    default_animation_thread.start()
+    # Start the animation scheduler; it plays the idle animation until speech is queued.
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
     
     # Create queues for TTS and audio.
-    chunk_queue = Queue()
+    chunk_queue = ChunkQueue()
     audio_queue = Queue()
     
     # Start the TTS worker thread.
     tts_worker_thread = Thread(
         target=tts_worker,
-        args=(chunk_queue, audio_queue, USE_LOCAL_AUDIO, VOICE_NAME, USE_COMBINED_ENDPOINT, USE_KOKORO)
+        args=(chunk_queue, audio_queue, USE_LOCAL_AUDIO, VOICE_NAME, USE_COMBINED_ENDPOINT, USE_KOKORO,
+              TTS_WORKERS, BLENDSHAPE_WORKERS, TTS_LOOKAHEAD)
     )
     tts_worker_thread.start()
     
     # Start the audio face worker thread.
     audio_worker_thread = Thread(
         target=audio_face_queue_worker,
-        args=(audio_queue, py_face, socket_connection, default_animation_thread, ENABLE_EMOTE_CALLS)
+        args=(audio_queue, py_face, socket_connection, animation_scheduler, ENABLE_EMOTE_CALLS)
     )
     audio_worker_thread.start()
     
@@ -86,7 +89,7 @@ def initialize_system():
         'socket_connection': socket_connection,
         'full_history': full_history,
         'chat_history': chat_history,
-        'default_animation_thread': default_animation_thread,
+        'animation_scheduler': animation_scheduler,
         'chunk_queue': chunk_queue,
         'audio_queue': audio_queue,
         'tts_worker_thread': tts_worker_thread,
@@ -2,12 +2,12 @@
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
-import requests
 import json
 from threading import Thread
 from queue import Queue
 from openai import OpenAI
 
+from utils import http_client
 from utils.llm.sentence_builder import SentenceBuilder
 
 
@@ -20,14 +20,14 @@ def warm_up_llm_connection(config):
         try:
             # For Ollama, use a simple ping request
             api_base = config.get("OLLAMA_API_BASE", "http://localhost:11434")
-            requests.get(f"{api_base}/api/version", timeout=1)
+            http_client.get(f"{api_base}/api/version", timeout=1)
             print("Ollama connection warmed up.")
         except Exception as e:
             print("Ollama connection warm-up failed:", e)
     elif config["USE_LOCAL_LLM"]:
         try:
             # For local LLM, use a dummy ping request with a short timeout.
-            requests.post(config["LLM_STREAM_URL"], json={"dummy": "ping"}, timeout=1)
+            http_client.post(config["LLM_STREAM_URL"], json={"dummy": "ping"}, timeout=1)
             print("Local LLM connection warmed up.")
         except Exception as e:
             print("Local LLM connection warm-up failed:", e)
@@ -108,8 +108,7 @@ def local_llm_streaming(user_input, chat_history, chunk_queue, config):
     sb_thread.start()
     
     try:
-        session = requests.Session()
-        with session.post(config["LLM_STREAM_URL"], json=payload, stream=True) as response:
+        with http_client.post(config["LLM_STREAM_URL"], json=payload, stream=True) as response:
             response.raise_for_status()
             print("\n\nAssistant Response (streaming - local):\n", flush=True)
             for token in response.iter_content(chunk_size=1, decode_unicode=True):
@@ -118,7 +117,6 @@ def local_llm_streaming(user_input, chat_history, chunk_queue, config):
                 full_response += token
                 update_ui(token)
                 token_queue.put(token)
-        session.close()
         
         token_queue.put(None)
         sb_thread.join()
@@ -144,9 +142,7 @@ def local_llm_non_streaming(user_input, chat_history, chunk_queue, config):
     sb_thread.start()
     
     try:
-        session = requests.Session()
-        response = session.post(config["LLM_API_URL"], json=payload)
-        session.close()
+        response = http_client.post(config["LLM_API_URL"], json=payload)
         if response.ok:
             result = response.json()
             text = result.get('assistant', {}).get('content', "Error: No response.")
@@ -295,9 +291,8 @@ def ollama_streaming(user_input, chat_history, chunk_queue, config):
     sb_thread.start()
     
     try:
-        session = requests.Session()
         url = f"{api_base}/api/chat"
-        with session.post(url, json=payload, stream=True) as response:
+        with http_client.post(url, json=payload, stream=True) as response:
             response.raise_for_status()
             print("\n\nAssistant Response (streaming - Ollama):\n", flush=True)
             
@@ -320,8 +315,6 @@ def ollama_streaming(user_input, chat_history, chunk_queue, config):
                         break
                 except json.JSONDecodeError:
                     continue
-                
-        session.close()
         
         token_queue.put(None)
         sb_thread.join()
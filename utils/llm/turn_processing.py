@@ -20,11 +20,12 @@ from utils.vector_db.vector_db_utils import update_system_message_with_context,
 
 def flush_queue(q):
     """
-    Flush all items in the given queue.
+    Flush all items in the given queue, marking them done so a later q.join() returns.
     """
     try:
         while True:
             q.get_nowait()
+            q.task_done()
     except Empty:
         pass
 
@@ -33,16 +34,39 @@ def wait_until_idle(chunk_queue, audio_queue, check_interval=0.05):
     """
     Wait until:
       - Both the TTS chunk queue and the audio queue are empty, AND
+      - no chunk taken from chunk_queue is still being generated, AND
       - pygame is not currently playing any audio.
     """
     while (
         not chunk_queue.empty()
+        or chunk_queue.in_flight() > 0
         or not audio_queue.empty()
         or (pygame.mixer.get_init() and pygame.mixer.get_busy())
     ):
         time.sleep(check_interval)
 
 
+def end_previous_turn(chunk_queue, audio_queue, flush=True, animation_scheduler=None):
+    """
+    Flush the previous turn's queued speech (or, if flush is False, wait until it has
+    played out), then stop its audio and, if animation_scheduler is given, its frames.
+    """
+    if flush:
+        # Also drops the chunks still being generated. Before audio_queue is flushed, so
+        # nothing from the old turn is emitted after it.
+        chunk_queue.flush()
+        flush_queue(audio_queue)
+    else:
+        wait_until_idle(chunk_queue, audio_queue)
+
+    if pygame.mixer.get_init():
+        pygame.mixer.stop()
+    if animation_scheduler is not None:
+        # The speech player only notices the stop while it waits on the audio, which it
+        # does not do with emote calls off
+        animation_scheduler.cancel_speech()
+
+
 def process_turn(
     user_input,
     chat_history,
@@ -55,6 +79,7 @@ def process_turn(
     flush=True,
     top_n=4,
     ai_id=None,
+    animation_scheduler=None,
 ):
     """
     Process a conversation turn by:
@@ -68,13 +93,14 @@ def process_turn(
       chat_history (list): The rolling chat history.
       full_history (list): The full conversation history.
       llm_config (dict): The LLM configuration dictionary.
-      chunk_queue (Queue): The queue used for sending TTS chunks.
+      chunk_queue (ChunkQueue): The queue used for sending TTS chunks.
       audio_queue (Queue): The audio queue.
       vector_db: The vector database instance.
       base_system_message (str): The base system message to use for this turn.
       flush (bool): If True, flush the queues; if False, wait until idle.
       top_n (int): The number of related context items to pull from the vector DB (if enabled).
       ai_id (optional): If provided, use AI‑specific conversation logging.
+      animation_scheduler (optional): If provided, its speech frames are dropped along with the audio.
 
     Returns:
       list: The updated chat history.
@@ -89,14 +115,7 @@ def process_turn(
             base_system_message + "\nThe current time and date is: " + current_time
         )
 
-    if flush:
-        flush_queue(chunk_queue)
-        flush_queue(audio_queue)
-    else:
-        wait_until_idle(chunk_queue, audio_queue)
-
-    if pygame.mixer.get_init():
-        pygame.mixer.stop()
+    end_previous_turn(chunk_queue, audio_queue, flush, animation_scheduler)
 
     full_response = stream_llm_chunks(user_input, chat_history, chunk_queue, config=llm_config)
 
@@ -0,0 +1,68 @@
+# This software is licensed under a **dual-license model**
+# For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
+# Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+
+# utils/neurosync/in_process_neurosync.py
+#
+# Runs the local_api blendshape model inside the player process, for single-box setups:
+# audio bytes go straight to the model instead of over HTTP to 127.0.0.1:5000 and back
+# as JSON. The model is loaded once, on the first request.
+
+import os
+import threading
+
+import numpy as np
+
+LOCAL_API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "local_api")
+MODEL_PATH = os.path.join(LOCAL_API_DIR, "utils", "model", "model.pth")
+
+_inference_stack = None
+_inference_lock = threading.Lock()
+
+
+def get_inference_stack(feature_workers=0):
+    """
+    The in-process model stack, loaded on first use (torch is only imported then).
+    Features are extracted in the calling thread by default, so the player doesn't
+    start a process pool of its own.
+    """
+    global _inference_stack
+    if _inference_stack is None:
+        with _inference_lock:
+            if _inference_stack is None:
+                import torch
+                from local_api.utils.config import config as local_api_config
+                from local_api.utils.server_setup import InferenceStack
+
+                config = dict(local_api_config, feature_workers=feature_workers)
+                # Paths in the local_api config are relative to the local_api directory
+                for key in ("compiled_model_dir", "result_cache_dir"):
+                    if config.get(key) and not os.path.isabs(config[key]):
+                        config[key] = os.path.join(LOCAL_API_DIR, config[key])
+
+                device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                print(f"Loading the NeuroSync model in-process on {device}...")
+                _inference_stack = InferenceStack(MODEL_PATH, config, device)
+    return _inference_stack
+
+
+def generate_blendshapes_in_process(audio_bytes, feature_workers=0):
+    """
+    Same contract as send_audio_to_neurosync: a (frames, dims) float32 array, or None
+    if the audio could not be processed.
+    """
+    generated_facial_data = get_inference_stack(feature_workers).generate(bytes(audio_bytes))
+    if not isinstance(generated_facial_data, np.ndarray) or generated_facial_data.size == 0:
+        return None
+    # Cached results are read-only; the blink/blend passes edit frames in place
+    if not generated_facial_data.flags.writeable or generated_facial_data.dtype != np.float32:
+        generated_facial_data = np.array(generated_facial_data, dtype=np.float32)
+    return generated_facial_data
+
+
+def shutdown_inference_stack():
+    global _inference_stack
+    with _inference_lock:
+        if _inference_stack is not None:
+            _inference_stack.shutdown()
+            _inference_stack = None
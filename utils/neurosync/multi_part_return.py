@@ -1,69 +1,222 @@
 # This software is licensed under a **dual-license model**
 # For individuals and businesses earning **under $1M per year**, this software is licensed under the **MIT License**
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
+import codecs
 import json
-import requests
-from config import TTS_WITH_BLENDSHAPES_REALTIME_API 
+from config import TTS_WITH_BLENDSHAPES_REALTIME_API
+from utils import http_client
 
-def parse_multipart_response(response):
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def get_boundary(content_type):
+    """Extracts the multipart boundary (as bytes) from a Content-Type header."""
+    if not content_type or "boundary=" not in content_type:
+        raise ValueError("Missing or invalid Content-Type header with boundary")
+    boundary = content_type.split("boundary=")[-1].split(";")[0].strip().strip('"')
+    return boundary.encode()
+
+def parse_part_headers(raw_headers):
+    headers = {}
+    for header_line in raw_headers.split(b"\r\n"):
+        line = header_line.decode("utf-8", errors="replace")
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return headers
+
+class JSONFrameDecoder:
+    """
+    Decodes a JSON array of blendshape frames while it downloads: every frame is parsed
+    as soon as its closing bracket arrives, so only the last partial frame is ever held
+    as text. Any other JSON document is decoded in one go once complete.
+    """
+
+    def __init__(self):
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._text = ""
+        self._pieces = []
+        self._is_array = None
+        self._closed_array = False
+        self.frames = []
+
+    def feed(self, data):
+        text = self._utf8.decode(data)
+        if self._is_array is None:
+            text = text.lstrip()
+            if not text:
+                return
+            self._is_array = text[0] == "["
+            if self._is_array:
+                text = text[1:]
+        if not self._is_array:
+            self._pieces.append(text)
+            return
+        self._text += text
+        self._decode_frames()
+
+    def close(self):
+        tail = self._utf8.decode(b"", final=True)
+        if not self._is_array:
+            return json.loads("".join(self._pieces) + tail)
+        self._text += tail
+        self._decode_frames()
+        if not self._closed_array or self._text.strip():
+            raise ValueError("Blendshape JSON ended early or is malformed")
+        return self.frames
+
+    def _decode_frames(self):
+        text, pos, end_of_text = self._text, 0, len(self._text)
+        while not self._closed_array:
+            while pos < end_of_text and text[pos] in " \t\r\n,":
+                pos += 1
+            if pos == end_of_text:
+                break
+            if text[pos] == "]":
+                self._closed_array = True
+                pos += 1
+                break
+            try:
+                frame, end = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break  # the frame hasn't fully arrived yet
+            if end == end_of_text and text[pos] not in "[{\"":
+                break  # a bare number may continue in the next chunk
+            self.frames.append(frame)
+            pos = end
+        self._text = text[pos:]
+
+def iter_multipart(chunks, boundary, decoders=None):
+    """
+    Yields (headers, body) for each part of a multipart stream as soon as the part's
+    closing delimiter arrives. Header names are lower-cased.
+
+    body is a memoryview over a buffer holding just that part, so the payload is copied
+    once, out of the network chunks. Parts whose Content-Type is in `decoders` (content
+    type -> decoder class with feed()/close()) are fed to a decoder while they download
+    instead, and body is what close() returns.
+    """
+    decoders = decoders or {}
+    delimiter = b"\r\n--" + boundary
+    buffer = bytearray(b"\r\n")  # the first delimiter has no line break before it
+    pos = 0   # start of the unparsed bytes in buffer
+    scan = 0  # where the next delimiter search starts
+    state = "preamble"
+    headers, decoder = None, None
+
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if state in ("preamble", "body"):
+                index = buffer.find(delimiter, scan)
+                if index < 0:
+                    # Everything except a possible partial delimiter at the end is body
+                    safe = max(len(buffer) - len(delimiter) + 1, pos)
+                    if decoder is not None:
+                        decoder.feed(buffer[pos:safe])
+                        pos = safe
+                    elif state == "preamble":
+                        pos = safe
+                    scan = safe
+                    break
+                if state == "body":
+                    if decoder is not None:
+                        decoder.feed(buffer[pos:index])
+                        body = decoder.close()
+                        pos = index
+                    else:
+                        # Hand the part's buffer over as-is; only the bytes after it are copied
+                        part, buffer = buffer, buffer[index:]
+                        del part[index:]
+                        body = memoryview(part)[pos:]
+                        pos = 0
+                    yield headers, body
+                else:
+                    pos = index
+                pos += len(delimiter)
+                state, headers, decoder = "delimiter", None, None
+
+            if state == "delimiter":
+                if len(buffer) - pos < 2:
+                    break
+                if buffer[pos:pos + 2] == b"--":
+                    return  # close delimiter; ignore the epilogue
+                line_end = buffer.find(b"\r\n", pos)
+                if line_end < 0:
+                    break
+                pos = line_end + 2
+                state = "headers"
+
+            if state == "headers":
+                if buffer[pos:pos + 2] == b"\r\n":
+                    headers_end, body_start = pos, pos + 2
+                else:
+                    headers_end = buffer.find(b"\r\n\r\n", pos)
+                    if headers_end < 0:
+                        break
+                    body_start = headers_end + 4
+                headers = parse_part_headers(bytes(buffer[pos:headers_end]))
+                content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                decoder = decoders[content_type]() if content_type in decoders else None
+                pos = scan = body_start
+                state = "body"
+
+        if pos:
+            del buffer[:pos]
+            scan -= pos
+            pos = 0
+
+    raise ValueError("Multipart stream ended before its closing boundary")
+
+def parse_multipart_response(response, on_audio=None):
     """
     Parses a multipart/mixed response to extract the audio bytes and blendshapes.
     Assumes the endpoint returns two parts:
       Part 1: Content-Type: audio/wav (raw WAV bytes)
       Part 2: Content-Type: application/json (blendshapes data)
+
+    The body is read incrementally (request it with stream=True): the audio comes back as
+    a memoryview and is passed to on_audio, if given, as soon as it has arrived, while the
+    blendshape frames are still downloading and being decoded.
     """
-    content_type = response.headers.get("Content-Type")
-    if not content_type or "boundary=" not in content_type:
-        raise ValueError("Missing or invalid Content-Type header with boundary")
-    
-    boundary = content_type.split("boundary=")[-1].strip()
-    raw_parts = response.content.split(("--" + boundary).encode())
-    
+    boundary = get_boundary(response.headers.get("Content-Type"))
+
     audio_bytes = None
     blendshapes = None
-    
-    for part in raw_parts:
-        part = part.strip()
-        if not part or part == b"--":
-            continue
-        if b"\r\n\r\n" not in part:
-            continue
-        headers_raw, body = part.split(b"\r\n\r\n", 1)
-        headers = {}
-        for header_line in headers_raw.split(b"\r\n"):
-            try:
-                line = header_line.decode("utf-8")
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    headers[key.strip()] = value.strip()
-            except Exception:
-                continue
-        content_type_part = headers.get("Content-Type")
+
+    parts = iter_multipart(
+        response.iter_content(chunk_size=STREAM_CHUNK_SIZE), boundary, {"application/json": JSONFrameDecoder}
+    )
+    for headers, body in parts:
+        content_type_part = headers.get("content-type", "").split(";")[0].strip().lower()
         if content_type_part == "audio/wav":
-            audio_bytes = body.rstrip(b"\r\n")
+            audio_bytes = body
+            if on_audio is not None:
+                on_audio(audio_bytes)
         elif content_type_part == "application/json":
-            blendshapes = json.loads(body.decode("utf-8").strip())
-    
+            blendshapes = body
+
     if audio_bytes is None:
         print("❌ Audio bytes not found in response.")
     if blendshapes is None:
         print("❌ Blendshapes data not found in response.")
-    
+
     return audio_bytes, blendshapes
 
-def get_tts_with_blendshapes(text, voice=None):
+def get_tts_with_blendshapes(text, voice=None, on_audio=None):
     """
     Calls the new TTS endpoint with the given text and optional voice.
     Returns a tuple: (audio_bytes, blendshapes) if successful, else (None, None).
+    audio_bytes is a memoryview over the received WAV data.
     """
     payload = {"text": text}
     if voice is not None:
         payload["voice"] = voice
 
     try:
-        response = requests.post(TTS_WITH_BLENDSHAPES_REALTIME_API , json=payload)
-        response.raise_for_status()
-        return parse_multipart_response(response)
+        with http_client.post(TTS_WITH_BLENDSHAPES_REALTIME_API, json=payload, stream=True) as response:
+            response.raise_for_status()
+            return parse_multipart_response(response, on_audio)
     except Exception as e:
         print(f"❌ Error calling new TTS endpoint: {e}")
         return None, None
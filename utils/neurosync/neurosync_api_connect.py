@@ -5,31 +5,60 @@
 import requests
 import json
 import os
+import struct
+
+import numpy as np
+
+from config import USE_IN_PROCESS_NEUROSYNC, IN_PROCESS_FEATURE_WORKERS
+from utils import http_client
 
 # Define constants directly instead of importing them from config
 NEUROSYNC_LOCAL_URL = "http://127.0.0.1:5000/audio_to_blendshapes"
 NEUROSYNC_REMOTE_URL = "https://api.neurosync.info/audio_to_blendshapes" 
 NEUROSYNC_API_KEY = os.getenv("NEUROSYNC_API_KEY", "YOUR-NEUROSYNC-API-KEY")
 
+# Ask for the binary blendshape payload; servers that don't support it answer with JSON as before.
+REQUEST_BINARY_BLENDSHAPES = True
+
+# Binary payload header: magic, version, dtype code, frames, dims (see local_api/utils/response_format.py)
+BINARY_MIMETYPE = "application/octet-stream"
+BINARY_HEADER = struct.Struct("<4sHHII")
+BINARY_MAGIC = b"NSBS"
+BINARY_DTYPES = {1: np.dtype("<f4"), 2: np.dtype("<f2")}
+
 def send_audio_to_neurosync(audio_bytes, use_local=True):
     """
     Send audio bytes to the NeuroSync API for processing into blendshapes.
     
     Uses the local API by default, but can use the remote API if specified.
+    With USE_IN_PROCESS_NEUROSYNC set in config.py, local requests run the model in this
+    process instead of going over HTTP.
     
     Args:
         audio_bytes (bytes): The audio data to process
         use_local (bool): Whether to use the local API endpoint (default: True)
         
     Returns:
-        list or None: Parsed facial data if successful, None otherwise
+        np.ndarray, list or None: Parsed facial data if successful, None otherwise.
+        A (frames, dims) float32 array for binary responses and in-process inference,
+        a list of frames for JSON ones.
     """
     try:
+        if use_local and USE_IN_PROCESS_NEUROSYNC:
+            if not validate_audio_bytes(audio_bytes):
+                print("Error: Invalid audio data")
+                return None
+            # Imported here so the HTTP path never loads torch
+            from utils.neurosync.in_process_neurosync import generate_blendshapes_in_process
+            return generate_blendshapes_in_process(audio_bytes, IN_PROCESS_FEATURE_WORKERS)
+
         # Use the local or remote URL depending on the flag
         url = NEUROSYNC_LOCAL_URL if use_local else NEUROSYNC_REMOTE_URL
         headers = {}
         if not use_local:
             headers["API-Key"] = NEUROSYNC_API_KEY
+        if REQUEST_BINARY_BLENDSHAPES:
+            headers["Accept"] = f"{BINARY_MIMETYPE}, application/json;q=0.9"
 
         if not validate_audio_bytes(audio_bytes):
             print("Error: Invalid audio data")
@@ -37,6 +66,8 @@ def send_audio_to_neurosync(audio_bytes, use_local=True):
             
         response = post_audio_bytes(audio_bytes, url, headers)
         response.raise_for_status()  
+        if response.headers.get("Content-Type", "").startswith(BINARY_MIMETYPE):
+            return parse_blendshapes_from_binary(response.content)
         json_response = response.json()
         return parse_blendshapes_from_json(json_response)
 
@@ -57,7 +88,7 @@ def validate_audio_bytes(audio_bytes):
 def post_audio_bytes(audio_bytes, url, headers):
     """Post audio bytes to the given URL with headers."""
     headers["Content-Type"] = "application/octet-stream"
-    response = requests.post(url, headers=headers, data=audio_bytes)
+    response = http_client.post(url, headers=headers, data=audio_bytes)
     return response
 
 def parse_blendshapes_from_json(json_response):
@@ -70,3 +101,20 @@ def parse_blendshapes_from_json(json_response):
         facial_data.append(frame_data)
 
     return facial_data
+
+def parse_blendshapes_from_binary(payload):
+    """
+    Parse the binary blendshape payload into a (frames, dims) float32 array.
+    The frames are viewed in place with np.frombuffer; the body is copied once into a
+    bytearray so the result is writable (blink/blend passes edit frames in place).
+    """
+    magic, version, dtype_code, frames, dims = BINARY_HEADER.unpack_from(payload)
+    if magic != BINARY_MAGIC or dtype_code not in BINARY_DTYPES:
+        raise ValueError(f"Not a blendshape payload (magic={magic!r}, version={version}, dtype={dtype_code})")
+
+    buffer = payload if isinstance(payload, bytearray) else bytearray(payload)
+    data = np.frombuffer(buffer, dtype=BINARY_DTYPES[dtype_code], count=frames * dims, offset=BINARY_HEADER.size)
+    data = data.reshape(frames, dims)
+    if data.dtype != np.float32:
+        data = data.astype(np.float32)
+    return data
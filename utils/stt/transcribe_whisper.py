@@ -14,6 +14,7 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from config import TRANSCRIPTION_SERVER_URL, USE_LOCAL_WHISPER, WHISPER_MODEL_SIZE
+from utils import http_client
 
 # Local Whisper model
 try:
@@ -93,7 +94,7 @@ def transcribe_audio_remotely(audio_bytes, return_timestamps=False):
     """Transcribe audio using the remote server."""
     audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
     try:
-        response = requests.post(
+        response = http_client.post(
             TRANSCRIPTION_SERVER_URL,
             json={
                 'audio_base64': audio_base64,
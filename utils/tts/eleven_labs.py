@@ -1,6 +1,7 @@
 import io
 import json
-import requests
+
+from utils import http_client
 
 voices = {
     "Sarah": "EXAVITQu4vr4xnSDxMaL",
@@ -49,7 +50,7 @@ def get_elevenlabs_audio(text, name):
         }
     }
 
-    response = requests.post(API_URL, headers=headers, json=payload)
+    response = http_client.post(API_URL, headers=headers, json=payload)
     response.raise_for_status()
 
     audio_data = response.content
@@ -81,7 +82,7 @@ def get_speech_to_speech_audio(audio_bytes, name):
         "audio": ("audio.wav", io.BytesIO(audio_bytes), "audio/wav")
     }
 
-    response = requests.post(STS_API_URL, headers=headers, data=data, files=files)
+    response = http_client.post(STS_API_URL, headers=headers, data=data, files=files)
     response.raise_for_status()  # Raise an error for bad responses
 
     # Return the full response content as audio data
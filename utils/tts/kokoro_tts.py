@@ -1,7 +1,9 @@
 # utils/tts/kokoro_tts.py
-import requests
 import json
 
+from config import KOKORO_TTS_URL
+from utils import http_client
+
 def get_kokoro_audio(text, voice_id="af_bella"):
     """
     Calls the Kokoro TTS API to generate speech for the given text.
@@ -13,9 +15,6 @@ def get_kokoro_audio(text, voice_id="af_bella"):
     Returns:
         bytes or None: The audio data if successful, None otherwise
     """
-    # Kokoro TTS endpoint from the kokoro_api.py implementation
-    KOKORO_TTS_URL = "http://localhost:8000/generate_speech"
-    
     payload = {
         "text": text
         # The Kokoro API as implemented doesn't support voice selection via the API
@@ -23,7 +22,7 @@ def get_kokoro_audio(text, voice_id="af_bella"):
     }
     
     try:
-        response = requests.post(KOKORO_TTS_URL, json=payload)
+        response = http_client.post(KOKORO_TTS_URL, json=payload)
         response.raise_for_status()
         return response.content
     except Exception as e:
@@ -1,7 +1,6 @@
 # utils/local_tts.py
-import requests
-
 from config import LOCAL_TTS_URL
+from utils import http_client
 
 def call_local_tts(text, voice=None): 
     """
@@ -15,7 +14,7 @@ def call_local_tts(text, voice=None):
         payload["voice"] = voice
 
     try:
-        response = requests.post(LOCAL_TTS_URL, json=payload)
+        response = http_client.post(LOCAL_TTS_URL, json=payload)
         response.raise_for_status()
         return response.content
     except Exception as e:
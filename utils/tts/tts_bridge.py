@@ -4,31 +4,219 @@
 
 from utils.neurosync.multi_part_return import get_tts_with_blendshapes
 from utils.neurosync.neurosync_api_connect import send_audio_to_neurosync
-from utils.tts.local_tts import call_local_tts 
+from utils.tts.local_tts import call_local_tts
 from utils.tts.eleven_labs import get_elevenlabs_audio
 from utils.tts.kokoro_tts import get_kokoro_audio
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+from threading import Lock, Semaphore
 import string
+import time
 
-def tts_worker(chunk_queue, audio_queue, USE_LOCAL_AUDIO=True, VOICE_NAME=None, USE_COMBINED_ENDPOINT=False, USE_KOKORO=False):
+
+class PipelineMetrics:
+    """
+    Per-stage timings for the TTS pipeline: how long chunks waited for a free worker
+    ("queue"), how long the call itself took ("run"), and how long finished chunks
+    waited for earlier sentences before reaching audio_queue ("reorder").
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._samples = {}
+
+    def record(self, stage, kind, seconds):
+        with self._lock:
+            self._samples.setdefault((stage, kind), []).append(seconds)
+
+    def summary(self):
+        with self._lock:
+            return {
+                f"{stage}_{kind}": {
+                    "count": len(samples),
+                    "mean_ms": 1000 * sum(samples) / len(samples),
+                    "max_ms": 1000 * max(samples),
+                }
+                for (stage, kind), samples in self._samples.items()
+            }
+
+    def print_summary(self):
+        for name, stats in sorted(self.summary().items()):
+            print(f"  {name:<20} n={stats['count']:<4} mean {stats['mean_ms']:8.1f} ms   max {stats['max_ms']:8.1f} ms")
+
+
+class ChunkQueue(Queue):
+    """
+    The text queue feeding tts_worker, which also tracks the chunks the worker has taken.
+
+    get() returns (generation, chunk), tagged in the same locked step that removes the chunk,
+    so flush() can never fall between the two. A chunk counts as in flight from then until
+    the worker marks it done, after its result (if any) is on audio_queue. flush() drops the
+    queued chunks and starts a new generation: chunks of earlier ones still inside the
+    pipeline are skipped, or their results dropped instead of reaching audio_queue.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.generation = 0
+
+    def _get(self):
+        # Called by get() with self.mutex held
+        return self.generation, super()._get()
+
+    def flush(self):
+        """Discard everything handed to the TTS pipeline so far. Flush audio_queue after this."""
+        with self.mutex:
+            self.generation += 1
+        try:
+            while True:
+                self.get_nowait()
+                self.task_done()
+        except Empty:
+            pass
+
+    def in_flight(self):
+        """Chunks taken off the queue that have not been marked done yet."""
+        with self.mutex:
+            return self.unfinished_tasks - self._qsize()
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def emit(self, generation, audio_queue, result):
+        """Put a finished chunk's result on audio_queue unless its generation was flushed."""
+        with self.mutex:
+            if result is not None and generation == self.generation:
+                audio_queue.put(result)
+                return True
+        return False
+
+
+class OrderedEmitter:
+    """
+    Puts finished chunks on audio_queue strictly in sentence order. Results arriving
+    early are held until every earlier sequence number has been emitted (or failed).
+    """
+
+    def __init__(self, audio_queue, chunk_queue, lookahead, metrics):
+        self.audio_queue = audio_queue
+        self.chunk_queue = chunk_queue
+        self.lookahead = lookahead
+        self.metrics = metrics
+        self._lock = Lock()
+        self._pending = {}
+        self._next_seq = 0
+
+    def complete(self, seq, chunk, generation, result):
+        with self._lock:
+            self._pending[seq] = (chunk, generation, result, time.perf_counter())
+            while self._next_seq in self._pending:
+                chunk, generation, result, finished = self._pending.pop(self._next_seq)
+                self.metrics.record("output", "reorder", time.perf_counter() - finished)
+                self.chunk_queue.emit(generation, self.audio_queue, result)
+                self._next_seq += 1
+                self.chunk_queue.task_done()
+                self.lookahead.release()
+
+
+def generate_audio(chunk, USE_LOCAL_AUDIO, VOICE_NAME, USE_KOKORO):
+    """Generates audio using the chosen TTS engine."""
+    if USE_KOKORO:
+        # Use Kokoro TTS
+        return get_kokoro_audio(chunk, VOICE_NAME)
+    elif USE_LOCAL_AUDIO:
+        # Use local TTS
+        return call_local_tts(chunk)
+    else:
+        # Use ElevenLabs TTS
+        return get_elevenlabs_audio(chunk, VOICE_NAME)
+
+
+def tts_worker(chunk_queue, audio_queue, USE_LOCAL_AUDIO=True, VOICE_NAME=None, USE_COMBINED_ENDPOINT=False, USE_KOKORO=False,
+               TTS_WORKERS=2, BLENDSHAPE_WORKERS=2, LOOKAHEAD=4, metrics=None):
     """
     Processes text chunks from chunk_queue.
-    
+
     When USE_COMBINED_ENDPOINT is True, a single API call retrieves both audio and blendshapes.
     Otherwise, the worker generates audio using either local TTS, Kokoro TTS, or ElevenLabs (based on configuration)
     and then retrieves facial data separately.
-    
-    The results (audio_bytes, facial/blendshape data) are enqueued into audio_queue.
-    
+
+    The two stages are pipelined: up to TTS_WORKERS TTS calls and BLENDSHAPE_WORKERS blendshape
+    calls run at once, so later sentences are generated while earlier ones play. Each chunk gets
+    a sequence number and the results (audio_bytes, facial/blendshape data) are enqueued into
+    audio_queue strictly in sentence order. Chunks still in the pipeline when chunk_queue.flush()
+    is called (a new turn interrupting this one) never reach audio_queue.
+
     Parameters:
-      - chunk_queue: Queue holding text chunks.
+      - chunk_queue (ChunkQueue): Queue holding text chunks.
       - audio_queue: Queue where the (audio_bytes, facial_data) tuple is enqueued.
       - USE_LOCAL_AUDIO (bool): If True, use local TTS. If False, use ElevenLabs.
       - VOICE_NAME (str): Voice name to use for TTS.
       - USE_COMBINED_ENDPOINT (bool): If True, use the combined TTS+blendshapes endpoint.
       - USE_KOKORO (bool): If True, use Kokoro TTS instead of local or ElevenLabs TTS.
+      - TTS_WORKERS (int): TTS (or combined endpoint) requests in flight at once.
+      - BLENDSHAPE_WORKERS (int): Blendshape requests in flight at once.
+      - LOOKAHEAD (int): Chunks that may be in flight or waiting for an earlier sentence.
+      - metrics (PipelineMetrics): Collects per-stage timings; printed when the worker stops.
     """
+    metrics = metrics or PipelineMetrics()
+    lookahead = Semaphore(max(LOOKAHEAD, 1))
+    emitter = OrderedEmitter(audio_queue, chunk_queue, lookahead, metrics)
+    tts_pool = ThreadPoolExecutor(max_workers=max(TTS_WORKERS, 1), thread_name_prefix="tts")
+    blendshape_pool = ThreadPoolExecutor(max_workers=max(BLENDSHAPE_WORKERS, 1), thread_name_prefix="blendshapes")
+
+    def blendshape_stage(seq, chunk, generation, audio_bytes, queued):
+        metrics.record("blendshapes", "queue", time.perf_counter() - queued)
+        if not chunk_queue.is_current(generation):
+            emitter.complete(seq, chunk, generation, None)  # Flushed while waiting for a worker
+            return
+        started = time.perf_counter()
+        try:
+            # Retrieve facial/blendshape data using the separate API.
+            facial_data = send_audio_to_neurosync(audio_bytes)
+        except Exception as e:
+            print(f"❌ Blendshape request raised {e!r} for chunk:", chunk)
+            facial_data = None
+        metrics.record("blendshapes", "run", time.perf_counter() - started)
+
+        if facial_data is not None and len(facial_data) > 0:
+            emitter.complete(seq, chunk, generation, (audio_bytes, facial_data))
+        else:
+            print("❌ Failed to get facial data for chunk:", chunk)
+            emitter.complete(seq, chunk, generation, None)
+
+    def tts_stage(seq, chunk, generation, queued):
+        metrics.record("tts", "queue", time.perf_counter() - queued)
+        if not chunk_queue.is_current(generation):
+            emitter.complete(seq, chunk, generation, None)  # Flushed while waiting for a worker
+            return
+        started = time.perf_counter()
+        try:
+            if USE_COMBINED_ENDPOINT:
+                # Use the combined endpoint: one call returns both audio and blendshapes.
+                audio_bytes, blendshapes = get_tts_with_blendshapes(chunk, VOICE_NAME)
+            else:
+                audio_bytes = generate_audio(chunk, USE_LOCAL_AUDIO, VOICE_NAME, USE_KOKORO)
+        except Exception as e:
+            print(f"❌ TTS request raised {e!r} for chunk:", chunk)
+            audio_bytes = blendshapes = None
+        metrics.record("tts", "run", time.perf_counter() - started)
+
+        if USE_COMBINED_ENDPOINT:
+            if audio_bytes and blendshapes:
+                emitter.complete(seq, chunk, generation, (audio_bytes, blendshapes))
+            else:
+                print("❌ Failed to retrieve audio and blendshapes for chunk:", chunk)
+                emitter.complete(seq, chunk, generation, None)
+        elif audio_bytes:
+            blendshape_pool.submit(blendshape_stage, seq, chunk, generation, audio_bytes, time.perf_counter())
+        else:
+            print("❌ TTS generation failed for chunk:", chunk)
+            emitter.complete(seq, chunk, generation, None)
+
+    seq = 0
     while True:
-        chunk = chunk_queue.get()
+        generation, chunk = chunk_queue.get()
         if chunk is None:
             break
 
@@ -37,33 +225,17 @@ def tts_worker(chunk_queue, audio_queue, USE_LOCAL_AUDIO=True, VOICE_NAME=None,
             chunk_queue.task_done()
             continue
 
-        if USE_COMBINED_ENDPOINT:
-            # Use the combined endpoint: one call returns both audio and blendshapes.
-            audio_bytes, blendshapes = get_tts_with_blendshapes(chunk, VOICE_NAME)
-            if audio_bytes and blendshapes:
-                audio_queue.put((audio_bytes, blendshapes))
-            else:
-                print("❌ Failed to retrieve audio and blendshapes for chunk:", chunk)
-        else:
-            # Generate audio using the chosen TTS engine.
-            if USE_KOKORO:
-                # Use Kokoro TTS
-                audio_bytes = get_kokoro_audio(chunk, VOICE_NAME)
-            elif USE_LOCAL_AUDIO:
-                # Use local TTS
-                audio_bytes = call_local_tts(chunk)
-            else:
-                # Use ElevenLabs TTS
-                audio_bytes = get_elevenlabs_audio(chunk, VOICE_NAME)
-
-            if audio_bytes:
-                # Retrieve facial/blendshape data using the separate API.
-                facial_data = send_audio_to_neurosync(audio_bytes)
-                if facial_data:
-                    audio_queue.put((audio_bytes, facial_data))
-                else:
-                    print("❌ Failed to get facial data for chunk:", chunk)
-            else:
-                print("❌ TTS generation failed for chunk:", chunk)
+        # Wait while LOOKAHEAD chunks are already in flight or waiting to be emitted.
+        waited = time.perf_counter()
+        lookahead.acquire()
+        metrics.record("lookahead", "queue", time.perf_counter() - waited)
+
+        tts_pool.submit(tts_stage, seq, chunk, generation, time.perf_counter())
+        seq += 1
 
-        chunk_queue.task_done()
+    # The TTS stage feeds the blendshape stage, so it has to drain first.
+    tts_pool.shutdown(wait=True)
+    blendshape_pool.shutdown(wait=True)
+    if seq:
+        print("TTS pipeline timings:")
+        metrics.print_summary()
@@ -3,8 +3,8 @@
 # Businesses or organizations with **annual revenue of $1,000,000 or more** must obtain permission to use this software commercially.
 
 import os
-import requests
 from config import USE_OPENAI_EMBEDDING, EMBEDDING_LOCAL_SERVER_URL, EMBEDDING_OPENAI_MODEL, LOCAL_EMBEDDING_SIZE, OPENAI_EMBEDDING_SIZE
+from utils import http_client
 
 def get_embedding(text: str, use_openai: bool = USE_OPENAI_EMBEDDING, openai_api_key: str = None, local_server_url: str = EMBEDDING_LOCAL_SERVER_URL) -> list:
     if use_openai:
@@ -15,7 +15,7 @@ def get_embedding(text: str, use_openai: bool = USE_OPENAI_EMBEDDING, openai_api
 def get_local_embedding(text: str, local_server_url: str) -> list:
     try:
         payload = {"text": text}
-        response = requests.post(local_server_url, json=payload, timeout=10)
+        response = http_client.post(local_server_url, json=payload, timeout=10)
         response.raise_for_status()
         data = response.json()
         embedding = data.get("embedding")
@@ -39,7 +39,7 @@ def get_openai_embedding(text: str, openai_api_key: str = None) -> list:
             "Content-Type": "application/json"
         }
         payload = {"input": text, "model": EMBEDDING_OPENAI_MODEL}
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = http_client.post(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         data = response.json()
         if "data" in data and len(data["data"]) > 0:
@@ -9,10 +9,9 @@ warnings.filterwarnings(
     "ignore", 
     message="Couldn't find ffmpeg or avconv - defaulting to ffmpeg, but may not work"
 )
-from threading import Thread
 
 from livelink.connect.livelink_init import create_socket_connection, initialize_py_face
-from livelink.animations.default_animation import default_animation_loop, stop_default_animation
+from livelink.animations.animation_scheduler import AnimationScheduler
 from utils.files.file_utils import initialize_directories, ensure_wav_input_folder_exists, list_wav_files
 from utils.audio_face_workers import process_wav_file
 
@@ -27,8 +26,7 @@ if __name__ == "__main__":
     ensure_wav_input_folder_exists(wav_input_folder)
     py_face = initialize_py_face()
     socket_connection = create_socket_connection()
-    default_animation_thread = Thread(target=default_animation_loop, args=(py_face,))
-    default_animation_thread.start()
+    animation_scheduler = AnimationScheduler(py_face, socket_connection).start()
 
     try:
         while True:
@@ -51,7 +49,7 @@ if __name__ == "__main__":
                         EmoteConnect.send_emote("startspeaking")
                     
                     try:
-                        process_wav_file(selected_file, py_face, socket_connection, default_animation_thread)
+                        process_wav_file(selected_file, py_face, socket_connection, animation_scheduler)
                     finally:
                         if ENABLE_EMOTE_CALLS:
                             EmoteConnect.send_emote("stopspeaking")
@@ -61,8 +59,6 @@ if __name__ == "__main__":
                 print("Invalid input. Please enter a number or 'q' to quit.")
 
     finally:
-        stop_default_animation.set()
-        if default_animation_thread:
-            default_animation_thread.join()
+        animation_scheduler.stop()
         pygame.quit()
         socket_connection.close()